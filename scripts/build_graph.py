@@ -165,7 +165,9 @@ def build(
             # We can check signature or just try?
             # Or rely on kwargs.
             try:
-                extractor = extractor_cls(max_workers=max_workers)
+                extractor = extractor_cls(
+                    max_workers=max_workers, use_processes=config.pipeline.use_process_pool
+                )
             except TypeError:
                 extractor = extractor_cls()
 
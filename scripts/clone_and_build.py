@@ -119,6 +119,7 @@ def main(
         extractor = AnsibleExtractor(
             graph_builder=graph_builder,
             max_workers=config.pipeline.max_workers,
+            use_processes=config.pipeline.use_process_pool,
         )
 
         try:
@@ -1,5 +1,6 @@
 """Configuration management for GraphRAG pipeline."""
 
+import os
 from pathlib import Path
 from typing import Any, Optional
 
@@ -19,6 +20,12 @@ class Neo4jConfig(BaseSettings):
     connection_timeout: float = Field(
         default=5.0, description="Connection acquisition timeout in seconds"
     )
+    max_connection_pool_size: int = Field(
+        default=50, description="Maximum pooled connections per driver"
+    )
+    max_connection_lifetime: float = Field(
+        default=300.0, description="Maximum lifetime of a pooled connection in seconds"
+    )
 
     model_config = SettingsConfigDict(
         env_prefix="NEO4J_",
@@ -39,6 +46,9 @@ class PipelineConfig(BaseSettings):
     )
     batch_size: int = Field(default=100, description="Batch size for graph operations")
     max_workers: int = Field(default=4, description="Max parallel workers for parsing")
+    use_process_pool: bool = Field(
+        default=False, description="Parse files in worker processes instead of threads"
+    )
     log_level: str = Field(default="INFO", description="Logging level")
 
     # Git configuration
@@ -180,6 +190,23 @@ class Config:
         return self.schema.get("relationships", {}).get(rel_type, {}).get("properties", [])  # type: ignore[no-any-return]
 
 
+def user_cache_dir() -> Path:
+    """Get the per-user directory for local caches.
+
+    Caches live outside the working tree so that a cloned repository can
+    never supply them. ``GRAPHRAG_CACHE_DIR`` overrides the location, then
+    ``XDG_CACHE_HOME``; the default is ``~/.cache/graphrag-codebase``.
+
+    Returns:
+        Cache directory path (not created)
+    """
+    override = os.environ.get("GRAPHRAG_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "graphrag-codebase"
+
+
 # Global config instance
 _config: Optional[Config] = None
 
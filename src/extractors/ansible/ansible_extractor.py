@@ -1,7 +1,7 @@
 """Main Ansible codebase extractor."""
 
 import hashlib
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any, Generator, Optional
 
@@ -16,6 +16,28 @@ from .playbook_extractor import PlaybookExtractor
 from .role_extractor import RoleExtractor
 from .variable_extractor import VariableExtractor
 
+# Below this many files, starting worker processes costs more than it saves
+_PROCESS_POOL_MIN_FILES = 64
+
+# Per-process extractor, created by _init_worker in each pool process
+_worker_extractor: Optional["AnsibleExtractor"] = None
+
+
+def _init_worker(repository_id: Optional[str]) -> None:
+    """Create the extractor a pool process uses for all its files."""
+    global _worker_extractor
+    _worker_extractor = AnsibleExtractor()
+    _worker_extractor._repository_id = repository_id
+
+
+def _process_file_in_worker(
+    file_path: Path, codebase_root: Path
+) -> tuple[list[Node], list[Relationship]]:
+    """Process one file in a pool process (module-level so it can be pickled)."""
+    if _worker_extractor is None:
+        raise RuntimeError("Worker process was not initialized")
+    return _worker_extractor._process_file(file_path, codebase_root)
+
 
 @ExtractorRegistry.register("ansible")
 class AnsibleExtractor(BaseExtractor):
@@ -23,17 +45,23 @@ class AnsibleExtractor(BaseExtractor):
 
     schema_profile = "ansible"
 
-    def __init__(self, graph_builder: Any = None, max_workers: int = 4):
+    def __init__(
+        self, graph_builder: Any = None, max_workers: int = 4, use_processes: bool = False
+    ):
         """Initialize Ansible extractor.
 
         Args:
             graph_builder: Deprecated. Ignored.
             max_workers: Maximum parallel workers for file processing
+            use_processes: Process files in worker processes instead of threads, so
+                the Python-side metadata extraction runs on several cores
         """
         self.max_workers = max_workers
+        self.use_processes = use_processes
 
         # Initialize parsers
-        self.yaml_parser = YAMLParser()
+        # Only the file classification flags are read here
+        self.yaml_parser = YAMLParser(deep=False)
         self.python_parser = PythonParser()
         self.jinja_parser = JinjaParser()
         self.ruby_parser = RubyParser()
@@ -69,9 +97,14 @@ class AnsibleExtractor(BaseExtractor):
         self.processed_files.clear()
 
         # Process files in parallel
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+        with self._create_executor(len(files_to_process)) as executor:
+            process_file = (
+                _process_file_in_worker
+                if isinstance(executor, ProcessPoolExecutor)
+                else self._process_file
+            )
             futures = {
-                executor.submit(self._process_file, file_path, codebase_path): file_path
+                executor.submit(process_file, file_path, codebase_path): file_path
                 for file_path in files_to_process
             }
 
@@ -99,6 +132,28 @@ class AnsibleExtractor(BaseExtractor):
                 except Exception as e:
                     logger.error(f"Failed to process {file_path}: {e}")
 
+    def _create_executor(self, file_count: int) -> Executor:
+        """Create the pool that processes files.
+
+        Threads are the default: tree-sitter releases the GIL while parsing and
+        they are safe inside the MCP server. With ``use_processes`` large
+        codebases are spread over worker processes, each with its own parsers.
+
+        Args:
+            file_count: Number of files to process
+
+        Returns:
+            Executor to submit file processing to
+        """
+        if self.use_processes and file_count >= _PROCESS_POOL_MIN_FILES:
+            logger.info(f"Processing {file_count} files in {self.max_workers} worker processes")
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self._repository_id,),
+            )
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
     def _collect_files(self, codebase_path: Path) -> list[Path]:
         """Collect all relevant files from codebase.
 
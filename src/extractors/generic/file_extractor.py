@@ -1,8 +1,9 @@
 """Generic file-based extractor for unknown repo types."""
 
 import hashlib
+import os
 from pathlib import Path
-from typing import Any, Generator, Optional
+from typing import Any, Generator, Iterator, Optional
 
 from ..base_extractor import BaseExtractor
 from ..registry import ExtractorRegistry
@@ -50,25 +51,20 @@ class GenericExtractor(BaseExtractor):
         codebase_path = Path(codebase_path)
         self._repository_id = repository_id
 
-        for item in codebase_path.rglob("*"):
-            # Skip ignored directories
-            if any(ignored in item.parts for ignored in IGNORED_DIRS):
-                continue
-
-            rel_path = item.relative_to(codebase_path)
-
-            if item.is_dir():
+        for entry, rel_path, _ in self._walk(codebase_path):
+            if entry.is_dir():
                 node: dict[str, Any] = {
                     "type": "Directory",
                     "properties": {
-                        "path": str(rel_path),
-                        "name": item.name,
+                        "path": rel_path,
+                        "name": entry.name,
                     },
                 }
                 if self._repository_id:
                     node["properties"]["repository"] = self._repository_id
                 yield node
-            elif item.is_file():
+            elif entry.is_file():
+                item = Path(entry.path)
                 # Skip binary/compiled files
                 if item.suffix in IGNORED_EXTENSIONS:
                     continue
@@ -80,18 +76,19 @@ class GenericExtractor(BaseExtractor):
                 except Exception:
                     content_hash = "error"
 
+                stat = entry.stat()
                 node = {
                     "type": "File",
                     "properties": {
-                        "path": str(rel_path),
+                        "path": rel_path,
                         "absolute_path": str(item.absolute()),
                         "name": item.name,
                         "file_type": item.suffix[1:] if item.suffix else "none",  # Generic type
                         "type": self._detect_file_type(item),  # For spec 'type' property
                         "extension": item.suffix,
-                        "size": item.stat().st_size,
+                        "size": stat.st_size,
                         "content_hash": content_hash,
-                        "last_modified": int(item.stat().st_mtime),
+                        "last_modified": int(stat.st_mtime),
                     },
                 }
                 if self._repository_id:
@@ -123,28 +120,51 @@ class GenericExtractor(BaseExtractor):
         codebase_path = Path(codebase_path)
         self._repository_id = repository_id
 
-        for item in codebase_path.rglob("*"):
-            if any(ignored in item.parts for ignored in IGNORED_DIRS):
-                continue
+        for entry, target_path, source_path in self._walk(codebase_path):
+            is_file = entry.is_file()
 
             # Skip binary/compiled files (same check as extract nodes)
-            if item.is_file() and item.suffix in IGNORED_EXTENSIONS:
+            if is_file and Path(entry.name).suffix in IGNORED_EXTENSIONS:
                 continue
 
-            if item.parent != codebase_path:
-                # Check if parent is ignored?
-                if any(ignored in item.parent.parts for ignored in IGNORED_DIRS):
-                    continue
-
-                source_path = str(item.parent.relative_to(codebase_path))
-                target_path = str(item.relative_to(codebase_path))
-
+            if source_path:
                 # Identify source/target by path
                 yield {
                     "type": "CONTAINS",
                     "source": {"type": "Directory", "properties": {"path": source_path}},
                     "target": {
-                        "type": "File" if item.is_file() else "Directory",
+                        "type": "File" if is_file else "Directory",
                         "properties": {"path": target_path},
                     },
                 }
+
+    def _walk(self, codebase_path: Path) -> Iterator[tuple[os.DirEntry[str], str, str]]:
+        """Walk the codebase with os.scandir, skipping ignored names.
+
+        Ignored directories are not descended into at all, and DirEntry answers
+        is_dir()/is_file() from the directory listing, so most entries cost no
+        stat() call. Symlinked directories are listed but not followed.
+
+        Args:
+            codebase_path: Root path
+
+        Yields:
+            Tuples of (entry, path relative to the root, relative path of its
+            parent directory, "" for the root itself)
+        """
+        pending = [(str(codebase_path), "")]
+        while pending:
+            dir_path, rel_dir = pending.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            for entry in entries:
+                if entry.name in IGNORED_DIRS:
+                    continue
+                rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                yield entry, rel_path, rel_dir
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((entry.path, rel_path))
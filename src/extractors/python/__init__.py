@@ -2,8 +2,9 @@
 
 import ast
 import hashlib
+from itertools import chain
 from pathlib import Path
-from typing import Any, Generator, Optional
+from typing import Any, Generator, Iterator, Optional
 
 from loguru import logger
 
@@ -34,55 +35,15 @@ class PythonExtractor(BaseExtractor):
         codebase_path = Path(codebase_path)
         self._repository_id = repository_id
 
-        # Extract modules (files)
-        for py_file in codebase_path.rglob("*.py"):
-            if "__pycache__" in str(py_file) or ".venv" in str(py_file):
-                continue
-
+        for py_file in self._python_files(codebase_path):
             logger.debug(f"Processing {py_file}")
+            yield self._file_node(py_file, codebase_path)
 
-            # Calculate content hash
             try:
-                with open(py_file, "rb") as f:
-                    content_hash = hashlib.sha256(f.read()).hexdigest()
-            except Exception:
-                content_hash = "error"
-
-            # File node
-            node: dict[str, Any] = {
-                "type": "File",
-                "properties": {
-                    "path": str(py_file.relative_to(codebase_path)),
-                    "absolute_path": str(py_file.absolute()),
-                    "name": py_file.name,
-                    "file_type": "python",
-                    "type": "python",
-                    "content_hash": content_hash,
-                    "last_modified": int(py_file.stat().st_mtime),
-                    "size": py_file.stat().st_size,
-                },
-            }
-            if self._repository_id:
-                node["properties"]["repository"] = self._repository_id
-            yield node
-
-            # Helper to inject repo
-            def inject_repo(
-                generator: Generator[dict[str, Any], None, None],
-            ) -> Generator[dict[str, Any], None, None]:
-                for item in generator:
-                    if self._repository_id:
-                        item["properties"]["repository"] = self._repository_id
-                    yield item
-
-            # Module node
-            yield from inject_repo(extract_modules(py_file, codebase_path))
-
-            # Classes
-            yield from inject_repo(extract_classes(py_file, codebase_path))
-
-            # Functions
-            yield from inject_repo(extract_functions(py_file, codebase_path))
+                tree = self._parse(py_file)
+            except (SyntaxError, UnicodeDecodeError):
+                continue  # Skip files with syntax errors or encoding issues
+            yield from self._entity_nodes(py_file, codebase_path, tree)
 
     def extract_relationships(
         self, codebase_path: Path, repository_id: Optional[str] = None
@@ -91,33 +52,118 @@ class PythonExtractor(BaseExtractor):
         codebase_path = Path(codebase_path)
         self._repository_id = repository_id
 
-        for py_file in codebase_path.rglob("*.py"):
-            if "__pycache__" in str(py_file) or ".venv" in str(py_file):
+        for py_file in self._python_files(codebase_path):
+            try:
+                tree = self._parse(py_file)
+                rels = list(self._import_relationships(tree, py_file, codebase_path))
+            except Exception as e:
+                logger.warning(f"Failed to parse {py_file}: {e}")
                 continue
+            yield from rels
 
-            rel_path = py_file.relative_to(codebase_path)
-            module_name = str(rel_path.with_suffix("")).replace("/", ".")
+    def extract_all(
+        self, codebase_path: Path, repository_id: Optional[str] = None
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Extract entities and relationships in one pass over the codebase.
+
+        Equivalent to ``extract`` followed by ``extract_relationships``, but
+        each file is read and parsed once instead of once per pass.
+
+        Returns:
+            Tuple of (nodes, relationships)
+        """
+        codebase_path = Path(codebase_path)
+        self._repository_id = repository_id
+        nodes: list[dict[str, Any]] = []
+        rels: list[dict[str, Any]] = []
+
+        for py_file in self._python_files(codebase_path):
+            logger.debug(f"Processing {py_file}")
+            nodes.append(self._file_node(py_file, codebase_path))
 
             try:
-                with open(py_file) as f:
-                    tree = ast.parse(f.read())
-
-                # Walk for imports
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            yield {
-                                "type": "IMPORTS",
-                                "source": {"type": "Module", "properties": {"name": module_name}},
-                                "target": {"type": "Module", "properties": {"name": alias.name}},
-                            }
-                    elif isinstance(node, ast.ImportFrom):
-                        if node.module:
-                            target_name = node.module
-                            yield {
-                                "type": "FROM_IMPORTS",
-                                "source": {"type": "Module", "properties": {"name": module_name}},
-                                "target": {"type": "Module", "properties": {"name": target_name}},
-                            }
-            except Exception as e:
+                tree = self._parse(py_file)
+            except (SyntaxError, UnicodeDecodeError) as e:
                 logger.warning(f"Failed to parse {py_file}: {e}")
+                continue
+            nodes.extend(self._entity_nodes(py_file, codebase_path, tree))
+            rels.extend(self._import_relationships(tree, py_file, codebase_path))
+
+        return nodes, rels
+
+    def _python_files(self, codebase_path: Path) -> Iterator[Path]:
+        """Yield the Python files to extract, skipping caches and virtualenvs."""
+        for py_file in codebase_path.rglob("*.py"):
+            if "__pycache__" in str(py_file) or ".venv" in str(py_file):
+                continue
+            yield py_file
+
+    def _parse(self, py_file: Path) -> ast.Module:
+        """Read and parse a Python file; shared by all extraction of that file."""
+        with open(py_file) as f:
+            return ast.parse(f.read())
+
+    def _file_node(self, py_file: Path, codebase_path: Path) -> dict[str, Any]:
+        """Build the File node for a Python file."""
+        # Calculate content hash
+        try:
+            with open(py_file, "rb") as f:
+                content_hash = hashlib.sha256(f.read()).hexdigest()
+        except Exception:
+            content_hash = "error"
+
+        stat = py_file.stat()
+        node: dict[str, Any] = {
+            "type": "File",
+            "properties": {
+                "path": str(py_file.relative_to(codebase_path)),
+                "absolute_path": str(py_file.absolute()),
+                "name": py_file.name,
+                "file_type": "python",
+                "type": "python",
+                "content_hash": content_hash,
+                "last_modified": int(stat.st_mtime),
+                "size": stat.st_size,
+            },
+        }
+        if self._repository_id:
+            node["properties"]["repository"] = self._repository_id
+        return node
+
+    def _entity_nodes(
+        self, py_file: Path, codebase_path: Path, tree: ast.Module
+    ) -> Iterator[dict[str, Any]]:
+        """Yield Module, Class and Function nodes from a parsed file."""
+        for item in chain(
+            extract_modules(py_file, codebase_path, tree),
+            extract_classes(py_file, codebase_path, tree),
+            extract_functions(py_file, codebase_path, tree),
+        ):
+            if self._repository_id:
+                item["properties"]["repository"] = self._repository_id
+            yield item
+
+    def _import_relationships(
+        self, tree: ast.Module, py_file: Path, codebase_path: Path
+    ) -> Iterator[dict[str, Any]]:
+        """Yield IMPORTS and FROM_IMPORTS relationships from a parsed file."""
+        rel_path = py_file.relative_to(codebase_path)
+        module_name = str(rel_path.with_suffix("")).replace("/", ".")
+
+        # Walk for imports
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    yield {
+                        "type": "IMPORTS",
+                        "source": {"type": "Module", "properties": {"name": module_name}},
+                        "target": {"type": "Module", "properties": {"name": alias.name}},
+                    }
+            elif isinstance(node, ast.ImportFrom):
+                if node.module:
+                    target_name = node.module
+                    yield {
+                        "type": "FROM_IMPORTS",
+                        "source": {"type": "Module", "properties": {"name": module_name}},
+                        "target": {"type": "Module", "properties": {"name": target_name}},
+                    }
@@ -2,35 +2,71 @@
 
 import ast
 from pathlib import Path
-from typing import Any, Generator
+from typing import Any, Generator, Optional
 
+_ABSTRACT_BASES = frozenset({"ABC", "abc.ABC"})
+_ABSTRACT_METACLASSES = frozenset({"ABCMeta", "abc.ABCMeta"})
+_ABSTRACT_DECORATORS = frozenset({"abstractmethod", "abc.abstractmethod"})
 
-def extract_classes(file_path: Path, codebase_path: Path) -> Generator[dict[str, Any], None, None]:
-    """Extract class information from Python file."""
-    try:
-        with open(file_path) as f:
-            source = f.read()
-        tree = ast.parse(source)
-    except (SyntaxError, UnicodeDecodeError):
-        return
+
+def _dotted_name(node: ast.expr) -> str:
+    """Return the simple or one-level dotted name of an expression, or ''."""
+    match node:
+        case ast.Name(id=name):
+            return name
+        case ast.Attribute(value=ast.Name(id=value), attr=attr):
+            return f"{value}.{attr}"
+        case _:
+            return ""
+
+
+def _is_abstract(node: ast.ClassDef, bases: list[str]) -> bool:
+    """Check whether a class is abstract (ABC base, ABCMeta or @abstractmethod)."""
+    if bases and not _ABSTRACT_BASES.isdisjoint(bases):
+        return True
+
+    for keyword in node.keywords:
+        if keyword.arg == "metaclass" and _dotted_name(keyword.value) in _ABSTRACT_METACLASSES:
+            return True
+
+    for item in node.body:
+        if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for dec in item.decorator_list:
+                if _dotted_name(dec) in _ABSTRACT_DECORATORS:
+                    return True
+
+    return False
+
+
+def extract_classes(
+    file_path: Path, codebase_path: Path, tree: Optional[ast.Module] = None
+) -> Generator[dict[str, Any], None, None]:
+    """Extract class information from Python file (parsed unless ``tree`` is given)."""
+    if tree is None:
+        try:
+            with open(file_path) as f:
+                source = f.read()
+            tree = ast.parse(source)
+        except (SyntaxError, UnicodeDecodeError):
+            return
 
     for node in ast.walk(tree):
         if isinstance(node, ast.ClassDef):
             # Resolve base classes (simple names only)
             bases = []
             for base in node.bases:
-                if isinstance(base, ast.Name):
-                    bases.append(base.id)
-                elif isinstance(base, ast.Attribute) and isinstance(base.value, ast.Name):
-                    bases.append(f"{base.value.id}.{base.attr}")
+                match base:
+                    case ast.Name(id=name):
+                        bases.append(name)
+                    case ast.Attribute(value=ast.Name(id=value), attr=attr):
+                        bases.append(f"{value}.{attr}")
 
             # Decorators
             decorators = []
             for dec in node.decorator_list:
-                if isinstance(dec, ast.Name):
-                    decorators.append(dec.id)
-                elif isinstance(dec, ast.Call) and isinstance(dec.func, ast.Name):
-                    decorators.append(dec.func.id)
+                match dec:
+                    case ast.Name(id=name) | ast.Call(func=ast.Name(id=name)):
+                        decorators.append(name)
 
             yield {
                 "type": "Class",
@@ -38,7 +74,7 @@ def extract_classes(file_path: Path, codebase_path: Path) -> Generator[dict[str,
                     "name": node.name,
                     "bases": bases,
                     "decorators": decorators,
-                    "docstring": (ast.get_docstring(node) or "")[:500],
-                    "is_abstract": "ABC" in bases,
+                    "docstring": (ast.get_docstring(node, clean=False) or "")[:500],
+                    "is_abstract": _is_abstract(node, bases),
                 },
             }
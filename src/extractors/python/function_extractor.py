@@ -2,19 +2,20 @@
 
 import ast
 from pathlib import Path
-from typing import Any, Generator
+from typing import Any, Generator, Optional
 
 
 def extract_functions(
-    file_path: Path, codebase_path: Path
+    file_path: Path, codebase_path: Path, tree: Optional[ast.Module] = None
 ) -> Generator[dict[str, Any], None, None]:
-    """Extract function information from Python file."""
-    try:
-        with open(file_path) as f:
-            source = f.read()
-        tree = ast.parse(source)
-    except (SyntaxError, UnicodeDecodeError):
-        return
+    """Extract function information from Python file (parsed unless ``tree`` is given)."""
+    if tree is None:
+        try:
+            with open(file_path) as f:
+                source = f.read()
+            tree = ast.parse(source)
+        except (SyntaxError, UnicodeDecodeError):
+            return
 
     for node in ast.walk(tree):
         if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
@@ -24,10 +25,9 @@ def extract_functions(
             # Decorators
             decorators = []
             for dec in node.decorator_list:
-                if isinstance(dec, ast.Name):
-                    decorators.append(dec.id)
-                elif isinstance(dec, ast.Call) and isinstance(dec.func, ast.Name):
-                    decorators.append(dec.func.id)
+                match dec:
+                    case ast.Name(id=name) | ast.Call(func=ast.Name(id=name)):
+                        decorators.append(name)
 
             yield {
                 "type": "Function",
@@ -36,7 +36,7 @@ def extract_functions(
                     "params": params,
                     "return_type": "",  # Complex to extract from AST annotation without resolution
                     "decorators": decorators,
-                    "docstring": (ast.get_docstring(node) or "")[:500],
+                    "docstring": (ast.get_docstring(node, clean=False) or "")[:500],
                     "is_async": isinstance(node, ast.AsyncFunctionDef),
                     "is_method": False,  # Hard to tell without context (if inside class)
                 },
@@ -2,24 +2,27 @@
 
 import ast
 from pathlib import Path
-from typing import Any, Generator
+from typing import Any, Generator, Optional
 
 
-def extract_modules(file_path: Path, codebase_path: Path) -> Generator[dict[str, Any], None, None]:
-    """Extract module information from Python file."""
-    try:
-        with open(file_path) as f:
-            source = f.read()
-        tree = ast.parse(source)
-    except (SyntaxError, UnicodeDecodeError):
-        return  # Skip files with syntax errors or encoding issues
+def extract_modules(
+    file_path: Path, codebase_path: Path, tree: Optional[ast.Module] = None
+) -> Generator[dict[str, Any], None, None]:
+    """Extract module information from Python file (parsed unless ``tree`` is given)."""
+    if tree is None:
+        try:
+            with open(file_path) as f:
+                source = f.read()
+            tree = ast.parse(source)
+        except (SyntaxError, UnicodeDecodeError):
+            return  # Skip files with syntax errors or encoding issues
 
     # Calculate module name from path
     rel_path = file_path.relative_to(codebase_path)
     module_name = str(rel_path.with_suffix("")).replace("/", ".")
 
     # Get docstring
-    docstring = ast.get_docstring(tree) or ""
+    docstring = ast.get_docstring(tree, clean=False) or ""
 
     yield {
         "type": "Module",
@@ -7,8 +7,64 @@ from loguru import logger
 from neo4j import Driver, GraphDatabase
 
 from ..config import Config
+from .queries import GET_LABELS_AND_RELATIONSHIP_TYPES
 from .schema import Node, NodeType, Relationship, RelationshipType, load_schema
 
+_DEFAULT_MERGE_KEYS = ["name"]
+
+# Composite merge keys per node type
+_MERGE_KEYS: dict[NodeType, list[str]] = {
+    NodeType.FILE: ["repository", "path"],
+    NodeType.PLAYBOOK: ["repository", "path"],
+    NodeType.TEMPLATE: ["repository", "path"],
+    NodeType.INVENTORY: ["repository", "path"],
+    NodeType.VARS_FILE: ["repository", "path"],
+    NodeType.DIRECTORY: ["repository", "path"],
+    NodeType.ROLE: ["name"],  # Keep global - NO repository
+    NodeType.PLAY: ["repository", "playbook_path", "name", "order"],
+    NodeType.TASK: ["repository", "file_path", "name", "order"],
+    NodeType.HANDLER: ["repository", "file_path", "name"],
+    NodeType.VARIABLE: ["repository", "name", "scope", "file_path"],
+    NodeType.MODULE: ["repository", "path"],
+    # Spec said module_path but existing was name. Sticking to name + repo
+    NodeType.CLASS: ["repository", "name"],
+    # Spec said file_path but existing was name.
+    NodeType.FUNCTION: ["repository", "name"],
+    # Spec said file_path, name. Existing schema has module, alias
+    NodeType.IMPORT: ["repository", "module", "alias"],
+    NodeType.REFERENCE: ["repository", "name"],
+}
+
+# Relationship endpoint match conditions (with and without repository context)
+_FROM_MATCH = "a.path = $from_id OR a.name = $from_id"
+_FROM_REPO_MATCH = "a.repository = $from_repo AND (a.path = $from_id OR a.name = $from_id)"
+_TO_MATCH = "b.path = $to_id OR b.name = $to_id"
+_TO_REPO_MATCH = "b.repository = $to_repo AND (b.path = $to_id OR b.name = $to_id)"
+
+
+def _build_node_merge_query(node_type: NodeType) -> str:
+    """Build the batched MERGE query for a node type.
+
+    Args:
+        node_type: Type of node
+
+    Returns:
+        Cypher query merging on the node type's composite keys
+    """
+    merge_keys = _MERGE_KEYS.get(node_type, _DEFAULT_MERGE_KEYS)
+    merge_conditions = ", ".join(f"{key}: props.{key}" for key in merge_keys)
+    # node_type denormalises the label so readers can skip labels(n)[0] per row
+    return (
+        f"UNWIND $batch AS props "
+        f"MERGE (n:{node_type.value} {{{merge_conditions}}}) "
+        f"SET n += props, n.node_type = '{node_type.value}'"
+    )
+
+
+def _escape_name(name: str) -> str:
+    """Backtick-quote a label or relationship type for interpolation into Cypher."""
+    return "`" + name.replace("`", "``") + "`"
+
 
 class GraphBuilder:
     """Builds and manages the Neo4j graph database."""
@@ -32,6 +88,13 @@ class GraphBuilder:
         self._node_batch: list[Node] = []
         self._rel_batch: list[Relationship] = []
 
+        # Pre-built query strings so every flush sends byte-identical Cypher
+        # and hits Neo4j's query plan cache
+        self._node_queries: dict[NodeType, str] = {
+            node_type: _build_node_merge_query(node_type) for node_type in NodeType
+        }
+        self._rel_queries: dict[tuple[RelationshipType, NodeType, NodeType, bool, bool], str] = {}
+
     def _create_driver(self) -> Driver:
         """Create Neo4j driver from configuration.
 
@@ -188,44 +251,40 @@ class GraphBuilder:
         Returns:
             List of property names to use as composite merge key
         """
-        if node_type in [
-            NodeType.FILE,
-            NodeType.PLAYBOOK,
-            NodeType.TEMPLATE,
-            NodeType.INVENTORY,
-            NodeType.VARS_FILE,
-            NodeType.DIRECTORY,
-        ]:
-            return ["repository", "path"]  # Composite key
-        elif node_type == NodeType.ROLE:
-            return ["name"]  # Keep global - NO repository
-        elif node_type == NodeType.PLAY:
-            return ["repository", "playbook_path", "name", "order"]
-        elif node_type == NodeType.TASK:
-            return ["repository", "file_path", "name", "order"]
-        elif node_type == NodeType.HANDLER:
-            return ["repository", "file_path", "name"]
-        elif node_type == NodeType.VARIABLE:
-            return ["repository", "name", "scope", "file_path"]
-        elif node_type == NodeType.MODULE:
-            return ["repository", "path"]
-        elif node_type == NodeType.CLASS:
-            return [
-                "repository",
-                "name",
-            ]  # Spec said module_path but existing was name. Sticking to name + repo
-        elif node_type == NodeType.FUNCTION:
-            return ["repository", "name"]  # Spec said file_path but existing was name.
-        elif node_type == NodeType.IMPORT:
-            return [
-                "repository",
-                "module",
-                "alias",
-            ]  # Spec said file_path, name. Existing schema has module, alias
-        elif node_type == NodeType.REFERENCE:
-            return ["repository", "name"]
-        else:
-            return ["name"]
+        return _MERGE_KEYS.get(node_type, _DEFAULT_MERGE_KEYS)
+
+    def _get_relationship_query(
+        self,
+        rel_type: RelationshipType,
+        from_type: NodeType,
+        to_type: NodeType,
+        from_repo: bool,
+        to_repo: bool,
+    ) -> str:
+        """Get the (cached) MERGE query for a relationship shape.
+
+        Args:
+            rel_type: Type of relationship
+            from_type: Type of the source node
+            to_type: Type of the target node
+            from_repo: Whether the source node is scoped by repository
+            to_repo: Whether the target node is scoped by repository
+
+        Returns:
+            Cypher query string, identical for every relationship of the same shape
+        """
+        key = (rel_type, from_type, to_type, from_repo, to_repo)
+        query = self._rel_queries.get(key)
+        if query is None:
+            from_match = _FROM_REPO_MATCH if from_repo else _FROM_MATCH
+            to_match = _TO_REPO_MATCH if to_repo else _TO_MATCH
+            query = (
+                f"MATCH (a:{from_type.value}) WHERE {from_match} "
+                f"MATCH (b:{to_type.value}) WHERE {to_match} "
+                f"MERGE (a)-[r:{rel_type.value}]->(b) SET r += $rel_props"
+            )
+            self._rel_queries[key] = query
+        return query
 
     def _flush_nodes(self) -> None:
         """Flush node batch to database."""
@@ -234,8 +293,10 @@ class GraphBuilder:
 
         logger.info(f"Flushing {len(self._node_batch)} nodes to database...")
 
-        # Group nodes by type for batch processing
-        nodes_by_type: dict[NodeType, list[Node]] = defaultdict(list)
+        # Group nodes by type for batch processing, deduplicated on merge key.
+        # Rows sharing a merge key are folded client-side (later properties win),
+        # matching what successive MERGE ... SET n += props would produce.
+        nodes_by_type: dict[NodeType, dict[tuple[Any, ...], dict[str, Any]]] = defaultdict(dict)
         for node in self._node_batch:
             # Validate merge keys are not None
             merge_keys = self._get_merge_keys(node.node_type)
@@ -257,28 +318,20 @@ class GraphBuilder:
                 )
                 continue
 
-            nodes_by_type[node.node_type].append(node)
+            merge_key = tuple(props[key] for key in merge_keys)
+            existing = nodes_by_type[node.node_type].get(merge_key)
+            if existing is None:
+                nodes_by_type[node.node_type][merge_key] = props
+            else:
+                existing.update(props)
 
         with self.driver.session(database=self.config.neo4j.database) as session:
             for node_type, nodes in nodes_by_type.items():
                 # Prepare batch data
-                batch_data = [node.to_cypher_dict() for node in nodes]
-
-                # Get composite merge keys for this node type
-                merge_keys = self._get_merge_keys(node_type)
-
-                # Build MERGE clause with composite keys
-                merge_conditions = ", ".join([f"{key}: props.{key}" for key in merge_keys])
-
-                # Use MERGE for all node types to ensure deduplication
-                query = f"""
-                UNWIND $batch AS props
-                MERGE (n:{node_type.value} {{{merge_conditions}}})
-                SET n += props
-                """
+                batch_data = list(nodes.values())
 
                 try:
-                    session.run(query, batch=batch_data)
+                    session.run(self._node_queries[node_type], batch=batch_data)
                     logger.debug(f"Created/updated {len(batch_data)} {node_type.value} nodes")
                 except Exception as e:
                     logger.error(f"Failed to create nodes of type {node_type.value}: {e}")
@@ -301,17 +354,12 @@ class GraphBuilder:
         with self.driver.session(database=self.config.neo4j.database) as session:
             for rel_type, rels in rels_by_type.items():
                 for rel in rels:
-                    # Build Cypher query for relationship creation
-                    # We match nodes by their identifying properties and create relationship
-                    from_type = rel.from_node.node_type.value
-                    to_type = rel.to_node.node_type.value
-
-                    # Use path as primary identifier for most nodes
+                    # Match nodes by their identifying properties and create relationship
                     from_props = rel.from_node.to_cypher_dict()
                     to_props = rel.to_node.to_cypher_dict()
                     rel_props = rel.to_cypher_dict()
 
-                    # Construct match conditions
+                    # Use path as primary identifier for most nodes
                     from_id = from_props.get("path") or from_props.get("name")
                     to_id = to_props.get("path") or to_props.get("name")
 
@@ -323,29 +371,13 @@ class GraphBuilder:
                         logger.warning("Skipping relationship: missing identifiers")
                         continue
 
-                    # Build match with repository context
-                    if from_repo:
-                        from_match = (
-                            "a.repository = $from_repo AND (a.path = $from_id OR a.name = $from_id)"
-                        )
-                    else:
-                        from_match = "a.path = $from_id OR a.name = $from_id"
-
-                    if to_repo:
-                        to_match = (
-                            "b.repository = $to_repo AND (b.path = $to_id OR b.name = $to_id)"
-                        )
-                    else:
-                        to_match = "b.path = $to_id OR b.name = $to_id"
-
-                    query = f"""
-                    MATCH (a:{from_type})
-                    WHERE {from_match}
-                    MATCH (b:{to_type})
-                    WHERE {to_match}
-                    MERGE (a)-[r:{rel_type.value}]->(b)
-                    SET r += $rel_props
-                    """
+                    query = self._get_relationship_query(
+                        rel_type,
+                        rel.from_node.node_type,
+                        rel.to_node.node_type,
+                        bool(from_repo),
+                        bool(to_repo),
+                    )
 
                     try:
                         session.run(
@@ -365,39 +397,42 @@ class GraphBuilder:
     def get_stats(self) -> dict[str, int]:
         """Get statistics about the graph.
 
+        Uses two round-trips: one to discover the labels and relationship types
+        that exist, and one ``UNION ALL`` query that counts all of them (each
+        branch is answered from Neo4j's count store).
+
         Returns:
             Dictionary with node and relationship counts
         """
-        stats = {}
+        stats: dict[str, int] = {}
 
         with self.driver.session(database=self.config.neo4j.database) as session:
-            # Get actual labels from database (avoids warnings for non-existent labels)
-            labels_result = session.run("CALL db.labels()")
-            actual_labels = {record["label"] for record in labels_result}
-
-            # Count nodes by type (only for labels that exist)
-            for label in actual_labels:
-                result = session.run(f"MATCH (n:`{label}`) RETURN count(n) as count")
-                record = result.single()
-                stats[f"nodes_{label}"] = record["count"] if record else 0
-
-            # Get actual relationship types from database
-            rels_result = session.run("CALL db.relationshipTypes()")
-            actual_rels = {record["relationshipType"] for record in rels_result}
-
-            # Count relationships by type (only for types that exist)
-            for rel_type in actual_rels:
-                result = session.run(f"MATCH ()-[r:`{rel_type}`]->() RETURN count(r) as count")
-                record = result.single()
-                stats[f"rels_{rel_type}"] = record["count"] if record else 0
+            # Get actual labels/types from database (avoids warnings for non-existent labels)
+            record = session.run(GET_LABELS_AND_RELATIONSHIP_TYPES).single()
+            actual_labels = record["labels"] if record else []
+            actual_rels = record["rel_types"] if record else []
+
+            branches = []
+            params: dict[str, str] = {}
+            for i, label in enumerate(actual_labels):
+                params[f"n{i}"] = f"nodes_{label}"
+                branches.append(
+                    f"MATCH (n:{_escape_name(label)}) RETURN $n{i} AS key, count(n) AS count"
+                )
+            for i, rel_type in enumerate(actual_rels):
+                params[f"r{i}"] = f"rels_{rel_type}"
+                branches.append(
+                    f"MATCH ()-[r:{_escape_name(rel_type)}]->() "
+                    f"RETURN $r{i} AS key, count(r) AS count"
+                )
 
             # Total counts
-            result = session.run("MATCH (n) RETURN count(n) as count")
-            record = result.single()
-            stats["total_nodes"] = record["count"] if record else 0
+            branches.append("MATCH (n) RETURN 'total_nodes' AS key, count(n) AS count")
+            branches.append(
+                "MATCH ()-[r]->() RETURN 'total_relationships' AS key, count(r) AS count"
+            )
 
-            result = session.run("MATCH ()-[r]->() RETURN count(r) as count")
-            record = result.single()
-            stats["total_relationships"] = record["count"] if record else 0
+            for row in session.run(" UNION ALL ".join(branches), params):
+                stats[row["key"]] = row["count"]
 
         return stats
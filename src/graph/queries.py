@@ -36,9 +36,9 @@ RETURN h
 """
 
 # Schema queries
-GET_NODE_COUNTS = """
-CALL db.labels() YIELD label
-CALL apoc.cypher.run('MATCH (n:`' + label + '`) RETURN count(n) as count', {})
-YIELD value
-RETURN label, value.count as count
+GET_LABELS_AND_RELATIONSHIP_TYPES = """
+CALL { CALL db.labels() YIELD label RETURN collect(label) AS labels }
+CALL { CALL db.relationshipTypes() YIELD relationshipType
+       RETURN collect(relationshipType) AS rel_types }
+RETURN labels, rel_types
 """
@@ -1,13 +1,24 @@
 """Graph schema definitions and utilities."""
 
+import hashlib
+import os
+import pickle
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import yaml
 from loguru import logger
 
+from ..config import user_cache_dir
+
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YAMLLoader  # type: ignore[assignment]
+
 SCHEMA_DIR = Path(__file__).parent.parent.parent / "config" / "schemas"
 
 
@@ -75,7 +86,7 @@ class RelationshipType(str, Enum):
     USES = "USES"
 
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     """Represents a node in the graph."""
 
@@ -89,10 +100,13 @@ class Node:
         Returns:
             Dictionary of properties for Cypher query
         """
-        return {k: v for k, v in self.properties.items() if v is not None}
+        properties = self.properties
+        if None not in properties.values():
+            return dict(properties)
+        return {k: v for k, v in properties.items() if v is not None}
 
 
-@dataclass
+@dataclass(slots=True)
 class Relationship:
     """Represents a relationship in the graph."""
 
@@ -107,7 +121,131 @@ class Relationship:
         Returns:
             Dictionary of properties for Cypher query
         """
-        return {k: v for k, v in self.properties.items() if v is not None}
+        properties = self.properties
+        if None not in properties.values():
+            return dict(properties)
+        return {k: v for k, v in properties.items() if v is not None}
+
+
+# Value -> member lookups used to resolve schema YAML names once at load
+_NODE_TYPES: dict[str, NodeType] = {member.value: member for member in NodeType}
+_RELATIONSHIP_TYPES: dict[str, RelationshipType] = {
+    member.value: member for member in RelationshipType
+}
+
+NodeValidator = Callable[[dict[str, Any]], list[str]]
+RelationshipValidator = Callable[[Node, Node], list[str]]
+
+
+def _compile_node_validator(node_type: str, node_schema: dict[str, Any]) -> NodeValidator:
+    """Build a validator that checks a node's required properties.
+
+    Args:
+        node_type: Node type name
+        node_schema: Node schema configuration
+
+    Returns:
+        Callable taking node properties and returning a list of errors
+    """
+    required = [
+        (prop_schema["name"], f"Required property '{prop_schema['name']}' missing for {node_type}")
+        for prop_schema in node_schema.get("properties", [])
+        if prop_schema.get("required", False)
+    ]
+
+    # Specialize the common shapes (most node types have 0-1 required properties)
+    # so they skip the generic loop entirely
+    if not required:
+
+        def validate_none(properties: dict[str, Any]) -> list[str]:
+            return []
+
+        return validate_none
+
+    if len(required) == 1:
+        ((only_name, only_message),) = required
+
+        def validate_one(properties: dict[str, Any]) -> list[str]:
+            if properties.get(only_name) is None:
+                return [only_message]
+            return []
+
+        return validate_one
+
+    def validate(properties: dict[str, Any]) -> list[str]:
+        return [message for name, message in required if properties.get(name) is None]
+
+    return validate
+
+
+def _endpoint_types(value: Any) -> Optional[frozenset[NodeType]]:
+    """Resolve a relationship from/to spec to NodeType members; ``None`` means any."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = [value]
+    # Wildcard support
+    if "*" in value:
+        return None
+    # Names that aren't NodeType values can never match a Node, so they are dropped
+    return frozenset(_NODE_TYPES[v] for v in value if v in _NODE_TYPES)
+
+
+def _compile_relationship_validator(
+    rel_type: str, rel_schema: dict[str, Any]
+) -> RelationshipValidator:
+    """Build a validator that checks a relationship's endpoint node types.
+
+    Args:
+        rel_type: Relationship type name
+        rel_schema: Relationship schema configuration
+
+    Returns:
+        Callable taking the source and target nodes and returning a list of errors
+    """
+    valid_from = _endpoint_types(rel_schema.get("from"))
+    valid_to = _endpoint_types(rel_schema.get("to"))
+
+    # Branching on wildcards happens here, once, rather than per relationship
+    if valid_from is None:
+        if valid_to is None:
+
+            def validate_any(from_node: Node, to_node: Node) -> list[str]:
+                return []
+
+            return validate_any
+
+        allowed_to: frozenset[NodeType] = valid_to
+
+        def validate_to(from_node: Node, to_node: Node) -> list[str]:
+            if to_node.node_type not in allowed_to:
+                return [f"Invalid target node type '{to_node.node_type.value}' for {rel_type}"]
+            return []
+
+        return validate_to
+
+    if valid_to is None:
+        allowed_from: frozenset[NodeType] = valid_from
+
+        def validate_from(from_node: Node, to_node: Node) -> list[str]:
+            if from_node.node_type not in allowed_from:
+                return [f"Invalid source node type '{from_node.node_type.value}' for {rel_type}"]
+            return []
+
+        return validate_from
+
+    both_from: frozenset[NodeType] = valid_from
+    both_to: frozenset[NodeType] = valid_to
+
+    def validate(from_node: Node, to_node: Node) -> list[str]:
+        errors = []
+        if from_node.node_type not in both_from:
+            errors.append(f"Invalid source node type '{from_node.node_type.value}' for {rel_type}")
+        if to_node.node_type not in both_to:
+            errors.append(f"Invalid target node type '{to_node.node_type.value}' for {rel_type}")
+        return errors
+
+    return validate
 
 
 class SchemaProfile:
@@ -131,6 +269,29 @@ class SchemaProfile:
         self.indexes = schema_config.get("indexes", [])
         self.constraints = schema_config.get("constraints", [])
 
+        # Validators are compiled once so the per-node path does no schema walking.
+        # They are keyed by enum member, so lookups never touch ``.value``; schema
+        # types without a matching enum member can't occur on a Node and are skipped.
+        self._node_validators: dict[NodeType, NodeValidator] = {
+            _NODE_TYPES[node_type]: _compile_node_validator(node_type, node_schema)
+            for node_type, node_schema in self.nodes.items()
+            if node_type in _NODE_TYPES
+        }
+        self._rel_validators: dict[RelationshipType, RelationshipValidator] = {
+            _RELATIONSHIP_TYPES[rel_type]: _compile_relationship_validator(rel_type, rel_schema)
+            for rel_type, rel_schema in self.relationships.items()
+            if rel_type in _RELATIONSHIP_TYPES
+        }
+
+        unknown_types = [t for t in self.nodes if t not in _NODE_TYPES] + [
+            t for t in self.relationships if t not in _RELATIONSHIP_TYPES
+        ]
+        if unknown_types:
+            logger.warning(
+                f"Schema profile '{name}' defines types with no matching enum member "
+                f"(they will never validate): {unknown_types}"
+            )
+
     @property
     def node_types(self) -> list[str]:
         return list(self.nodes.keys())
@@ -143,12 +304,25 @@ class SchemaProfile:
         props: list[dict[str, Any]] = self.nodes.get(node_type, {}).get("properties", [])
         return props
 
-    def get_create_index_queries(self) -> list[str]:
-        """Generate Cypher queries to create indexes.
+    def get_create_index_queries(self) -> tuple[str, ...]:
+        """Get Cypher queries to create indexes.
+
+        Returns:
+            Tuple of CREATE INDEX Cypher queries
+        """
+        return self.create_index_queries
+
+    def get_create_constraint_queries(self) -> tuple[str, ...]:
+        """Get Cypher queries to create constraints.
 
         Returns:
-            List of CREATE INDEX Cypher queries
+            Tuple of CREATE CONSTRAINT Cypher queries
         """
+        return self.create_constraint_queries
+
+    @cached_property
+    def create_index_queries(self) -> tuple[str, ...]:
+        """CREATE INDEX Cypher queries, generated once from the schema."""
         queries = []
         for index in self.indexes:
             node_type = index["node"]
@@ -168,14 +342,11 @@ class SchemaProfile:
                 query = f"CREATE INDEX {index_name} IF NOT EXISTS FOR (n:{node_type}) ON (n.{prop})"
 
             queries.append(query)
-        return queries
-
-    def get_create_constraint_queries(self) -> list[str]:
-        """Generate Cypher queries to create constraints.
+        return tuple(queries)
 
-        Returns:
-            List of CREATE CONSTRAINT Cypher queries
-        """
+    @cached_property
+    def create_constraint_queries(self) -> tuple[str, ...]:
+        """CREATE CONSTRAINT Cypher queries, generated once from the schema."""
         queries = []
         for constraint in self.constraints:
             node_type = constraint["node"]
@@ -201,7 +372,7 @@ class SchemaProfile:
                     )
                 queries.append(query)
 
-        return queries
+        return tuple(queries)
 
     def validate_node(self, node: Node) -> tuple[bool, list[str]]:
         """Validate a node against schema requirements.
@@ -212,26 +383,15 @@ class SchemaProfile:
         Returns:
             Tuple of (is_valid, list_of_errors)
         """
-        errors = []
-        node_type_str = node.node_type.value
+        validator = self._node_validators.get(node.node_type)
 
-        if node_type_str not in self.nodes:
+        if validator is None:
             # Maybe allow unknown nodes if schema is open?
             # For now strict validation
-            errors.append(f"Unknown node type: {node_type_str}")
-            return False, errors
-
-        node_schema = self.nodes[node_type_str]
-        properties_schema = node_schema.get("properties", [])
-
-        # Check required properties
-        for prop_schema in properties_schema:
-            prop_name = prop_schema["name"]
-            if prop_schema.get("required", False):
-                if prop_name not in node.properties or node.properties[prop_name] is None:
-                    errors.append(f"Required property '{prop_name}' missing for {node_type_str}")
+            return False, [f"Unknown node type: {node.node_type.value}"]
 
-        return len(errors) == 0, errors
+        errors = validator(node.properties)
+        return not errors, errors
 
     def validate_relationship(self, rel: Relationship) -> tuple[bool, list[str]]:
         """Validate a relationship against schema requirements.
@@ -242,42 +402,13 @@ class SchemaProfile:
         Returns:
             Tuple of (is_valid, list_of_errors)
         """
-        errors = []
-        rel_type_str = rel.rel_type.value
-
-        if rel_type_str not in self.relationships:
-            errors.append(f"Unknown relationship type: {rel_type_str}")
-            return False, errors
-
-        rel_schema = self.relationships[rel_type_str]
-
-        # Validate from/to node types
-        valid_from = rel_schema.get("from")
-        valid_to = rel_schema.get("to")
-
-        # Handle list or string
-        if isinstance(valid_from, str):
-            valid_from = [valid_from]
-        if isinstance(valid_to, str):
-            valid_to = [valid_to]
+        validator = self._rel_validators.get(rel.rel_type)
 
-        # Wildcard support
-        if valid_from and "*" in valid_from:
-            valid_from = None
-        if valid_to and "*" in valid_to:
-            valid_to = None
+        if validator is None:
+            return False, [f"Unknown relationship type: {rel.rel_type.value}"]
 
-        if valid_from and rel.from_node.node_type.value not in valid_from:
-            errors.append(
-                f"Invalid source node type '{rel.from_node.node_type.value}' for {rel_type_str}"
-            )
-
-        if valid_to and rel.to_node.node_type.value not in valid_to:
-            errors.append(
-                f"Invalid target node type '{rel.to_node.node_type.value}' for {rel_type_str}"
-            )
-
-        return len(errors) == 0, errors
+        errors = validator(rel.from_node, rel.to_node)
+        return not errors, errors
 
 
 # Alias for backward compatibility if needed, though we will update usage
@@ -287,6 +418,9 @@ GraphSchema = SchemaProfile
 def load_schema(profile: str = "ansible") -> SchemaProfile:
     """Load schema by profile name.
 
+    Parsed profiles are cached per file modification time, so repeated calls
+    return the same (read-only) SchemaProfile until the YAML file changes.
+
     Args:
         profile: Schema profile name (ansible, python, generic)
 
@@ -307,15 +441,71 @@ def load_schema(profile: str = "ansible") -> SchemaProfile:
         else:
             raise FileNotFoundError(f"Schema not found: {schema_path}")
 
-    with open(schema_path) as f:
-        data = yaml.safe_load(f)
+    stat = schema_path.stat()
+    return _load_schema_cached(profile, schema_path, (stat.st_mtime_ns, stat.st_size))
 
+
+@lru_cache(maxsize=16)
+def _load_schema_cached(profile: str, schema_path: Path, stamp: tuple[int, int]) -> SchemaProfile:
+    """Parse a schema file. ``stamp`` (mtime_ns, size) is only part of the cache key."""
+    data = _read_schema_data(schema_path)
     logger.info(f"Loaded schema profile: {profile}")
     return SchemaProfile(profile, data)
 
 
+def _read_schema_data(schema_path: Path) -> dict[str, Any]:
+    """Read schema YAML, via a pickled copy keyed by the file's content.
+
+    The pickle holds only the parsed YAML data (validators are rebuilt by
+    SchemaProfile), so it saves the YAML parse in fresh processes. It lives in
+    the user cache directory, never next to the schema, and is named after a
+    hash of the YAML bytes so any edit misses regardless of timestamps.
+    Failures to read or write the cache are ignored and fall back to parsing
+    the YAML.
+    """
+    with open(schema_path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    cache_path = user_cache_dir() / "schemas" / f"{schema_path.stem}-{digest}.pkl"
+    try:
+        with open(cache_path, "rb") as f:
+            cached: dict[str, Any] = pickle.load(f)
+        return cached
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+
+    data: dict[str, Any] = yaml.load(raw, Loader=_YAMLLoader)
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Could not write schema cache {cache_path}: {e}")
+
+    return data
+
+
+_schema_names: Optional[list[str]] = None
+
+
 def list_schemas() -> list[str]:
     """List available schema profiles."""
-    if not SCHEMA_DIR.exists():
-        return ["ansible"]  # Legacy fallback
-    return [p.stem for p in SCHEMA_DIR.glob("*.yaml")]
+    global _schema_names
+
+    if _schema_names is None:
+        if not SCHEMA_DIR.exists():
+            _schema_names = ["ansible"]  # Legacy fallback
+        else:
+            _schema_names = [p.stem for p in SCHEMA_DIR.glob("*.yaml")]
+    return list(_schema_names)
+
+
+def clear_schema_cache() -> None:
+    """Drop cached schema profiles and the cached profile list."""
+    global _schema_names
+
+    _load_schema_cached.cache_clear()
+    _schema_names = None
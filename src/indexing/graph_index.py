@@ -1,9 +1,13 @@
 """LlamaIndex PropertyGraphIndex integration."""
 
-from typing import Any, Optional, cast
+import threading
+from functools import lru_cache
+from typing import Any, Iterator, Optional, cast
 
 from llama_index.core import Settings
+from llama_index.core.base.base_query_engine import BaseQueryEngine
 from llama_index.core.indices.property_graph import PropertyGraphIndex
+from llama_index.core.schema import NodeWithScore
 from llama_index.graph_stores.neo4j import Neo4jPropertyGraphStore
 from llama_index.llms.openai_like import OpenAILike
 from loguru import logger
@@ -11,6 +15,57 @@ from loguru import logger
 from ..config import LLMConfig, Neo4jConfig
 
 
+_NODE_BY_ID_QUERY = "MATCH (n) WHERE elementId(n) = $node_id RETURN n"
+
+_NEIGHBOR_QUERY = """
+UNWIND $node_ids AS node_id
+MATCH (start)
+WHERE elementId(start) = node_id
+CALL {{
+    WITH start
+    MATCH (start){pattern}(neighbor)
+    RETURN neighbor, type(r) as relationship
+    LIMIT $limit
+}}
+RETURN node_id, neighbor, relationship
+"""
+
+# Relationship pattern per direction; anything else means both
+_DIRECTION_PATTERNS = {
+    "in": "<-[r{rel_filter}]-",
+    "out": "-[r{rel_filter}]->",
+    "both": "-[r{rel_filter}]-",
+}
+
+
+@lru_cache(maxsize=64)
+def _build_neighbor_cypher(relationship_types: Optional[tuple[str, ...]], direction: str) -> str:
+    """Build the batched neighbor query for a relationship filter and direction.
+
+    Args:
+        relationship_types: Sorted relationship types to filter on, or None for all
+        direction: 'in', 'out', or 'both'
+
+    Returns:
+        Parameterized Cypher query (``$node_ids``, ``$limit``)
+    """
+    rel_filter = ":" + "|".join(relationship_types) if relationship_types else ""
+    pattern = _DIRECTION_PATTERNS.get(direction, _DIRECTION_PATTERNS["both"])
+    return _NEIGHBOR_QUERY.format(pattern=pattern.format(rel_filter=rel_filter))
+
+
+def _source_snippet(node: NodeWithScore, length: int = 200) -> str:
+    """Return the leading text of a source node.
+
+    Slices the raw node text directly instead of going through
+    ``get_content()``, which formats the full content before truncation.
+    """
+    text = getattr(node.node, "text", None)
+    if not isinstance(text, str):
+        text = node.get_content()
+    return text[:length]
+
+
 class GraphRAGIndex:
     """LlamaIndex-based GraphRAG query interface.
 
@@ -33,23 +88,49 @@ class GraphRAGIndex:
         self.neo4j_config = neo4j_config
         self.llm_config = llm_config
 
-        # Initialize LLM
-        self._setup_llm()
-
-        # Initialize graph store
-        self.graph_store = Neo4jPropertyGraphStore(
-            url=neo4j_config.uri,
-            username=neo4j_config.user,
-            password=neo4j_config.password,
-            database=neo4j_config.database,
-        )
-
-        # Create index from existing graph
-        self.index = PropertyGraphIndex.from_existing(
-            property_graph_store=self.graph_store,
-        )
-
-        logger.info("GraphRAG index initialized")
+        # Query engines are reusable across queries; cache per configuration
+        self._engine_cache: dict[tuple[bool, str], BaseQueryEngine] = {}
+
+        # Built lazily, possibly from several worker threads at once; the lock
+        # makes sure each is built (and Settings.llm set) only once
+        self._graph_store: Optional[Neo4jPropertyGraphStore] = None
+        self._index: Optional[PropertyGraphIndex] = None
+        self._init_lock = threading.RLock()
+
+    @property
+    def graph_store(self) -> Neo4jPropertyGraphStore:
+        """Neo4j property graph store, connected on first use."""
+        graph_store = self._graph_store
+        if graph_store is None:
+            with self._init_lock:
+                graph_store = self._graph_store
+                if graph_store is None:
+                    graph_store = self._graph_store = Neo4jPropertyGraphStore(
+                        url=self.neo4j_config.uri,
+                        username=self.neo4j_config.user,
+                        password=self.neo4j_config.password,
+                        database=self.neo4j_config.database,
+                    )
+        return graph_store
+
+    @property
+    def index(self) -> PropertyGraphIndex:
+        """Index over the existing graph, built (with the LLM) on first use.
+
+        Raw Cypher helpers only need ``graph_store``, so callers that never run
+        natural language queries skip the LLM and LlamaIndex setup entirely.
+        """
+        index = self._index
+        if index is None:
+            with self._init_lock:
+                index = self._index
+                if index is None:
+                    self._setup_llm()
+                    index = self._index = PropertyGraphIndex.from_existing(
+                        property_graph_store=self.graph_store,
+                    )
+                    logger.info("GraphRAG index initialized")
+        return index
 
     def _setup_llm(self) -> None:
         """Configure LlamaIndex to use our LLM provider."""
@@ -79,10 +160,7 @@ class GraphRAGIndex:
             Dict with 'answer', 'sources', and optionally 'cypher'
         """
         try:
-            query_engine = self.index.as_query_engine(
-                include_text=True,
-                response_mode="tree_summarize",
-            )
+            query_engine = self._get_query_engine(include_text=True, response_mode="tree_summarize")
 
             response = query_engine.query(question)
 
@@ -91,7 +169,7 @@ class GraphRAGIndex:
                 "sources": [
                     {
                         "node_id": node.node_id,
-                        "text": node.get_content()[:200],
+                        "text": _source_snippet(node),
                     }
                     for node in response.source_nodes
                 ],
@@ -110,6 +188,26 @@ class GraphRAGIndex:
                 "error": str(e),
             }
 
+    def _get_query_engine(self, include_text: bool, response_mode: str) -> BaseQueryEngine:
+        """Get a cached query engine for the given configuration.
+
+        Args:
+            include_text: Whether retrieved nodes include their source text
+            response_mode: LlamaIndex response synthesis mode
+
+        Returns:
+            Query engine built from the index
+        """
+        key = (include_text, response_mode)
+        engine = self._engine_cache.get(key)
+        if engine is None:
+            engine = self.index.as_query_engine(
+                include_text=include_text,
+                response_mode=response_mode,
+            )
+            self._engine_cache[key] = engine
+        return engine
+
     def cypher_query(self, cypher: str) -> list[dict[str, Any]]:
         """Execute raw Cypher query.
 
@@ -122,6 +220,29 @@ class GraphRAGIndex:
         res = self.graph_store.structured_query(cypher)
         return cast(list[dict[str, Any]], res)
 
+    def cypher_query_iter(
+        self, cypher: str, limit: Optional[int] = None, **params: Any
+    ) -> Iterator[dict[str, Any]]:
+        """Execute a Cypher query and stream result records.
+
+        Unlike ``cypher_query``, records are pulled from the driver as the
+        caller iterates, so only the rows actually consumed are transferred.
+
+        Args:
+            cypher: Cypher query string
+            limit: Stop after this many records
+            **params: Query parameters
+
+        Yields:
+            Result records as dicts
+        """
+        with self.graph_store.client.session(database=self.neo4j_config.database) as session:
+            result = session.run(cypher, params)
+            for count, record in enumerate(result, start=1):
+                yield record.data()
+                if limit is not None and count >= limit:
+                    break
+
     def get_node_by_id(self, node_id: str) -> Optional[dict[str, Any]]:
         """Retrieve a specific node by ID.
 
@@ -131,8 +252,9 @@ class GraphRAGIndex:
         Returns:
             Node properties or None
         """
-        cypher = "MATCH (n) WHERE elementId(n) = $node_id RETURN n"
-        results = self.graph_store.structured_query(cypher, param_map={"node_id": node_id})
+        results = self.graph_store.structured_query(
+            _NODE_BY_ID_QUERY, param_map={"node_id": node_id}
+        )
         return results[0] if results else None
 
     def get_neighbors(
@@ -151,23 +273,36 @@ class GraphRAGIndex:
         Returns:
             List of neighboring nodes with relationship info
         """
-        rel_filter = ""
-        if relationship_types:
-            rel_filter = ":" + "|".join(relationship_types)
-
-        if direction == "in":
-            pattern = f"<-[r{rel_filter}]-"
-        elif direction == "out":
-            pattern = f"-[r{rel_filter}]->"
-        else:
-            pattern = f"-[r{rel_filter}]-"
-
-        cypher = f"""
-        MATCH (start){pattern}(neighbor)
-        WHERE elementId(start) = $node_id
-        RETURN neighbor, type(r) as relationship
-        LIMIT 50
+        return self.get_neighbors_batch([node_id], relationship_types, direction)[node_id]
+
+    def get_neighbors_batch(
+        self,
+        node_ids: list[str],
+        relationship_types: Optional[list[str]] = None,
+        direction: str = "both",
+        limit_per_node: int = 50,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Get neighboring nodes for several start nodes in one round-trip.
+
+        Args:
+            node_ids: Starting node IDs
+            relationship_types: Filter by relationship types
+            direction: 'in', 'out', or 'both'
+            limit_per_node: Maximum neighbors returned per start node
+
+        Returns:
+            Mapping of node ID to its neighboring nodes with relationship info
         """
+        rel_key = tuple(sorted(relationship_types)) if relationship_types else None
+        cypher = _build_neighbor_cypher(rel_key, direction)
 
-        res = self.graph_store.structured_query(cypher, param_map={"node_id": node_id})
-        return cast(list[dict[str, Any]], res)
+        res = self.graph_store.structured_query(
+            cypher, param_map={"node_ids": node_ids, "limit": limit_per_node}
+        )
+
+        neighbors: dict[str, list[dict[str, Any]]] = {node_id: [] for node_id in node_ids}
+        for record in res:
+            neighbors[record["node_id"]].append(
+                {"neighbor": record["neighbor"], "relationship": record["relationship"]}
+            )
+        return neighbors
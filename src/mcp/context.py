@@ -1,14 +1,19 @@
 """MCP session context management."""
 
-from contextvars import ContextVar
-from typing import Optional
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterator, Optional
 
 _session_repo: ContextVar[Optional[str]] = ContextVar("mcp_repo", default=None)
 
 
-def set_repository(repo_id: str) -> None:
-    """Set the active repository for this session."""
-    _session_repo.set(repo_id)
+def set_repository(repo_id: str) -> Token[Optional[str]]:
+    """Set the active repository for this session.
+
+    Returns:
+        Token that can be passed to ``clear_repository`` to restore the previous value
+    """
+    return _session_repo.set(repo_id)
 
 
 def get_repository() -> Optional[str]:
@@ -16,6 +21,23 @@ def get_repository() -> Optional[str]:
     return _session_repo.get()
 
 
-def clear_repository() -> None:
-    """Clear the repository context."""
-    _session_repo.set(None)
+def clear_repository(token: Optional[Token[Optional[str]]] = None) -> None:
+    """Clear the repository context.
+
+    Args:
+        token: Token from ``set_repository``; restores the value it replaced
+    """
+    if token is not None:
+        _session_repo.reset(token)
+    else:
+        _session_repo.set(None)
+
+
+@contextmanager
+def repository_scope(repo_id: Optional[str]) -> Iterator[None]:
+    """Temporarily set the active repository, restoring the previous one on exit."""
+    token = _session_repo.set(repo_id)
+    try:
+        yield
+    finally:
+        _session_repo.reset(token)
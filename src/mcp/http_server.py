@@ -15,6 +15,13 @@ from src.mcp.utils import rate_limiter
 
 sse = SseServerTransport("/messages")
 
+# Rate-limit response headers, encoded once (remaining never exceeds the burst size)
+_RL_LIMIT_HEADER = (b"x-ratelimit-limit", str(rate_limiter.requests_per_minute).encode())
+_RL_REMAINING_HEADERS = tuple(
+    (b"x-ratelimit-remaining", str(i).encode()) for i in range(rate_limiter.burst_size + 1)
+)
+_RL_BODY_TPL = b'{"error":"Rate limit exceeded","retry_after":%.3f}'
+
 
 class MCPServerApp:
     """ASGI application that handles MCP SSE endpoints directly.
@@ -51,36 +58,43 @@ class MCPServerApp:
 
         # Rate limit check for non-SSE endpoints
         client_id = self._get_client_id(scope)
-        if not rate_limiter.allow(client_id):
-            retry_after = rate_limiter.get_retry_after(client_id)
+        decision = rate_limiter.check(client_id)
+        if not decision.allowed:
             logger.warning(f"Rate limit exceeded for {client_id}")
-            response = JSONResponse(
-                status_code=429,
-                content={
-                    "error": "Rate limit exceeded",
-                    "retry_after": retry_after,
-                },
-                headers={
-                    "Retry-After": str(int(retry_after) + 1),
-                    "X-RateLimit-Remaining": "0",
-                },
-            )
-            await response(scope, receive, send)
+            await self._send_rate_limited(send, decision.retry_after)
             return
 
         # Add rate limit headers to response
-        remaining = rate_limiter.get_remaining(client_id)
+        remaining_header = _RL_REMAINING_HEADERS[decision.remaining]
 
         async def send_with_headers(message: dict[str, Any]) -> None:
             if message["type"] == "http.response.start":
-                headers = list(message.get("headers", []))
-                headers.append((b"x-ratelimit-remaining", str(remaining).encode()))
-                headers.append((b"x-ratelimit-limit", b"100"))
-                message = {**message, "headers": headers}
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    remaining_header,
+                    _RL_LIMIT_HEADER,
+                ]
             await send(message)
 
         await self._starlette(scope, receive, send_with_headers)
 
+    async def _send_rate_limited(self, send: Send, retry_after: float) -> None:
+        """Send a raw ASGI 429 response (no Response object or JSON encoder)."""
+        body = _RL_BODY_TPL % retry_after
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(int(retry_after) + 1).encode()),
+                    _RL_REMAINING_HEADERS[0],
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
     async def _handle_sse(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Handle SSE connection for MCP."""
         async with sse.connect_sse(scope, receive, send) as streams:
@@ -96,17 +110,23 @@ class MCPServerApp:
 
     def _get_client_id(self, scope: Scope) -> str:
         """Extract client identifier from request scope."""
-        headers = dict(scope.get("headers", []))
+        # Single pass over the raw ASGI header list; only two headers matter
+        api_key = forwarded = b""
+        for name, value in scope.get("headers", ()):
+            if name == b"x-api-key":
+                api_key = value
+            elif name == b"x-forwarded-for":
+                forwarded = value
+            if api_key and forwarded:
+                break
 
         # Check for API key header first
-        api_key = headers.get(b"x-api-key", b"").decode()
         if api_key:
-            return f"api:{api_key[:8]}"
+            return f"api:{api_key.decode()[:8]}"
 
         # Fall back to IP address
-        forwarded = headers.get(b"x-forwarded-for", b"").decode()
         if forwarded:
-            return f"ip:{forwarded.split(',')[0].strip()}"
+            return f"ip:{forwarded.decode().split(',')[0].strip()}"
 
         client = scope.get("client")
         client_host = client[0] if client else "unknown"
@@ -124,6 +144,10 @@ def main() -> None:
         host=config.mcp.server_host,
         port=config.mcp.server_port,
         log_level="info" if not config.mcp.debug else "debug",
+        # loop/http default to "auto": uvloop and httptools when installed
+        access_log=config.mcp.debug,
+        server_header=False,
+        date_header=False,
     )
 
 
@@ -4,13 +4,31 @@ from loguru import logger
 from mcp.types import TextContent
 
 from src.mcp.context import get_repository
-from src.mcp.utils import get_neo4j_connection, validate_file_path_param
+from src.mcp.utils import (
+    TOOL_RESULTS_DEFAULT,
+    get_neo4j_connection,
+    validate_file_path_param,
+    validate_limit_param,
+)
 from src.mcp.utils.tracing import trace_tool
 
 
+_FIND_DEPENDENCIES_QUERY = """
+MATCH (f:File {path: $path})
+WHERE $repo IS NULL OR f.repository = $repo
+OPTIONAL MATCH (f)-[:INCLUDES|IMPORTS|LOADS_VARS]->(dep)
+WHERE $repo IS NULL OR dep.repository = $repo OR dep:Role
+RETURN
+    dep.path as dependency,
+    dep.repository as repository,
+    coalesce(dep.node_type, labels(dep)[0]) as type
+LIMIT $limit
+"""
+
+
 @trace_tool("find_dependencies")
 async def find_dependencies(
-    file_path: str, repository_id: Optional[str] = None
+    file_path: str, repository_id: Optional[str] = None, limit: int = TOOL_RESULTS_DEFAULT
 ) -> list[TextContent]:
     """
     Find dependencies for a given file (includes, imports, variable loads).
@@ -22,24 +40,10 @@ async def find_dependencies(
         # Sanitize file path (prevent directory traversal)
         safe_path = validate_file_path_param(file_path)
 
-        if repo:
-            query = """
-            MATCH (f:File {path: $path, repository: $repo})
-            OPTIONAL MATCH (f)-[:INCLUDES|IMPORTS|LOADS_VARS]->(dep)
-            WHERE dep.repository = $repo OR dep:Role
-            RETURN dep.path as dependency, dep.repository as repository, labels(dep)[0] as type
-            """
-            params = {"path": safe_path, "repo": repo}
-        else:
-            # Backward compatible
-            query = """
-            MATCH (f:File {path: $path})
-            OPTIONAL MATCH (f)-[:INCLUDES|IMPORTS|LOADS_VARS]->(dep)
-            RETURN dep.path as dependency, dep.repository as repository, labels(dep)[0] as type
-            """
-            params = {"path": safe_path}
+        # A null $repo keeps the query unscoped (backward compatible)
+        params = {"path": safe_path, "repo": repo or None, "limit": validate_limit_param(limit)}
 
-        results = await conn.execute_query(query, params)
+        results = await conn.execute_query(_FIND_DEPENDENCIES_QUERY, params)
 
         if not results:
             return [TextContent(type="text", text=f"No dependencies found for {safe_path}")]
@@ -65,5 +69,5 @@ async def find_dependencies(
     except ValueError as e:
         return [TextContent(type="text", text=str(e))]
     except Exception as e:
-        logger.error(f"Error finding dependencies: {e}")
+        logger.error("Error finding dependencies: {}", e)
         return [TextContent(type="text", text=f"Error: {str(e)}")]
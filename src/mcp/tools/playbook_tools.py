@@ -4,10 +4,57 @@ from loguru import logger
 from mcp.types import TextContent
 
 from src.mcp.context import get_repository
-from src.mcp.utils import get_neo4j_connection, validate_file_path_param
+from src.mcp.utils import (
+    TOOL_RESULTS_DEFAULT,
+    get_neo4j_connection,
+    validate_file_path_param,
+    validate_limit_param,
+)
 from src.mcp.utils.tracing import trace_tool
 
 
+_ANALYZE_PLAYBOOK_QUERY = """
+MATCH (p:Playbook {path: $path})
+WHERE $repo IS NULL OR p.repository = $repo
+OPTIONAL MATCH (p)-[:HAS_PLAY]->(play)
+OPTIONAL MATCH (play)-[:HAS_TASK]->(task)
+RETURN
+    p.name as name,
+    count(DISTINCT play) as play_count,
+    count(DISTINCT task) as task_count,
+    collect(DISTINCT play.name) as plays
+"""
+
+
+_FIND_TASKS_BY_MODULE_QUERY = """
+MATCH (t:Task {module: $module})
+WHERE $repo IS NULL OR t.repository = $repo
+RETURN t.name as task, t.file_path as path, t.line_number as line
+LIMIT 50
+"""
+
+
+_TASK_HIERARCHY_QUERY = """
+MATCH (p:Playbook {path: $path})-[:HAS_PLAY]->(play)
+WHERE $repo IS NULL OR p.repository = $repo
+OPTIONAL MATCH (play)-[:HAS_TASK]->(task)
+RETURN play.name as play, play.order as play_order,
+       task.name as task, task.order as task_order
+ORDER BY play_order, task_order
+"""
+
+
+_TEMPLATE_USAGE_QUERY = """
+MATCH (t:Template {path: $path})
+WHERE $repo IS NULL OR t.repository = $repo
+OPTIONAL MATCH (task:Task)-[:USES_TEMPLATE]->(t)
+OPTIONAL MATCH (t)-[:USES_VAR]->(v:Variable)
+RETURN
+    collect(DISTINCT task.name)[..$limit] as used_by_tasks,
+    collect(DISTINCT v.name)[..$limit] as variables_required
+"""
+
+
 @trace_tool("analyze_playbook")
 async def analyze_playbook(
     playbook_path: str, repository_id: Optional[str] = None
@@ -21,50 +68,29 @@ async def analyze_playbook(
     try:
         safe_path = validate_file_path_param(playbook_path)
 
-        if repo:
-            query = """
-            MATCH (p:Playbook {path: $path, repository: $repo})
-            OPTIONAL MATCH (p)-[:HAS_PLAY]->(play)
-            OPTIONAL MATCH (play)-[:HAS_TASK]->(task)
-            RETURN
-                p.name as name,
-                count(DISTINCT play) as play_count,
-                count(DISTINCT task) as task_count,
-                collect(DISTINCT play.name) as plays
-            """
-            params = {"path": safe_path, "repo": repo}
-        else:
-            query = """
-            MATCH (p:Playbook {path: $path})
-            OPTIONAL MATCH (p)-[:HAS_PLAY]->(play)
-            OPTIONAL MATCH (play)-[:HAS_TASK]->(task)
-            RETURN
-                p.name as name,
-                count(DISTINCT play) as play_count,
-                count(DISTINCT task) as task_count,
-                collect(DISTINCT play.name) as plays
-            """
-            params = {"path": safe_path}
-
-        results = await conn.execute_query(query, params)
+        params = {"path": safe_path, "repo": repo or None}
+
+        results = await conn.execute_query(_ANALYZE_PLAYBOOK_QUERY, params)
 
         if not results:
             return [TextContent(type="text", text=f"Playbook not found: {safe_path}")]
 
         data = results[0]
-        output = f"Analysis of {safe_path}:\n"
-        output += f"- Plays: {data['play_count']}\n"
-        output += f"- Total Tasks: {data['task_count']}\n"
-        output += "- Play Names:\n"
-        for play in data["plays"]:
-            output += f"  - {play}\n"
+        output = [
+            f"Analysis of {safe_path}:",
+            f"- Plays: {data['play_count']}",
+            f"- Total Tasks: {data['task_count']}",
+            "- Play Names:",
+        ]
+        output.extend(f"  - {play}" for play in data["plays"])
+        output.append("")  # keep the trailing newline
 
-        return [TextContent(type="text", text=output)]
+        return [TextContent(type="text", text="\n".join(output))]
 
     except ValueError as e:
         return [TextContent(type="text", text=str(e))]
     except Exception as e:
-        logger.error(f"Error analyzing playbook: {e}")
+        logger.error("Error analyzing playbook: {}", e)
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 
@@ -79,22 +105,9 @@ async def find_tasks_by_module(
     repo = repository_id or get_repository()
 
     try:
-        if repo:
-            query = """
-            MATCH (t:Task {module: $module, repository: $repo})
-            RETURN t.name as task, t.file_path as path, t.line_number as line
-            LIMIT 50
-            """
-            params = {"module": module_name, "repo": repo}
-        else:
-            query = """
-            MATCH (t:Task {module: $module})
-            RETURN t.name as task, t.file_path as path, t.line_number as line
-            LIMIT 50
-            """
-            params = {"module": module_name}
+        params = {"module": module_name, "repo": repo or None}
 
-        results = await conn.execute_query(query, params)
+        results = await conn.execute_query(_FIND_TASKS_BY_MODULE_QUERY, params)
 
         if not results:
             return [TextContent(type="text", text=f"No tasks found using module '{module_name}'")]
@@ -106,7 +119,7 @@ async def find_tasks_by_module(
         return [TextContent(type="text", text="\n".join(output))]
 
     except Exception as e:
-        logger.error(f"Error finding tasks: {e}")
+        logger.error("Error finding tasks: {}", e)
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 
@@ -123,26 +136,9 @@ async def get_task_hierarchy(
     try:
         safe_path = validate_file_path_param(playbook_path)
 
-        if repo:
-            query = """
-            MATCH (p:Playbook {path: $path, repository: $repo})-[:HAS_PLAY]->(play)
-            OPTIONAL MATCH (play)-[:HAS_TASK]->(task)
-            RETURN play.name as play, play.order as play_order,
-                   task.name as task, task.order as task_order
-            ORDER BY play_order, task_order
-            """
-            params = {"path": safe_path, "repo": repo}
-        else:
-            query = """
-            MATCH (p:Playbook {path: $path})-[:HAS_PLAY]->(play)
-            OPTIONAL MATCH (play)-[:HAS_TASK]->(task)
-            RETURN play.name as play, play.order as play_order,
-                   task.name as task, task.order as task_order
-            ORDER BY play_order, task_order
-            """
-            params = {"path": safe_path}
+        params = {"path": safe_path, "repo": repo or None}
 
-        results = await conn.execute_query(query, params)
+        results = await conn.execute_query(_TASK_HIERARCHY_QUERY, params)
 
         if not results:
             return [TextContent(type="text", text=f"No hierarchy found for {safe_path}")]
@@ -162,13 +158,13 @@ async def get_task_hierarchy(
     except ValueError as e:
         return [TextContent(type="text", text=str(e))]
     except Exception as e:
-        logger.error(f"Error getting hierarchy: {e}")
+        logger.error("Error getting hierarchy: {}", e)
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 
 @trace_tool("find_template_usage")
 async def find_template_usage(
-    template_path: str, repository_id: Optional[str] = None
+    template_path: str, repository_id: Optional[str] = None, limit: int = TOOL_RESULTS_DEFAULT
 ) -> list[TextContent]:
     """
     Find where a Jinja2 template is used and what variables it requires.
@@ -179,28 +175,9 @@ async def find_template_usage(
     try:
         safe_path = validate_file_path_param(template_path)
 
-        if repo:
-            query = """
-            MATCH (t:Template {path: $path, repository: $repo})
-            OPTIONAL MATCH (task:Task)-[:USES_TEMPLATE]->(t)
-            OPTIONAL MATCH (t)-[:USES_VAR]->(v:Variable)
-            RETURN
-                collect(DISTINCT task.name) as used_by_tasks,
-                collect(DISTINCT v.name) as variables_required
-            """
-            params = {"path": safe_path, "repo": repo}
-        else:
-            query = """
-            MATCH (t:Template {path: $path})
-            OPTIONAL MATCH (task:Task)-[:USES_TEMPLATE]->(t)
-            OPTIONAL MATCH (t)-[:USES_VAR]->(v:Variable)
-            RETURN
-                collect(DISTINCT task.name) as used_by_tasks,
-                collect(DISTINCT v.name) as variables_required
-            """
-            params = {"path": safe_path}
-
-        results = await conn.execute_query(query, params)
+        params = {"path": safe_path, "repo": repo or None, "limit": validate_limit_param(limit)}
+
+        results = await conn.execute_query(_TEMPLATE_USAGE_QUERY, params)
 
         if not results:
             return [TextContent(type="text", text=f"Template not found: {safe_path}")]
@@ -227,5 +204,5 @@ async def find_template_usage(
     except ValueError as e:
         return [TextContent(type="text", text=str(e))]
     except Exception as e:
-        logger.error(f"Error finding template usage: {e}")
+        logger.error("Error finding template usage: {}", e)
         return [TextContent(type="text", text=f"Error: {str(e)}")]
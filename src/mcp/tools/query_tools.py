@@ -1,43 +1,45 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+import functools
+import io
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, AsyncIterable, Dict, Optional
 
 from loguru import logger
 from mcp.types import TextContent
 
 
-def _format_results(results: List[Dict[str, Any]]) -> str:
-    """Format query results as readable text."""
-    if not results:
-        return "No results found."
-
-    # Get column names from first row
-    columns = list(results[0].keys())
-
-    # Build formatted output
-    lines = [f"Found {len(results)} result(s):\n"]
-
-    for i, row in enumerate(results, 1):
-        lines.append(
-            f"**{i}.** ",
-        )
-        parts = []
-        for col in columns:
+async def _format_results(rows: AsyncIterable[Dict[str, Any]]) -> str:
+    """Format streamed query results as readable text."""
+    # Write rows straight into one buffer as they arrive from Neo4j
+    buf = io.StringIO()
+    named_columns: list[tuple[str, str]] = []
+    count = 0
+
+    async for row in rows:
+        if not count:
+            # Get column names from first row; strip prefixes like 'c.' or 'f.' once
+            named_columns = [(col.rsplit(".", 1)[-1], col) for col in row]
+        count += 1
+        buf.write(f"\n**{count}.** \n")
+        sep = ""
+        for clean_col, col in named_columns:
             value = row.get(col)
-            # Clean up column name (remove prefix like 'c.' or 'f.')
-            clean_col = col.split(".")[-1] if "." in col else col
             if value:
                 # Truncate long values
                 str_val = str(value)
                 if len(str_val) > 100:
                     str_val = str_val[:100] + "..."
-                parts.append(f"{clean_col}: {str_val}")
-        lines.append(" | ".join(parts))
-        lines.append("")
+                buf.write(f"{sep}{clean_col}: {str_val}")
+                sep = " | "
+        buf.write("\n")
 
-    return "\n".join(lines)
+    if not count:
+        return "No results found."
+    return f"Found {count} result(s):\n" + buf.getvalue()
 
 
-from src.config import LLMConfig, Neo4jConfig
-from src.indexing import GraphRAGIndex
 from src.mcp.context import get_repository
 from src.mcp.utils import (
     TIMEOUT_ERROR_MSG,
@@ -47,22 +49,86 @@ from src.mcp.utils import (
     GraphSchema,
     QueryTimeoutError,
     get_neo4j_connection,
+    graph_generation,
 )
 from src.mcp.utils.tracing import trace_tool
 
+if TYPE_CHECKING:
+    # Only query_with_rag needs these; importing them lazily keeps MCP startup light
+    from src.config import LLMConfig, Neo4jConfig
+    from src.indexing import GraphRAGIndex
+
+# Exact re-asks of query_with_rag (e.g. agent retries) skip the RAG pipeline.
+# query_codebase always executes; only its generated Cypher is cached.
+_EXACT_CACHE_MAXSIZE = 512
+_EXACT_CACHE_TTL = 600.0
+_exact_cache: "OrderedDict[tuple[Any, ...], tuple[float, list[TextContent]]]" = OrderedDict()
+
+
+# One GraphRAGIndex per target database and model, shared across query_with_rag calls
+_INDEX_CACHE: dict[tuple[str, ...], "GraphRAGIndex"] = {}
+_INDEX_LOCK = asyncio.Lock()
+
+# Bounded pool for blocking RAG queries so concurrent calls cannot exhaust Neo4j connections
+_RAG_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag-query")
+
+
+async def _get_index(neo4j_config: "Neo4jConfig", llm_config: "LLMConfig") -> "GraphRAGIndex":
+    key = (
+        neo4j_config.uri,
+        neo4j_config.database,
+        llm_config.api_base,
+        llm_config.model_name,
+    )
+    index = _INDEX_CACHE.get(key)
+    if index is None:
+        async with _INDEX_LOCK:
+            index = _INDEX_CACHE.get(key)
+            if index is None:
+                from src.indexing import GraphRAGIndex
+
+                index = GraphRAGIndex(neo4j_config, llm_config)
+                _INDEX_CACHE[key] = index
+    return index
+
+
+def _question_key(question: str) -> str:
+    # Only whitespace is normalised; Cypher matching on identifiers is case-sensitive
+    return " ".join(question.split())
+
+
+def _exact_cache_get(key: tuple[Any, ...]) -> Optional[list[TextContent]]:
+    entry = _exact_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, response = entry
+    if time.monotonic() - stored_at >= _EXACT_CACHE_TTL:
+        del _exact_cache[key]
+        return None
+    _exact_cache.move_to_end(key)
+    return list(response)
+
+
+def _exact_cache_put(key: tuple[Any, ...], response: list[TextContent]) -> None:
+    _exact_cache[key] = (time.monotonic(), list(response))
+    _exact_cache.move_to_end(key)
+    if len(_exact_cache) > _EXACT_CACHE_MAXSIZE:
+        _exact_cache.popitem(last=False)
+
 
 @trace_tool("query_codebase")
 async def query_codebase(question: str, repository_id: Optional[str] = None) -> list[TextContent]:
     """
     Translate natural language question to Cypher and execute it.
     """
+    repo = repository_id or get_repository()
+
     client = GraphRAGClient()
     conn = get_neo4j_connection()
-    repo = repository_id or get_repository()
 
     try:
-        # Load schema from Neo4j FIRST - used for both generation and validation
-        schema = await GraphSchema.from_neo4j(conn.driver)
+        # Load schema FIRST (cached with TTL) - used for both generation and validation
+        schema = await GraphSchema.from_neo4j_cached(conn.driver)
 
         # Pass schema to generate_cypher so LLM only sees actual relationships
         cypher = await client.generate_cypher(
@@ -71,7 +137,7 @@ async def query_codebase(question: str, repository_id: Optional[str] = None) ->
             schema=schema,
         )
 
-        logger.info(f"Generated Cypher: {cypher}")
+        logger.info("Generated Cypher: {}", cypher)
 
         # Validate using the SAME schema
         validator = CypherValidator(schema)
@@ -88,10 +154,11 @@ async def query_codebase(question: str, repository_id: Optional[str] = None) ->
             ]
 
         for warning in validation.warnings:
-            logger.warning(f"Cypher warning: {warning}")
+            logger.warning("Cypher warning: {}", warning)
 
-        results = await conn.execute_query(cypher)
-        formatted = _format_results(results)
+        client.remember_cypher(question, cypher, repository_id=repo, schema=schema)
+
+        formatted = await _format_results(conn.stream_query(cypher))
         return [TextContent(type="text", text=formatted)]
 
     except QueryTimeoutError:
@@ -99,7 +166,7 @@ async def query_codebase(question: str, repository_id: Optional[str] = None) ->
     except CircuitOpenError as e:
         return [TextContent(type="text", text=e.format_message())]
     except Exception as e:
-        logger.error(f"Error querying codebase: {e}")
+        logger.error("Error querying codebase: {}", e)
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 
@@ -120,7 +187,17 @@ async def query_with_rag(
     Returns:
         List of TextContent with answer and sources
     """
+    repo = get_repository()
+
+    # Answers reflect graph contents, so a re-ingestion (schema invalidation) misses
+    exact_key = (graph_generation(), repo, include_cypher, _question_key(question))
+    hit = _exact_cache_get(exact_key)
+    if hit is not None:
+        return hit
+
     try:
+        from src.config import LLMConfig, Neo4jConfig
+
         # Load configs
         neo4j_config = Neo4jConfig()
         llm_config = LLMConfig()
@@ -129,12 +206,15 @@ async def query_with_rag(
         # We might need to inject it into the question or update GraphRAGIndex.
         # Spec Phase 5 updates GraphRAG client, but GraphRAGIndex is for LlamaIndex.
         # For now, let's inject context into question if available.
-        repo = get_repository()
         if repo:
             question = f"[Repository: {repo}] {question}"
 
-        index = GraphRAGIndex(neo4j_config, llm_config)
-        result = index.query(question, include_cypher=include_cypher)
+        index = await _get_index(neo4j_config, llm_config)
+        # LlamaIndex queries are synchronous; keep them off the event loop
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            _RAG_EXECUTOR, functools.partial(index.query, question, include_cypher=include_cypher)
+        )
 
         # Format output
         output = f"Answer: {result.get('answer', 'No answer found.')}\n\n"
@@ -150,8 +230,12 @@ async def query_with_rag(
         if include_cypher and result.get("cypher"):
             output += f"\nGenerated Cypher:\n{result['cypher']}\n"
 
-        return [TextContent(type="text", text=output)]
+        response = [TextContent(type="text", text=output)]
+        # GraphRAGIndex.query reports failures in the result; never replay those
+        if not result.get("error"):
+            _exact_cache_put(exact_key, response)
+        return response
 
     except Exception as e:
-        logger.error(f"Error in query_with_rag: {e}")
+        logger.error("Error in query_with_rag: {}", e)
         return [TextContent(type="text", text=f"Error: {str(e)}")]
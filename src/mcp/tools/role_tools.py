@@ -4,12 +4,31 @@ from loguru import logger
 from mcp.types import TextContent
 
 from src.mcp.context import get_repository
-from src.mcp.utils import get_neo4j_connection
+from src.mcp.utils import TOOL_RESULTS_DEFAULT, get_neo4j_connection, validate_limit_param
 from src.mcp.utils.tracing import trace_tool
 
 
+# repository_id is an optional filter, but we always show which repo uses the role:
+# match the role (global) and then find usages, optionally filtering usages by repo
+_ROLE_USAGE_QUERY = """
+MATCH (r:Role {name: $name})
+OPTIONAL MATCH (usage)-[:USES_ROLE]->(r)
+WHERE $repo IS NULL OR usage.repository = $repo
+RETURN
+    r.name as role,
+    collect(DISTINCT {
+        repository: usage.repository,
+        type: coalesce(usage.node_type, labels(usage)[0]),
+        name: usage.name,
+        path: usage.path
+    })[..$limit] as usages
+"""
+
+
 @trace_tool("get_role_usage")
-async def get_role_usage(role_name: str, repository_id: Optional[str] = None) -> list[TextContent]:
+async def get_role_usage(
+    role_name: str, repository_id: Optional[str] = None, limit: int = TOOL_RESULTS_DEFAULT
+) -> list[TextContent]:
     """
     Find where a specific Ansible role is used.
     """
@@ -17,26 +36,8 @@ async def get_role_usage(role_name: str, repository_id: Optional[str] = None) ->
     repo = repository_id or get_repository()
 
     try:
-        # Note: repository_id is optional filter, but we always show which repo uses the role
-        # We query for the role (global) and then find usages, optionally filtering usages by repo
-
-        where_clause = "WHERE $repo IS NULL OR usage.repository = $repo"
-
-        query = f"""
-        MATCH (r:Role {{name: $name}})
-        OPTIONAL MATCH (usage)-[:USES_ROLE]->(r)
-        {where_clause}
-        RETURN
-            r.name as role,
-            collect(DISTINCT {{
-                repository: usage.repository,
-                type: labels(usage)[0],
-                name: usage.name,
-                path: usage.path
-            }}) as usages
-        """
-
-        results = await conn.execute_query(query, {"name": role_name, "repo": repo})
+        params = {"name": role_name, "repo": repo or None, "limit": validate_limit_param(limit)}
+        results = await conn.execute_query(_ROLE_USAGE_QUERY, params)
 
         if not results or not results[0]["usages"]:
             return [TextContent(type="text", text=f"Role '{role_name}' is not used or not found.")]
@@ -60,5 +61,5 @@ async def get_role_usage(role_name: str, repository_id: Optional[str] = None) ->
         return [TextContent(type="text", text="\n".join(output))]
 
     except Exception as e:
-        logger.error(f"Error getting role usage: {e}")
+        logger.error("Error getting role usage: {}", e)
         return [TextContent(type="text", text=f"Error: {str(e)}")]
@@ -4,13 +4,27 @@ from loguru import logger
 from mcp.types import TextContent
 
 from src.mcp.context import get_repository
-from src.mcp.utils import get_neo4j_connection
+from src.mcp.utils import TOOL_RESULTS_DEFAULT, get_neo4j_connection, validate_limit_param
 from src.mcp.utils.tracing import trace_tool
 
 
+_TRACE_VARIABLE_QUERY = """
+MATCH (v:Variable {name: $name})
+WHERE $repo IS NULL OR v.repository = $repo
+OPTIONAL MATCH (d)-[:DEFINES_VAR]->(v)
+WITH v, collect(CASE WHEN d IS NOT NULL THEN {
+    path: d.path, source_name: d.name, type: coalesce(d.node_type, labels(d)[0])
+} END)[..$limit] AS definitions
+OPTIONAL MATCH (u)-[:USES_VAR]->(v)
+RETURN definitions, collect(CASE WHEN u IS NOT NULL THEN {
+    path: u.path, source_name: u.name, type: coalesce(u.node_type, labels(u)[0])
+} END)[..$limit] AS usages
+"""
+
+
 @trace_tool("trace_variable")
 async def trace_variable(
-    variable_name: str, repository_id: Optional[str] = None
+    variable_name: str, repository_id: Optional[str] = None, limit: int = TOOL_RESULTS_DEFAULT
 ) -> list[TextContent]:
     """
     Trace definition and usage of a specific variable.
@@ -19,45 +33,20 @@ async def trace_variable(
     repo = repository_id or get_repository()
 
     try:
-        # Find Definitions
-        if repo:
-            def_query = """
-            MATCH (v:Variable {name: $name, repository: $repo})
-            OPTIONAL MATCH (source)-[:DEFINES_VAR]->(v)
-            RETURN source.path as path, source.name as source_name, labels(source)[0] as type
-            """
-            params = {"name": variable_name, "repo": repo}
-        else:
-            def_query = """
-            MATCH (v:Variable {name: $name})
-            OPTIONAL MATCH (source)-[:DEFINES_VAR]->(v)
-            RETURN source.path as path, source.name as source_name, labels(source)[0] as type
-            """
-            params = {"name": variable_name}
+        # Definitions and usages in a single round-trip
+        params = {"name": variable_name, "repo": repo or None, "limit": validate_limit_param(limit)}
 
-        definitions = await conn.execute_query(def_query, params)
+        results = await conn.execute_query(_TRACE_VARIABLE_QUERY, params)
 
-        # Find Usages
-        if repo:
-            usage_query = """
-            MATCH (v:Variable {name: $name, repository: $repo})
-            OPTIONAL MATCH (source)-[:USES_VAR]->(v)
-            RETURN source.path as path, source.name as source_name, labels(source)[0] as type
-            """
-        else:
-            usage_query = """
-            MATCH (v:Variable {name: $name})
-            OPTIONAL MATCH (source)-[:USES_VAR]->(v)
-            RETURN source.path as path, source.name as source_name, labels(source)[0] as type
-            """
-
-        usages = await conn.execute_query(usage_query, params)
-
-        if not definitions and not usages:
+        if not results:
             return [
                 TextContent(type="text", text=f"Variable '{variable_name}' not found in the graph.")
             ]
 
+        # One row per matching Variable node (several when unscoped by repository)
+        definitions = [d for r in results for d in r["definitions"]]
+        usages = [u for r in results for u in r["usages"]]
+
         output = [f"Trace for variable '{variable_name}':\n"]
 
         if definitions:
@@ -79,5 +68,5 @@ async def trace_variable(
         return [TextContent(type="text", text="\n".join(output))]
 
     except Exception as e:
-        logger.error(f"Error tracing variable: {e}")
+        logger.error("Error tracing variable: {}", e)
         return [TextContent(type="text", text=f"Error: {str(e)}")]
@@ -11,6 +11,8 @@ from .cypher_validator import (
     CypherValidator,
     GraphSchema,
     ValidationResult,
+    graph_generation,
+    invalidate_schema_cache,
 )
 from .graphrag_client import GraphRAGClient
 from .neo4j_connection import (
@@ -19,6 +21,7 @@ from .neo4j_connection import (
     Neo4jUnavailableError,
     QueryTimeoutError,
     get_neo4j_connection,
+    parameterize,
 )
 from .path_sanitizer import (
     PathSanitizationError,
@@ -26,12 +29,14 @@ from .path_sanitizer import (
     sanitize_path,
     validate_file_path_param,
 )
-from .query_guardrails import enforce_limit, validate_limit_param
+from .query_guardrails import TOOL_RESULTS_DEFAULT, enforce_limit, validate_limit_param
 from .rate_limiter import (
+    RateLimitDecision,
     RateLimiter,
     RateLimitExceeded,
     rate_limiter,
 )
+from .response_cache import ResponseCache, response_cache
 
 __all__ = [
     "get_neo4j_connection",
@@ -39,13 +44,17 @@ __all__ = [
     "QueryTimeoutError",
     "Neo4jUnavailableError",
     "TIMEOUT_ERROR_MSG",
+    "parameterize",
     "GraphRAGClient",
     "GraphSchema",
     "CypherValidator",
     "ValidationResult",
     "CypherValidationError",
+    "invalidate_schema_cache",
+    "graph_generation",
     "enforce_limit",
     "validate_limit_param",
+    "TOOL_RESULTS_DEFAULT",
     "CircuitBreaker",
     "CircuitState",
     "CircuitOpenError",
@@ -57,6 +66,9 @@ __all__ = [
     "is_safe_path",
     "PathSanitizationError",
     "RateLimiter",
+    "RateLimitDecision",
     "RateLimitExceeded",
     "rate_limiter",
+    "ResponseCache",
+    "response_cache",
 ]
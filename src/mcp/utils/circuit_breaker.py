@@ -1,5 +1,5 @@
-from dataclasses import dataclass, field
-from datetime import datetime
+import threading
+import time
 from enum import Enum
 from functools import wraps
 from typing import Any, Callable, List, Optional, TypeVar
@@ -15,53 +15,126 @@ class CircuitState(Enum):
     HALF_OPEN = "half_open"  # Testing if recovered
 
 
-@dataclass
 class CircuitBreaker:
     """Circuit breaker for external service calls."""
 
-    name: str = "default"
-    failure_threshold: int = 3
-    recovery_timeout: float = 30.0  # seconds
+    # Consulted on every guarded call; slots keep attribute access direct
+    __slots__ = (
+        "name",
+        "failure_threshold",
+        "recovery_timeout",
+        "_failure_count",
+        "_last_failure_time",
+        "_state",
+        "_half_open_inflight",
+        "_probe_seq",
+        "_lock",
+        "_time_fn",
+    )
+
+    def __init__(
+        self,
+        name: str = "default",
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0,
+        time_fn: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout  # seconds
 
-    _failure_count: int = field(default=0, init=False, repr=False)
-    _last_failure_time: Optional[datetime] = field(default=None, init=False, repr=False)
-    _state: CircuitState = field(default=CircuitState.CLOSED, init=False, repr=False)
+        self._failure_count = 0
+        # time_fn() of the last failure; the default monotonic clock is immune to
+        # wall-clock steps, and tests pass a fake clock instead of sleeping
+        self._time_fn = time_fn
+        self._last_failure_time = 0.0
+        self._state = CircuitState.CLOSED
+        # HALF_OPEN admits a single probe; everyone else short-circuits until it
+        # reports back. Holds the in-flight probe's token, 0 when the slot is free.
+        self._half_open_inflight = 0
+        self._probe_seq = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"CircuitBreaker(name={self.name!r}, failure_threshold={self.failure_threshold!r}, "
+            f"recovery_timeout={self.recovery_timeout!r})"
+        )
 
     @property
     def state(self) -> CircuitState:
         if self._state == CircuitState.OPEN:
-            if self._last_failure_time:
-                elapsed = (datetime.now() - self._last_failure_time).total_seconds()
-                if elapsed >= self.recovery_timeout:
-                    logger.info(f"Circuit '{self.name}' transitioning to HALF_OPEN")
-                    self._state = CircuitState.HALF_OPEN
+            # OPEN is only reached through record_failure, so the timestamp is set
+            if self._time_fn() - self._last_failure_time >= self.recovery_timeout:
+                logger.info(f"Circuit '{self.name}' transitioning to HALF_OPEN")
+                self._state = CircuitState.HALF_OPEN
         return self._state
 
     def record_success(self) -> None:
         """Record a successful call."""
-        if self._state != CircuitState.CLOSED:
-            logger.info(f"Circuit '{self.name}' closing after success")
-        self._failure_count = 0
-        self._state = CircuitState.CLOSED
+        # Healthy circuit: nothing to reset, so the common path skips the lock.
+        # A failure racing with this check is ordered after the success either way.
+        if self._state is CircuitState.CLOSED and not self._failure_count:
+            return
+        with self._lock:
+            if self._state != CircuitState.CLOSED:
+                logger.info(f"Circuit '{self.name}' closing after success")
+            self._failure_count = 0
+            self._state = CircuitState.CLOSED
+            self._half_open_inflight = 0
 
     def record_failure(self) -> None:
         """Record a failed call."""
-        self._failure_count += 1
-        self._last_failure_time = datetime.now()
-
-        if self._failure_count >= self.failure_threshold:
-            if self._state != CircuitState.OPEN:
-                logger.warning(f"Circuit '{self.name}' OPEN after {self._failure_count} failures")
-            self._state = CircuitState.OPEN
-
-    def allow_request(self) -> bool:
-        """Check if request should be allowed."""
+        with self._lock:
+            self._failure_count += 1
+            self._last_failure_time = self._time_fn()
+            self._half_open_inflight = 0
+
+            if self._failure_count >= self.failure_threshold:
+                if self._state != CircuitState.OPEN:
+                    logger.warning(
+                        f"Circuit '{self.name}' OPEN after {self._failure_count} failures"
+                    )
+                self._state = CircuitState.OPEN
+
+    def release_probe(self, token: int) -> None:
+        """Give back an admitted HALF_OPEN probe that ended without an outcome.
+
+        Used when the probing call is cancelled, so the next caller can probe.
+        Only the current probe's token frees the slot; a call admitted as an
+        ordinary request (token 0) or by an earlier probe round is a no-op.
+
+        Args:
+            token: Value returned by ``admit`` for the cancelled call
+        """
+        with self._lock:
+            if token and self._half_open_inflight == token:
+                self._half_open_inflight = 0
+
+    def admit(self) -> Optional[int]:
+        """Admit a call, reporting whether it took the HALF_OPEN probe slot.
+
+        Returns:
+            None if the call is rejected, 0 if it is admitted as an ordinary
+            request, or a positive probe token to hand to ``release_probe``
+            if the call ends without recording an outcome
+        """
         state = self.state
         if state == CircuitState.CLOSED:
-            return True
+            return 0
         if state == CircuitState.HALF_OPEN:
-            return True  # Allow one test request
-        return False
+            # Allow exactly one test request at a time
+            with self._lock:
+                if self._half_open_inflight:
+                    return None
+                self._probe_seq += 1
+                self._half_open_inflight = self._probe_seq
+                return self._probe_seq
+        return None
+
+    def allow_request(self) -> bool:
+        """Check if request should be allowed."""
+        return self.admit() is not None
 
     def get_status(self) -> dict[str, Any]:
         """Get circuit status for health checks."""
@@ -109,7 +182,8 @@ def with_circuit_breaker(
     def decorator(func: F) -> F:
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            if not breaker.allow_request():
+            token = breaker.admit()
+            if token is None:
                 raise CircuitOpenError(
                     f"Circuit '{breaker.name}' is open",
                     circuit_name=breaker.name,
@@ -122,6 +196,10 @@ def with_circuit_breaker(
             except Exception:
                 breaker.record_failure()
                 raise
+            except BaseException:
+                # Cancelled: no verdict on the service, free the probe slot
+                breaker.release_probe(token)
+                raise
 
         return wrapper  # type: ignore[return-value]
 
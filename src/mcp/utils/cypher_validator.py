@@ -1,39 +1,122 @@
+import asyncio
 import re
+import time
+import weakref
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Set
+from typing import AbstractSet, Any, Dict, List, Optional
 
 from neo4j import AsyncDriver
 
+# Labels and relationship types are captured in lookaheads so that only the
+# opening bracket is consumed and keywords inside the pattern are still scanned
+_LABEL_PATTERN = r"\((?=[\w]*:(?P<label>[\w]+)\))"
+_REL_PATTERN = r"\[(?=[\w]*:(?P<rel>[\w]+)\])"
+_LIMIT_PATTERN = r"\bLIMIT\s+(?P<limit>\d+)"
 
-@dataclass
+# Labels and relationship types in one round-trip; the aggregating subqueries
+# always produce a row, even on an empty database
+_SCHEMA_QUERY = """
+CALL { CALL db.labels() YIELD label RETURN collect(label) AS labels }
+CALL { CALL db.relationshipTypes() YIELD relationshipType
+       RETURN collect(relationshipType) AS rel_types }
+RETURN labels, rel_types
+"""
+
+# Default lifetime of a cached schema (seconds); labels change only on migrations
+SCHEMA_CACHE_TTL = 300.0
+
+# driver -> (loaded_at, schema); weak keys so abandoned drivers are not kept alive
+_schema_cache: "weakref.WeakKeyDictionary[AsyncDriver, tuple[float, GraphSchema]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Bumped on every invalidation so answers cached against an older graph miss
+_graph_generation = 0
+
+# driver -> lock serialising refills, so concurrent misses share one schema fetch
+_schema_locks: "weakref.WeakKeyDictionary[AsyncDriver, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@dataclass(frozen=True)
 class GraphSchema:
-    """Known graph schema elements."""
+    """Known graph schema elements.
+
+    Immutable and hashable (the label sets are stored as frozensets), so a
+    schema can key caches such as the prompt text built from it.
+    """
+
+    node_labels: AbstractSet[str]
+    relationship_types: AbstractSet[str]
 
-    node_labels: Set[str]
-    relationship_types: Set[str]
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "node_labels", frozenset(self.node_labels))
+        object.__setattr__(self, "relationship_types", frozenset(self.relationship_types))
 
     @classmethod
     async def from_neo4j(cls, driver: AsyncDriver) -> "GraphSchema":
         """Load schema from Neo4j database."""
         async with driver.session() as session:
-            # Get node labels
-            labels_result = await session.run("CALL db.labels()")
-            labels = {record["label"] async for record in labels_result}
+            result = await session.run(_SCHEMA_QUERY)
+            record = await result.single()
 
-            # Get relationship types
-            rels_result = await session.run("CALL db.relationshipTypes()")
-            rels = {record["relationshipType"] async for record in rels_result}
+        if record is None:
+            return cls(node_labels=frozenset(), relationship_types=frozenset())
+        return cls(node_labels=record["labels"], relationship_types=record["rel_types"])
 
-            return cls(node_labels=labels, relationship_types=rels)
+    @classmethod
+    async def from_neo4j_cached(
+        cls, driver: AsyncDriver, ttl: float = SCHEMA_CACHE_TTL
+    ) -> "GraphSchema":
+        """Load schema from Neo4j, reusing a fetch for the same driver within ``ttl``."""
+        entry = _schema_cache.get(driver)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+
+        lock = _schema_locks.get(driver)
+        if lock is None:
+            lock = _schema_locks[driver] = asyncio.Lock()
+        async with lock:
+            # Another caller may have refreshed while we waited
+            entry = _schema_cache.get(driver)
+            if entry is not None and time.monotonic() - entry[0] < ttl:
+                return entry[1]
+            schema = await cls.from_neo4j(driver)
+            _schema_cache[driver] = (time.monotonic(), schema)
+            return schema
 
     @classmethod
     def from_config(cls, schema_config: Dict[str, Any]) -> "GraphSchema":
         """Load schema from configuration (schema.yaml)."""
-        labels = set(schema_config.get("nodes", {}).keys())
-        rels = set(schema_config.get("relationships", {}).keys())
+        labels = frozenset(schema_config.get("nodes", {}))
+        rels = frozenset(schema_config.get("relationships", {}))
         return cls(node_labels=labels, relationship_types=rels)
 
 
+def invalidate_schema_cache() -> None:
+    """Drop cached schemas, e.g. after a schema migration or re-ingestion."""
+    global _graph_generation
+    _schema_cache.clear()
+    _graph_generation += 1
+
+
+def graph_generation() -> int:
+    """Count of ``invalidate_schema_cache`` calls; caches of graph-derived answers key on it."""
+    return _graph_generation
+
+
+@dataclass
+class CypherScan:
+    """Everything the validator needs from one pass over a query."""
+
+    labels: set[str] = field(default_factory=set)
+    rel_types: set[str] = field(default_factory=set)
+    forbidden: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    limit: Optional[int] = None
+
+
 @dataclass
 class ValidationResult:
     """Result of Cypher validation."""
@@ -71,40 +154,77 @@ class CypherValidator:
         (r"(?<!LIMIT\s)\bRETURN\s+\*", "RETURN * without LIMIT"),
     ]
 
+    # Compiled once per process: every pattern above becomes a named group of a
+    # single alternation, so one finditer over the query collects labels,
+    # relationship types, forbidden keywords, warnings and the LIMIT together.
+    _FORBIDDEN_COMPILED = [(re.compile(p, re.IGNORECASE), d) for p, d in FORBIDDEN_PATTERNS]
+    _SCAN = re.compile(
+        "|".join(
+            [_LABEL_PATTERN, _REL_PATTERN, _LIMIT_PATTERN]
+            + [f"(?P<f{i}>{p})" for i, (p, _) in enumerate(FORBIDDEN_PATTERNS)]
+            + [f"(?P<w{i}>{p})" for i, (p, _) in enumerate(WARNING_PATTERNS)]
+        ),
+        re.IGNORECASE,
+    )
+
     def __init__(self, schema: GraphSchema):
         self.schema = schema
 
+    @classmethod
+    def scan(cls, query: str) -> CypherScan:
+        """Collect labels, relationship types, pattern hits and LIMIT in one pass."""
+        result = CypherScan()
+        forbidden_hits: set[int] = set()
+        warning_hits: set[int] = set()
+
+        for m in cls._SCAN.finditer(query):
+            group = m.lastgroup
+            if group == "label":
+                result.labels.add(m["label"])
+            elif group == "rel":
+                result.rel_types.add(m["rel"])
+            elif group == "limit":
+                if result.limit is None:
+                    result.limit = int(m["limit"])
+            elif group is not None and group[0] == "f":
+                forbidden_hits.add(int(group[1:]))
+            elif group is not None:
+                warning_hits.add(int(group[1:]))
+
+        if forbidden_hits:
+            # Rejected anyway: confirm the remaining patterns one by one so that
+            # overlapping ones (DETACH DELETE also being a DELETE) are all reported
+            for i, (regex, _) in enumerate(cls._FORBIDDEN_COMPILED):
+                if i not in forbidden_hits and regex.search(query):
+                    forbidden_hits.add(i)
+
+        result.forbidden = [
+            d for i, (_, d) in enumerate(cls.FORBIDDEN_PATTERNS) if i in forbidden_hits
+        ]
+        result.warnings = [
+            d for i, (_, d) in enumerate(cls.WARNING_PATTERNS) if i in warning_hits
+        ]
+        return result
+
     def validate(self, query: str) -> ValidationResult:
         """Validate a Cypher query."""
-        errors = []
-        warnings = []
-
-        # Check for forbidden patterns
-        for pattern, description in self.FORBIDDEN_PATTERNS:
-            if re.search(pattern, query, re.IGNORECASE):
-                errors.append(f"Forbidden: {description}")
-
-        # Extract and validate node labels
-        label_pattern = r"\([\w]*:([\w]+)\)"
-        labels_used = set(re.findall(label_pattern, query))
-        unknown_labels = labels_used - self.schema.node_labels
+        scan = self.scan(query)
+        errors = [f"Forbidden: {description}" for description in scan.forbidden]
+
+        # Validate node labels
+        unknown_labels = scan.labels - self.schema.node_labels
         if unknown_labels:
             errors.append(f"Unknown node labels: {unknown_labels}")
 
-        # Extract and validate relationship types
-        rel_pattern = r"\[[\w]*:([\w]+)\]"
-        rels_used = set(re.findall(rel_pattern, query))
-        unknown_rels = rels_used - self.schema.relationship_types
+        # Validate relationship types
+        unknown_rels = scan.rel_types - self.schema.relationship_types
         if unknown_rels:
             errors.append(f"Unknown relationship types: {unknown_rels}")
 
-        # Check for warning patterns
-        for pattern, description in self.WARNING_PATTERNS:
-            if re.search(pattern, query, re.IGNORECASE):
-                warnings.append(description)
+        warnings = list(scan.warnings)
 
         # Warn if no LIMIT clause
-        if not re.search(r"\bLIMIT\s+\d+", query, re.IGNORECASE):
+        if scan.limit is None:
             warnings.append("No LIMIT clause (will be added automatically)")
 
         return ValidationResult(is_valid=len(errors) == 0, errors=errors, warnings=warnings)
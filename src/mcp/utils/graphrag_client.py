@@ -1,4 +1,6 @@
 import re
+from functools import lru_cache
+from itertools import chain
 from typing import Any, Dict, Optional
 
 from llama_index.llms.openai_like import OpenAILike
@@ -10,12 +12,13 @@ from src.config import get_config
 from src.mcp.context import get_repository
 from src.mcp.utils.circuit_breaker import cypher_generation_breaker, with_circuit_breaker
 from src.mcp.utils.prompt_templates import (
-    DEFAULT_TEMPLATE,
-    MULTI_REPO_TEMPLATE,
     get_prompt_template,
+    render_default,
+    render_multi_repo,
 )
 from src.mcp.utils.query_guardrails import enforce_limit
-from src.mcp.utils.tracing import get_langfuse
+from src.mcp.utils.response_cache import response_cache, response_cache_key
+from src.mcp.utils.tracing import start_generation
 
 DETERMINISTIC_TOOLS = [
     "find_dependencies",
@@ -27,6 +30,41 @@ DETERMINISTIC_TOOLS = [
     "find_template_usage",
 ]
 
+# <think> blocks and markdown code fences, stripped from LLM output in one pass
+_POST_RE = re.compile(r"<think>.*?</think>|```cypher|```", re.DOTALL)
+
+# config.schema lives for the whole process; remember its prompt text by identity
+_config_schema_text: Optional[tuple[Dict[str, Any], str]] = None
+
+
+def _build_config_schema_text(schema: Dict[str, Any]) -> str:
+    def prop_names(details: Dict[str, Any]) -> str:
+        return ", ".join(p["name"] for p in details.get("properties", []))
+
+    return "\n".join(
+        chain(
+            ["Nodes:"],
+            (f"  (:{node}) {{ {prop_names(d)} }}" for node, d in schema.get("nodes", {}).items()),
+            ["", "Relationships:"],
+            (
+                f"  -[:{rel}]-> {{ {prop_names(d)} }}"
+                for rel, d in schema.get("relationships", {}).items()
+            ),
+        )
+    )
+
+
+@lru_cache(maxsize=8)
+def _build_graph_schema_text(schema: GraphSchema) -> str:
+    return "\n".join(
+        chain(
+            ["Nodes:"],
+            (f"  (:{label})" for label in sorted(schema.node_labels)),
+            ["", "Relationships:"],
+            (f"  -[:{rel}]->" for rel in sorted(schema.relationship_types)),
+        )
+    )
+
 
 class GraphRAGClient:
     def __init__(self) -> None:
@@ -41,33 +79,53 @@ class GraphRAGClient:
         )
 
     def _format_schema(self, schema: Dict[str, Any]) -> str:
-        """Format config schema dict for LLM prompts."""
-        nodes = schema.get("nodes", {})
-        rels = schema.get("relationships", {})
-
-        lines = ["Nodes:"]
-        for node, details in nodes.items():
-            props = ", ".join([p["name"] for p in details.get("properties", [])])
-            lines.append(f"  (:{node}) {{ {props} }}")
-
-        lines.append("\nRelationships:")
-        for rel, details in rels.items():
-            props = ", ".join([p["name"] for p in details.get("properties", [])])
-            lines.append(f"  -[:{rel}]-> {{ {props} }}")
-
-        return "\n".join(lines)
+        """Format config schema dict for LLM prompts (cached per schema object)."""
+        global _config_schema_text
+        if _config_schema_text is not None and _config_schema_text[0] is schema:
+            return _config_schema_text[1]
+        text = _build_config_schema_text(schema)
+        _config_schema_text = (schema, text)
+        return text
 
     def _format_graph_schema(self, schema: GraphSchema) -> str:
-        """Format a GraphSchema dataclass (from Neo4j) for LLM prompts."""
-        lines = ["Nodes:"]
-        for label in sorted(schema.node_labels):
-            lines.append(f"  (:{label})")
+        """Format a GraphSchema dataclass (from Neo4j) for LLM prompts (cached)."""
+        return _build_graph_schema_text(schema)
+
+    def _schema_text(self, schema: Optional[GraphSchema]) -> str:
+        # Use provided Neo4j schema if available, otherwise fall back to config
+        if schema is not None:
+            return self._format_graph_schema(schema)
+        return self._format_schema(get_config().schema)
 
-        lines.append("\nRelationships:")
-        for rel in sorted(schema.relationship_types):
-            lines.append(f"  -[:{rel}]->")
+    def _response_cache_key(
+        self, question: str, repo: Optional[str], schema_str: str
+    ) -> Optional[tuple[Any, ...]]:
+        config = get_config()
+        # Generation is deterministic only at temperature 0; otherwise always ask the LLM
+        if config.llm.temperature > 0:
+            return None
+        template_name = "multi_repo" if repo else config.llm.prompt_template
+        return response_cache_key(template_name, repo, schema_str, question)
 
-        return "\n".join(lines)
+    def remember_cypher(
+        self,
+        question: str,
+        cypher: str,
+        repository_id: Optional[str] = None,
+        schema: Optional[GraphSchema] = None,
+    ) -> None:
+        """Cache Cypher generated for ``question`` once it has passed validation.
+
+        Args:
+            question: Question the query was generated for
+            cypher: Validated query returned by ``generate_cypher``
+            repository_id: Repository passed to ``generate_cypher``
+            schema: Schema passed to ``generate_cypher``
+        """
+        repo = repository_id or get_repository()
+        cache_key = self._response_cache_key(question, repo, self._schema_text(schema))
+        if cache_key is not None:
+            response_cache.put(cache_key, cypher)
 
     @with_circuit_breaker(cypher_generation_breaker, suggested_tools=DETERMINISTIC_TOOLS)
     async def generate_cypher(
@@ -79,37 +137,32 @@ class GraphRAGClient:
         config = get_config()
         repo = repository_id or get_repository()
 
-        # Use provided Neo4j schema if available, otherwise fall back to config
-        if schema is not None:
-            schema_str = self._format_graph_schema(schema)
-        else:
-            schema_str = self._format_schema(config.schema)
+        schema_str = self._schema_text(schema)
+
+        # Validated Cypher from an earlier identical question (see remember_cypher)
+        cache_key = self._response_cache_key(question, repo, schema_str)
+        if cache_key is not None:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Response cache hit for question: {}", question)
+                return cached
 
         if repo:
-            template = MULTI_REPO_TEMPLATE
-            prompt = template.format(schema_str=schema_str, question=question, repository_id=repo)
+            prompt = render_multi_repo(schema_str=schema_str, question=question, repository_id=repo)
         else:
             # Fallback to configured or default
             if config.llm.prompt_template != "default":
-                template = get_prompt_template(config.llm.prompt_template)
+                render = get_prompt_template(config.llm.prompt_template)
             else:
-                template = DEFAULT_TEMPLATE
-            prompt = template.format(schema_str=schema_str, question=question)
-
-        langfuse = get_langfuse()
-        generation = None
-        if langfuse:
-            try:
-                # Langfuse v3 API: use start_generation()
-                generation = langfuse.start_generation(
-                    name="cypher_generation",
-                    model=config.llm.model_name,
-                    input=prompt,
-                    metadata={"question": question},
-                )
-            except Exception as e:
-                logger.debug(f"Langfuse tracing unavailable: {e}")
-                generation = None
+                render = render_default
+            prompt = render(schema_str=schema_str, question=question)
+
+        generation = start_generation(
+            "cypher_generation",
+            model=config.llm.model_name,
+            input=prompt,
+            metadata={"question": question},
+        )
 
         try:
             response = await self.llm.acomplete(prompt)
@@ -138,10 +191,7 @@ class GraphRAGClient:
                     pass
             raise
 
-        # Remove <think> tags if present
-        text = re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL)
-        # Remove markdown
-        text = re.sub(r"```cypher", "", text)
-        text = re.sub(r"```", "", text)
+        # Remove <think> tags and markdown fences if present
+        text = _POST_RE.sub("", text)
 
         return enforce_limit(text.strip())
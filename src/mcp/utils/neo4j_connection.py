@@ -1,13 +1,21 @@
 import asyncio
-from typing import Any, Dict, List, Optional
+import re
+import threading
+import weakref
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterable, List, Optional
 
 from loguru import logger
 from neo4j import AsyncDriver, AsyncGraphDatabase
 from neo4j.exceptions import ServiceUnavailable
 
 from src.config import get_config
-from src.mcp.utils.circuit_breaker import neo4j_query_breaker, with_circuit_breaker
-from src.mcp.utils.tracing import get_langfuse
+from src.mcp.utils.circuit_breaker import (
+    CircuitOpenError,
+    neo4j_query_breaker,
+    with_circuit_breaker,
+)
+from src.mcp.utils.tracing import start_span
 
 
 class QueryTimeoutError(Exception):
@@ -30,6 +38,37 @@ Suggestions:
 - Add filters to reduce result set size"""
 
 
+# Queries longer than this without parameters are probably inlining literals
+_UNPARAMETERIZED_HINT_LEN = 200
+_PARAM_RE = re.compile(r"\$(\w+)")
+
+
+def parameterize(query: str, **params: Any) -> tuple[str, Dict[str, Any]]:
+    """Pair a query with its ``$name`` parameters, checking they line up.
+
+    Passing values as parameters instead of formatting them into the query
+    text keeps the text stable, so Neo4j can reuse its cached plan.
+
+    Args:
+        query: Cypher referencing values as ``$name`` placeholders
+        **params: A value for every placeholder
+
+    Returns:
+        ``(query, params)``, ready for ``execute_query(*parameterize(...))``
+
+    Raises:
+        ValueError: If a placeholder has no value or a value has no placeholder
+    """
+    placeholders = set(_PARAM_RE.findall(query))
+    missing = placeholders - params.keys()
+    if missing:
+        raise ValueError(f"Missing query parameters: {sorted(missing)}")
+    unused = params.keys() - placeholders
+    if unused:
+        raise ValueError(f"Parameters not referenced in query: {sorted(unused)}")
+    return query, params
+
+
 class Neo4jConnectionManager:
     _instance: Optional["Neo4jConnectionManager"] = None
 
@@ -40,31 +79,45 @@ class Neo4jConnectionManager:
         self.database = config.neo4j.database
         self.default_timeout = config.neo4j.query_timeout
         self.connection_timeout = config.neo4j.connection_timeout
-        self._driver: Optional[AsyncDriver] = None
-        self._loop_id: Optional[int] = None
+        self.max_connection_pool_size = config.neo4j.max_connection_pool_size
+        self.max_connection_lifetime = config.neo4j.max_connection_lifetime
+        # One pooled driver per event loop; entries vanish with their loop, so a
+        # reused id() can never hand out a driver bound to a dead loop.
+        self._drivers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncDriver] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._no_loop_driver: Optional[AsyncDriver] = None
+        # Threading lock: driver lookup is synchronous and loops may live on
+        # different threads, so concurrent first calls must serialize here.
+        self._drivers_lock = threading.Lock()
+
+    def _create_driver(self) -> AsyncDriver:
+        return AsyncGraphDatabase.driver(
+            self.uri,
+            auth=self.auth,
+            max_connection_lifetime=self.max_connection_lifetime,
+            max_connection_pool_size=self.max_connection_pool_size,
+            connection_acquisition_timeout=self.connection_timeout,
+        )
 
     def _get_driver(self) -> AsyncDriver:
-        """Get or create driver for current event loop."""
+        """Get or create the pooled driver for the current event loop."""
         try:
-            current_loop = asyncio.get_running_loop()
-            current_loop_id = id(current_loop)
+            current_loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
         except RuntimeError:
-            current_loop_id = None
-
-        # Recreate driver if loop changed
-        if self._driver is None or self._loop_id != current_loop_id:
-            # Don't try to close old driver - its event loop may be closed
-            # Just abandon it and let garbage collection handle cleanup
-            self._driver = AsyncGraphDatabase.driver(
-                self.uri,
-                auth=self.auth,
-                max_connection_lifetime=300,
-                max_connection_pool_size=50,
-                connection_acquisition_timeout=self.connection_timeout,
-            )
-            self._loop_id = current_loop_id
+            current_loop = None
 
-        return self._driver
+        with self._drivers_lock:
+            if current_loop is None:
+                if self._no_loop_driver is None:
+                    self._no_loop_driver = self._create_driver()
+                return self._no_loop_driver
+
+            driver = self._drivers.get(current_loop)
+            if driver is None:
+                driver = self._create_driver()
+                self._drivers[current_loop] = driver
+            return driver
 
     @property
     def driver(self) -> AsyncDriver:
@@ -89,29 +142,30 @@ class Neo4jConnectionManager:
     async def execute_with_timeout(
         self, query: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None
     ) -> List[Dict[str, Any]]:
-        """Execute Cypher query with timeout protection."""
+        """Execute Cypher query with timeout protection.
+
+        Materialises every record as a dict. For large result sets prefer
+        ``stream_query``, or push counting/collecting into the Cypher itself
+        (``count()``, ``collect()``) so fewer rows cross the wire.
+        """
         if timeout is None:
             timeout = self.default_timeout
 
-        langfuse = get_langfuse()
-        span = None
-        if langfuse:
-            try:
-                # Langfuse v3 API: use start_span() directly
-                span = langfuse.start_span(
-                    name="neo4j_query",
-                    input={"query": query, "params": params},
-                    metadata={"timeout": timeout},
-                )
-            except Exception as e:
-                logger.debug(f"Langfuse tracing unavailable: {e}")
-                span = None
+        if not params and len(query) > _UNPARAMETERIZED_HINT_LEN:
+            logger.debug("Unparameterized query may miss the plan cache: {}", query[:80])
+
+        span = start_span(
+            "neo4j_query",
+            input={"query": query, "params": params},
+            metadata={"timeout": timeout},
+        )
 
         try:
             async with asyncio.timeout(timeout):
                 async with self.driver.session(database=self.database) as session:
                     result = await session.run(query, params or {})
-                    data = [record.data() async for record in result]
+                    # One bulk conversion instead of an await per record
+                    data = await result.data()
                     if span:
                         span.update(output={"result_count": len(data)})
                         span.end()
@@ -135,6 +189,90 @@ class Neo4jConnectionManager:
                 span.end()
             raise
 
+    async def stream_query(
+        self, query: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream records of a Cypher query as they arrive from the server.
+
+        Same circuit breaker, timeout protection and tracing span as
+        ``execute_with_timeout``, but rows are yielded one by one instead of
+        being collected into a list. The timeout bounds the total time spent
+        waiting on Neo4j (running the query and fetching records); time the
+        consumer spends between rows does not count against it.
+        """
+        token = neo4j_query_breaker.admit()
+        if token is None:
+            raise CircuitOpenError(
+                f"Circuit '{neo4j_query_breaker.name}' is open",
+                circuit_name=neo4j_query_breaker.name,
+            )
+        if timeout is None:
+            timeout = self.default_timeout
+
+        span = start_span(
+            "neo4j_query",
+            input={"query": query, "params": params},
+            metadata={"timeout": timeout, "streamed": True},
+        )
+
+        loop = asyncio.get_running_loop()
+        remaining = timeout
+
+        async def wait(awaitable: Awaitable[Any]) -> Any:
+            # Spend the timeout only while waiting on the server
+            nonlocal remaining
+            started = loop.time()
+            try:
+                async with asyncio.timeout(remaining):
+                    return await awaitable
+            finally:
+                remaining -= loop.time() - started
+
+        count = 0
+        try:
+            async with self.driver.session(database=self.database) as session:
+                result = await wait(session.run(query, params or {}))
+                records = aiter(result)
+                while True:
+                    try:
+                        record = await wait(anext(records))
+                    except StopAsyncIteration:
+                        break
+                    count += 1
+                    yield record.data()
+        except asyncio.TimeoutError:
+            neo4j_query_breaker.record_failure()
+            logger.warning(f"Query timed out after {timeout}s: {query[:100]}...")
+            if span:
+                span.update(level="ERROR", status_message=f"Timeout after {timeout}s")
+                span.end()
+            raise QueryTimeoutError(f"Query exceeded {timeout}s limit")
+        except ServiceUnavailable as e:
+            neo4j_query_breaker.record_failure()
+            logger.error(f"Neo4j unavailable: {e}")
+            if span:
+                span.update(level="ERROR", status_message=f"Neo4j unavailable: {str(e)}")
+                span.end()
+            raise Neo4jUnavailableError(str(e))
+        except Exception as e:
+            neo4j_query_breaker.record_failure()
+            logger.error(f"Query execution failed: {e}")
+            if span:
+                span.update(level="ERROR", status_message=str(e))
+                span.end()
+            raise
+        except BaseException:
+            # Cancelled or closed early by the consumer
+            neo4j_query_breaker.release_probe(token)
+            if span:
+                span.update(output={"result_count": count, "closed_early": True})
+                span.end()
+            raise
+        neo4j_query_breaker.record_success()
+        if span:
+            span.update(output={"result_count": count})
+            span.end()
+
     async def execute_query(
         self, query: str, params: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
@@ -147,8 +285,60 @@ class Neo4jConnectionManager:
         """Execute write query using default timeout."""
         return await self.execute_with_timeout(query, params)
 
+    async def execute_batch(
+        self,
+        query: str,
+        rows: Iterable[Dict[str, Any]],
+        chunk_size: int = 10_000,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run one parameterised statement over many rows, a chunk per round-trip.
+
+        The query must iterate the ``$rows`` parameter itself, e.g.::
+
+            UNWIND $rows AS row
+            MATCH (t:Task {name: row.name}) SET t.status = row.status
+
+        so Neo4j plans the statement once and loops server-side instead of
+        the caller paying a Bolt round-trip per item.
+
+        Args:
+            query: Cypher statement referencing ``$rows`` via ``UNWIND``
+            rows: Parameter maps, one per item
+            chunk_size: Rows sent per statement
+            timeout: Per-chunk timeout (defaults to the configured query timeout)
+
+        Returns:
+            Records returned by all chunks, in order
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        results: List[Dict[str, Any]] = []
+        it = iter(rows)
+        while chunk := list(islice(it, chunk_size)):
+            results.extend(await self.execute_with_timeout(query, {"rows": chunk}, timeout=timeout))
+        return results
+
     async def close(self) -> None:
-        await self.driver.close()
+        """Close every driver this manager has created, without creating one.
+
+        Drivers are detached first, so later calls start fresh pools. A driver
+        bound to another event loop may not close cleanly from this one; such
+        failures are logged and the remaining drivers are still closed.
+        """
+        with self._drivers_lock:
+            drivers = list(self._drivers.values())
+            if self._no_loop_driver is not None:
+                drivers.append(self._no_loop_driver)
+            self._drivers.clear()
+            self._no_loop_driver = None
+
+        for driver in drivers:
+            try:
+                await driver.close()
+            except Exception as e:
+                logger.warning(f"Failed to close Neo4j driver: {e}")
 
 
 def get_neo4j_connection() -> Neo4jConnectionManager:
@@ -1,5 +1,5 @@
 import os
-from pathlib import Path
+from functools import lru_cache
 
 from loguru import logger
 
@@ -10,6 +10,12 @@ class PathSanitizationError(Exception):
     pass
 
 
+@lru_cache(maxsize=8)
+def _resolve_base(base: str) -> str:
+    """Resolve an allowed base directory once; it is normally a fixed config value."""
+    return os.path.realpath(base)
+
+
 def sanitize_path(
     user_path: str, allowed_base: str | None = None, allow_absolute: bool = False
 ) -> str:
@@ -34,8 +40,9 @@ def sanitize_path(
     if "\x00" in user_path:
         raise PathSanitizationError("Null byte in path")
 
-    # Reject obvious traversal attempts
-    if ".." in user_path:
+    # Reject traversal: any '..' path component (but not names like 'my..archive.tar').
+    # The substring test is a cheap pre-screen before splitting into components.
+    if ".." in user_path and ".." in user_path.replace("\\", "/").split("/"):
         raise PathSanitizationError("Path traversal detected: '..' not allowed")
 
     # Normalize the path
@@ -47,22 +54,31 @@ def sanitize_path(
 
     # If base directory specified, ensure path stays within it
     if allowed_base:
-        base = Path(allowed_base).resolve()
+        base = _resolve_base(allowed_base)
         if allow_absolute:
-            full_path = Path(normalized).resolve()
+            full_path = os.path.realpath(normalized)
         else:
-            full_path = (base / normalized).resolve()
+            full_path = os.path.realpath(os.path.join(base, normalized))
 
-        try:
-            full_path.relative_to(base)
-        except ValueError:
+        if os.path.commonpath([full_path, base]) != base:
             raise PathSanitizationError(f"Path escapes allowed directory: {allowed_base}")
 
-        return str(full_path)
+        return full_path
 
     return normalized
 
 
+@lru_cache(maxsize=1)
+def _default_codebase_root() -> str | None:
+    """Codebase root from configuration, read once per process.
+
+    Call ``_default_codebase_root.cache_clear()`` after changing the setting.
+    """
+    from src.config import Config
+
+    return Config().pipeline.codebase_path
+
+
 def validate_file_path_param(file_path: str, codebase_root: str | None = None) -> str:
     """
     Validate file_path parameter for MCP tools.
@@ -81,10 +97,7 @@ def validate_file_path_param(file_path: str, codebase_root: str | None = None) -
 
     # Get codebase root from config if not provided
     if codebase_root is None:
-        from src.config import Config
-
-        config = Config()
-        codebase_root = config.pipeline.codebase_path
+        codebase_root = _default_codebase_root()
 
     return sanitize_path(file_path, allowed_base=codebase_root, allow_absolute=False)
 
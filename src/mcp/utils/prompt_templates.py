@@ -1,151 +1,124 @@
-"""Prompt templates for LLM interactions."""
+"""Prompt templates for LLM interactions.
 
-from typing import Dict
+The static part of each template (instructions, constraints, examples) lives in
+``prompts/<name>.txt`` and is read on first use.
+"""
 
-DEFAULT_TEMPLATE = """<instructions>
-Convert the user's question into a Cypher query for a Neo4j graph database.
-Return ONLY the Cypher query. No explanations, no markdown.
-</instructions>
+import string
+from functools import lru_cache
+from importlib.resources import files
+from typing import Callable
 
-<schema>
-{schema_str}
-</schema>
+# Templates are assembled static-first: instructions, constraints and examples
+# (identical on every call; per repository for MULTI_REPO), then the schema
+# (changes only on re-ingestion), then the question. Keeping the variable parts
+# at the end leaves the longest possible byte-identical prompt prefix for
+# provider-side prompt caching. Do not add per-request content to the prefixes.
 
-<constraints>
-- Use ONLY the node labels and relationship types in schema
-- Always include LIMIT clause (default 100)
-- Do not use procedures (CALL) unless necessary
-- For name searches, use CONTAINS or toLower() for flexible matching
-- Consider common aliases: httpd=apache, webserver=nginx/apache, db=mysql/postgres
-- Role names often have prefixes like "geerlingguy." - search partial names with CONTAINS
-- IMPORTANT: Always connect nodes via relationships in MATCH - never use separate MATCH clauses that create cartesian products
-- ALWAYS use DISTINCT when returning node properties to avoid duplicates from path traversals
-- Prefer returning individual columns over collect() to avoid confusing results
-</constraints>
+# Names with a prefix file under prompts/; anything else falls back to default
+TEMPLATE_NAMES = frozenset({"default", "multi_repo"})
 
-<examples>
-Question: How many playbooks are there?
-MATCH (p:Playbook) RETURN count(p) as count
-
-Question: Find tasks using copy module
-MATCH (t:Task) WHERE t.module = 'copy' RETURN t.name, t.path LIMIT 100
+_SCHEMA_BLOCK = """<schema>
+{schema_str}
+</schema>
 
-Question: What roles are used?
-MATCH (r:Role)<-[:USES_ROLE]-(usage) RETURN r.name, count(usage) LIMIT 100
+"""
 
-Question: Find roles for httpd or apache
-MATCH (r:Role) WHERE toLower(r.name) CONTAINS 'apache' OR toLower(r.name) CONTAINS 'httpd' RETURN r.name LIMIT 100
+_QUESTION_BLOCK = """<question>
+{question}
+</question>
+"""
 
-Question: Find playbooks using httpd/apache roles
-MATCH (p:Playbook)-[:HAS_PLAY]->(play)-[:USES_ROLE]->(r:Role) WHERE toLower(r.name) CONTAINS 'apache' RETURN DISTINCT p.name as playbook, r.name as role LIMIT 100
 
-Question: Find playbooks that use roles
-MATCH (p:Playbook)-[:HAS_PLAY]->(play)-[:USES_ROLE]->(r:Role) RETURN DISTINCT p.name as playbook, r.name as role LIMIT 100
+def _resolve_name(name: str) -> str:
+    return name if name in TEMPLATE_NAMES else "default"
 
-Question: What tasks are in a playbook?
-MATCH (p:Playbook)-[:HAS_PLAY]->(play)-[:HAS_TASK]->(t:Task) RETURN p.name, t.name, t.module LIMIT 100
 
-Question: Find handlers in roles
-MATCH (r:Role)-[:HAS_HANDLER]->(h:Handler) RETURN r.name, h.name LIMIT 100
+@lru_cache(maxsize=None)
+def _load_prefix(name: str) -> str:
+    text = (files("src.mcp.utils") / "prompts" / f"{name}.txt").read_text(encoding="utf-8")
+    # Exactly one blank line before the schema block, whatever the editor left
+    return text.rstrip("\n") + "\n\n"
 
-Question: What variables are defined?
-MATCH (v:Variable)<-[:DEFINES_VAR]-(source) RETURN v.name, labels(source)[0] as defined_by LIMIT 100
 
-Question: Find tasks that notify handlers
-MATCH (t:Task)-[:NOTIFIES]->(h:Handler) RETURN t.name, h.name LIMIT 100
+def get_prompt_segments(name: str = "default") -> tuple[str, str, str]:
+    """Get a template split into (static prefix, schema block, question block).
 
-Question: List all classes
-MATCH (c:Class) RETURN c.name, c.docstring LIMIT 100
+    Each segment is an unrendered ``str.format`` template; for providers with
+    explicit cache markers, the first two are the cacheable parts.
+    """
+    return (_load_prefix(_resolve_name(name)), _SCHEMA_BLOCK, _QUESTION_BLOCK)
 
-Question: Show async functions
-MATCH (f:Function) WHERE f.is_async = true RETURN f.name, f.params LIMIT 100
-</examples>
 
-<question>
-{question}
-</question>
-"""
+def get_template_text(name: str = "default") -> str:
+    """Get the full unrendered ``str.format`` template for a name."""
+    return "".join(get_prompt_segments(name))
 
-MULTI_REPO_TEMPLATE = """<instructions>
-Convert the user's question into a Cypher query for a Neo4j graph database.
-Return ONLY the Cypher query. No explanations, no markdown.
-</instructions>
 
-<schema>
-{schema_str}
-</schema>
+PromptRenderer = Callable[..., str]
 
-<repository_context>
-Active repository: {repository_id}
-All nodes except Role have a 'repository' property.
-ALWAYS filter by repository unless querying global entities like Role.
-</repository_context>
 
-<constraints>
-- Use ONLY the node labels and relationship types in schema
-- Always include WHERE n.repository = '{repository_id}' for non-Role nodes
-- Role nodes are global - no repository filter
-- Always include LIMIT clause (default 100)
-- For name searches, use CONTAINS or toLower() for flexible matching
-- Consider common aliases: httpd=apache, webserver=nginx/apache, db=mysql/postgres
-- Role names often have prefixes like "geerlingguy." - search partial names with CONTAINS
-- IMPORTANT: Always connect nodes via relationships in MATCH - never use separate MATCH clauses that create cartesian products
-- ALWAYS use DISTINCT when returning node properties to avoid duplicates from path traversals
-- Prefer returning individual columns over collect() to avoid confusing results
-</constraints>
+def compile_template(template: str) -> PromptRenderer:
+    """Parse a ``str.format`` template once into a reusable renderer.
 
-<examples>
-Question: How many playbooks are there?
-MATCH (p:Playbook) WHERE p.repository = '{repository_id}' RETURN count(p) as count
+    The returned callable takes the template fields as keyword arguments and
+    produces the same text as ``template.format(**kwargs)`` without re-parsing
+    the template (and its ``{{``/``}}`` escapes) on every call.
 
-Question: Find tasks using copy module
-MATCH (t:Task) WHERE t.repository = '{repository_id}' AND t.module = 'copy' RETURN t.name, t.path LIMIT 100
+    Args:
+        template: Template using plain ``{name}`` fields
 
-Question: What roles are used?
-MATCH (r:Role)<-[:USES_ROLE]-(usage) WHERE usage.repository = '{repository_id}' RETURN r.name, count(usage) LIMIT 100
+    Returns:
+        Renderer callable
 
-Question: Find roles for httpd or apache
-MATCH (r:Role) WHERE toLower(r.name) CONTAINS 'apache' OR toLower(r.name) CONTAINS 'httpd' RETURN r.name LIMIT 100
+    Raises:
+        ValueError: If a field uses a format spec, conversion or positional name
+    """
+    chunks: list[tuple[str, str | None]] = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if field is not None and (spec or conversion or not field.isidentifier()):
+            raise ValueError(f"Unsupported template field: {{{field}}}")
+        chunks.append((literal, field))
+    parts = tuple(chunks)
 
-Question: Find playbooks using httpd/apache roles
-MATCH (p:Playbook)-[:HAS_PLAY]->(play)-[:USES_ROLE]->(r:Role) WHERE p.repository = '{repository_id}' AND toLower(r.name) CONTAINS 'apache' RETURN DISTINCT p.name as playbook, r.name as role LIMIT 100
+    def render(**kwargs: object) -> str:
+        return "".join(
+            [literal + (str(kwargs[field]) if field is not None else "") for literal, field in parts]
+        )
 
-Question: Find playbooks that use roles
-MATCH (p:Playbook)-[:HAS_PLAY]->(play)-[:USES_ROLE]->(r:Role) WHERE p.repository = '{repository_id}' RETURN DISTINCT p.name as playbook, r.name as role LIMIT 100
+    return render
 
-Question: What tasks are in a playbook?
-MATCH (p:Playbook)-[:HAS_PLAY]->(play)-[:HAS_TASK]->(t:Task) WHERE p.repository = '{repository_id}' RETURN p.name, t.name, t.module LIMIT 100
 
-Question: Find handlers in roles
-MATCH (r:Role)-[:HAS_HANDLER]->(h:Handler) WHERE h.repository = '{repository_id}' RETURN r.name, h.name LIMIT 100
+@lru_cache(maxsize=None)
+def _compiled(name: str) -> PromptRenderer:
+    return compile_template(get_template_text(name))
 
-Question: What variables are defined?
-MATCH (v:Variable)<-[:DEFINES_VAR]-(source) WHERE v.repository = '{repository_id}' RETURN v.name, labels(source)[0] as defined_by LIMIT 100
 
-Question: Find tasks that notify handlers
-MATCH (t:Task)-[:NOTIFIES]->(h:Handler) WHERE t.repository = '{repository_id}' RETURN t.name, h.name LIMIT 100
+def get_prompt_template(name: str = "default") -> PromptRenderer:
+    """Get the compiled renderer for a prompt template by name.
 
-Question: Which repos use the nginx role?
-MATCH (r:Role {{name: 'nginx'}})<-[:USES_ROLE]-(usage) RETURN r.name, collect(DISTINCT usage.repository) as repos
+    The template file is read and compiled on the first request for a name.
+    """
+    return _compiled(_resolve_name(name))
 
-Question: List all classes
-MATCH (c:Class) WHERE c.repository = '{repository_id}' RETURN c.name, c.docstring LIMIT 100
 
-Question: Show async functions
-MATCH (f:Function) WHERE f.repository = '{repository_id}' AND f.is_async = true RETURN f.name, f.params LIMIT 100
-</examples>
+def render_default(**kwargs: object) -> str:
+    """Render the default template."""
+    return _compiled("default")(**kwargs)
 
-<question>
-{question}
-</question>
-"""
 
-TEMPLATES: Dict[str, str] = {
-    "default": DEFAULT_TEMPLATE,
-    "multi_repo": MULTI_REPO_TEMPLATE,
-}
+def render_multi_repo(**kwargs: object) -> str:
+    """Render the multi-repository template (needs ``repository_id``)."""
+    return _compiled("multi_repo")(**kwargs)
 
 
-def get_prompt_template(name: str = "default") -> str:
-    """Get prompt template by name."""
-    return TEMPLATES.get(name, DEFAULT_TEMPLATE)
+def __getattr__(name: str) -> object:
+    # Module constants from before templates moved to files; built on access
+    # so importing the module still reads nothing
+    if name == "DEFAULT_TEMPLATE":
+        return get_template_text("default")
+    if name == "MULTI_REPO_TEMPLATE":
+        return get_template_text("multi_repo")
+    if name == "TEMPLATES":
+        return {"default": _compiled("default"), "multi_repo": _compiled("multi_repo")}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,6 +5,21 @@ from loguru import logger
 
 MAX_RESULTS_DEFAULT = 100
 MAX_RESULTS_ABSOLUTE = 1000
+# Default row cap for the deterministic lookup tools
+TOOL_RESULTS_DEFAULT = 200
+
+_LIMIT_RE = re.compile(r"\bLIMIT\s+(\d+)", re.IGNORECASE)
+# Trailing whitespace and statement terminators removed before appending LIMIT
+_TRAILING_CHARS = "; \t\n\r"
+
+
+def _cap_limit(match: "re.Match[str]") -> str:
+    """Substitution callback: keep a LIMIT clause unless it exceeds the absolute max."""
+    existing_limit = int(match.group(1))
+    if existing_limit <= MAX_RESULTS_ABSOLUTE:
+        return match.group(0)
+    logger.warning(f"Capping LIMIT from {existing_limit} to {MAX_RESULTS_ABSOLUTE}")
+    return f"LIMIT {MAX_RESULTS_ABSOLUTE}"
 
 
 def enforce_limit(query: str, max_results: int = MAX_RESULTS_DEFAULT) -> str:
@@ -21,23 +36,14 @@ def enforce_limit(query: str, max_results: int = MAX_RESULTS_DEFAULT) -> str:
     # Cap at absolute maximum
     effective_limit = min(max_results, MAX_RESULTS_ABSOLUTE)
 
-    # Check if LIMIT already exists
-    limit_pattern = r"\bLIMIT\s+(\d+)"
-    match = re.search(limit_pattern, query, re.IGNORECASE)
-
-    if match:
-        existing_limit = int(match.group(1))
-        if existing_limit > MAX_RESULTS_ABSOLUTE:
-            logger.warning(f"Capping LIMIT from {existing_limit} to {MAX_RESULTS_ABSOLUTE}")
-            query = re.sub(
-                limit_pattern, f"LIMIT {MAX_RESULTS_ABSOLUTE}", query, flags=re.IGNORECASE
-            )
+    # One subn both detects existing LIMIT clauses and caps excessive ones
+    query, found = _LIMIT_RE.subn(_cap_limit, query)
+    if found:
         return query
 
     # Add LIMIT clause before any trailing semicolon
     logger.debug(f"Adding LIMIT {effective_limit} to query")
-    query = query.rstrip().rstrip(";")
-    return f"{query} LIMIT {effective_limit}"
+    return f"{query.rstrip(_TRAILING_CHARS)} LIMIT {effective_limit}"
 
 
 def validate_limit_param(limit: Optional[int]) -> int:
@@ -1,54 +1,83 @@
-from collections import defaultdict
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Dict
+from typing import Callable, List, NamedTuple
+
+
+class RateLimitDecision(NamedTuple):
+    """Outcome of a single rate-limit check."""
+
+    allowed: bool
+    remaining: int
+    retry_after: float
 
 
 @dataclass
 class RateLimiter:
-    """Token bucket rate limiter."""
+    """Token bucket rate limiter.
+
+    Buckets are kept for at most ``max_clients`` client IDs; the least recently
+    seen client is forgotten first and starts over with a full bucket.
+    """
 
     requests_per_minute: int = 100
     burst_size: int = 10
-
-    _buckets: Dict[str, float] = field(
-        default_factory=lambda: defaultdict(float), init=False, repr=False
+    max_clients: int = 10_000
+    # Clock for refills; tests substitute a fake one instead of sleeping
+    time_fn: Callable[[], float] = field(default=time.monotonic, repr=False)
+
+    # client_id -> [tokens, time_fn() of last refill], updated in place
+    # and ordered least recently used first.
+    # No locking: every method runs to completion without awaiting, so calls
+    # from coroutines on one event loop cannot interleave.
+    _state: "OrderedDict[str, List[float]]" = field(
+        default_factory=OrderedDict, init=False, repr=False
     )
-    _last_update: Dict[str, datetime] = field(default_factory=dict, init=False, repr=False)
-
-    def _refill(self, client_id: str) -> float:
-        """Refill tokens based on elapsed time."""
-        now = datetime.now()
 
-        if client_id not in self._last_update:
-            self._buckets[client_id] = float(self.burst_size)
-            self._last_update[client_id] = now
-            return float(self.burst_size)
+    def _refill(self, client_id: str) -> List[float]:
+        """Refill tokens based on elapsed time and return the client's bucket."""
+        now = self.time_fn()
 
-        last = self._last_update[client_id]
-        elapsed = (now - last).total_seconds()
+        bucket = self._state.get(client_id)
+        if bucket is None:
+            bucket = self._state[client_id] = [float(self.burst_size), now]
+            if len(self._state) > self.max_clients:
+                self._state.popitem(last=False)
+            return bucket
+        self._state.move_to_end(client_id)
 
-        # Add tokens based on elapsed time
+        # Add tokens based on elapsed time, capped at burst size
         refill_rate = self.requests_per_minute / 60.0
-        tokens = self._buckets[client_id] + (elapsed * refill_rate)
-        tokens = min(tokens, self.burst_size)  # Cap at burst size
-
-        self._buckets[client_id] = tokens
-        self._last_update[client_id] = now
-
-        return tokens
+        bucket[0] = min(bucket[0] + (now - bucket[1]) * refill_rate, self.burst_size)
+        bucket[1] = now
+        return bucket
 
     def allow(self, client_id: str = "default") -> bool:
         """Check if request is allowed and consume a token."""
-        tokens = self._refill(client_id)
-        if tokens >= 1:
-            self._buckets[client_id] = tokens - 1
+        bucket = self._refill(client_id)
+        if bucket[0] >= 1:
+            bucket[0] -= 1
             return True
         return False
 
+    def check(self, client_id: str = "default") -> RateLimitDecision:
+        """Consume a token if available and report the resulting limit state.
+
+        Equivalent to ``allow`` followed by ``get_retry_after`` (when rejected)
+        or ``get_remaining`` (when allowed), with a single refill.
+        """
+        bucket = self._refill(client_id)
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return RateLimitDecision(True, int(bucket[0]), 0)
+
+        refill_rate = self.requests_per_minute / 60.0
+        return RateLimitDecision(False, 0, (1 - bucket[0]) / refill_rate)
+
     def get_retry_after(self, client_id: str = "default") -> float:
         """Get seconds until next token available."""
-        tokens = self._buckets.get(client_id, 0)
+        bucket = self._state.get(client_id)
+        tokens = bucket[0] if bucket is not None else 0
         if tokens >= 1:
             return 0
         refill_rate = self.requests_per_minute / 60.0
@@ -56,8 +85,7 @@ class RateLimiter:
 
     def get_remaining(self, client_id: str = "default") -> int:
         """Get remaining tokens for client."""
-        self._refill(client_id)
-        return int(self._buckets.get(client_id, self.burst_size))
+        return int(self._refill(client_id)[0])
 
 
 class RateLimitExceeded(Exception):
@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Hashable, Optional, Tuple
+
+
+def response_cache_key(
+    template_name: str, repository_id: Optional[str], schema_str: str, question: str
+) -> Tuple[Hashable, ...]:
+    """Build the cache key for a generated query.
+
+    The rendered schema text is part of the key, so a schema change after
+    re-ingestion misses instead of returning Cypher written for old labels.
+    Only whitespace in the question is normalised: identifiers are matched
+    case-sensitively by Cypher, so questions differing in case stay apart.
+
+    Args:
+        template_name: Prompt template used for generation
+        repository_id: Active repository (None in single-repo mode)
+        schema_str: Schema text given to the LLM
+        question: Natural language question
+
+    Returns:
+        Hashable key
+    """
+    return (template_name, repository_id, schema_str, " ".join(question.split()))
+
+
+@dataclass
+class ResponseCache:
+    """Exact-match LRU cache of LLM-generated Cypher.
+
+    Only meaningful for deterministic generation (temperature 0); callers are
+    expected to bypass it otherwise, and to store only queries that passed
+    validation.
+    """
+
+    maxsize: int = 1024
+    ttl: float = 3600.0
+
+    _entries: "OrderedDict[Hashable, Tuple[float, str]]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return the cached query for ``key`` if present and not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Hashable, cypher: str) -> None:
+        """Store a query, evicting the least recently used entry when full."""
+        self._entries[key] = (time.monotonic(), cypher)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Global cache of generated Cypher, shared by all GraphRAGClient instances
+response_cache = ResponseCache()
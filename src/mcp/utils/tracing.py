@@ -1,5 +1,8 @@
 """Tracing utilities using Langfuse."""
 
+import atexit
+import reprlib
+import threading
 from functools import wraps
 from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
 
@@ -10,34 +13,128 @@ from src.config import get_config
 if TYPE_CHECKING:
     from langfuse import Langfuse
 
+    from src.config import Config
+
 F = TypeVar("F", bound=Callable[..., Any])
 
+# Longest tool output recorded on a span
+_MAX_OUTPUT_CHARS = 1000
+
+
+class _OutputRepr(reprlib.Repr):
+    """Bounded repr for traced tool output.
+
+    Never stringifies more of a result than is recorded: long strings, lists
+    and dicts are abbreviated while they are rendered instead of afterwards.
+    """
+
+    def repr_TextContent(self, obj: Any, level: int) -> str:
+        # MCP tool results; the model's own repr would render the full text
+        return self.repr_str(obj.text, level)
+
+
+_output_repr = _OutputRepr()
+_output_repr.maxstring = _MAX_OUTPUT_CHARS
+_output_repr.maxlist = 20
+_output_repr.maxdict = 20
+_output_repr.maxother = 200
+
 _langfuse_client: Optional["Langfuse"] = None
+# Configuration the client was resolved for (including disabled/broken
+# outcomes); init_config() installs a new one, which triggers re-resolution
+_langfuse_config: Optional["Config"] = None
+_langfuse_lock = threading.Lock()
 
 
 def get_langfuse() -> Optional["Langfuse"]:
-    """Get or initialize Langfuse client if enabled."""
-    global _langfuse_client
+    """Get or initialize Langfuse client if enabled.
+
+    Resolved on first use and cached until the global configuration is
+    replaced (``init_config``), including the disabled and
+    failed-to-initialize outcomes.
+    """
+    global _langfuse_client, _langfuse_config
     config = get_config()
+    if config is _langfuse_config:
+        return _langfuse_client
+
+    # Threads racing on the first call must not build two clients
+    with _langfuse_lock:
+        if config is _langfuse_config:
+            return _langfuse_client
+
+        # Send whatever the client of the previous configuration buffered
+        _flush_langfuse()
+        client = None
+        if config.langfuse.enabled:
+            try:
+                # Lazy import: the SDK is only loaded when tracing is enabled
+                from langfuse import Langfuse
 
-    if not config.langfuse.enabled:
-        return None
+                client = Langfuse(
+                    secret_key=config.langfuse.secret_key,
+                    public_key=config.langfuse.public_key,
+                    host=config.langfuse.host,
+                )
+            except Exception as e:
+                logger.error(f"Failed to initialize Langfuse: {e}")
+
+        _langfuse_client = client
+        _langfuse_config = config
+        return client
 
-    if _langfuse_client is None:
+
+def _flush_langfuse() -> None:
+    """Send any buffered events; also registered to run at interpreter exit."""
+    if _langfuse_client is not None:
         try:
-            # Lazy import to avoid compatibility issues
-            from langfuse import Langfuse
-
-            _langfuse_client = Langfuse(
-                secret_key=config.langfuse.secret_key,
-                public_key=config.langfuse.public_key,
-                host=config.langfuse.host,
-            )
+            _langfuse_client.flush()
         except Exception as e:
-            logger.error(f"Failed to initialize Langfuse: {e}")
-            return None
+            logger.debug(f"Langfuse flush failed: {e}")
+
 
-    return _langfuse_client
+atexit.register(_flush_langfuse)
+
+
+def start_span(name: str, **kwargs: Any) -> Optional[Any]:
+    """Start a Langfuse span, or return None when tracing is off or fails.
+
+    Args:
+        name: Span name
+        **kwargs: Passed to ``Langfuse.start_span`` (input, metadata, ...)
+
+    Returns:
+        The span, or None
+    """
+    langfuse = get_langfuse()
+    if langfuse is None:
+        return None
+    try:
+        # Langfuse v3 API: use start_span() directly
+        return langfuse.start_span(name=name, **kwargs)
+    except Exception as e:
+        logger.debug(f"Langfuse tracing unavailable: {e}")
+        return None
+
+
+def start_generation(name: str, **kwargs: Any) -> Optional[Any]:
+    """Start a Langfuse generation, or return None when tracing is off or fails.
+
+    Args:
+        name: Generation name
+        **kwargs: Passed to ``Langfuse.start_generation`` (model, input, ...)
+
+    Returns:
+        The generation, or None
+    """
+    langfuse = get_langfuse()
+    if langfuse is None:
+        return None
+    try:
+        return langfuse.start_generation(name=name, **kwargs)
+    except Exception as e:
+        logger.debug(f"Langfuse tracing unavailable: {e}")
+        return None
 
 
 def trace_tool(tool_name: str) -> Callable[[F], F]:
@@ -74,9 +171,9 @@ def trace_tool(tool_name: str) -> Callable[[F], F]:
                 result = await func(*args, **kwargs)
 
                 # Truncate output if too large
-                output_str = str(result)
-                if len(output_str) > 1000:
-                    output_str = output_str[:1000] + "..."
+                output_str = _output_repr.repr(result)
+                if len(output_str) > _MAX_OUTPUT_CHARS:
+                    output_str = output_str[:_MAX_OUTPUT_CHARS] + "..."
 
                 if span:
                     # Langfuse v3: update() then end()
@@ -94,11 +191,6 @@ def trace_tool(tool_name: str) -> Callable[[F], F]:
                     span.end()
                 logger.exception(f"Error in traced tool {tool_name}: {e}")
                 raise
-            finally:
-                try:
-                    langfuse.flush()
-                except Exception:
-                    pass
 
         return wrapper  # type: ignore[return-value]
 
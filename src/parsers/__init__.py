@@ -2,6 +2,7 @@
 
 from .base_parser import BaseParser, ParseResult
 from .jinja_parser import JinjaParser
+from .parse_cache import ParseCache
 from .python_parser import PythonParser
 from .ruby_parser import RubyParser
 from .yaml_parser import YAMLParser
@@ -9,6 +10,7 @@ from .yaml_parser import YAMLParser
 __all__ = [
     "BaseParser",
     "ParseResult",
+    "ParseCache",
     "YAMLParser",
     "PythonParser",
     "JinjaParser",
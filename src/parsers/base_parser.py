@@ -1,13 +1,18 @@
 """Base parser class for tree-sitter parsers."""
 
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, ClassVar, Iterator, Optional, cast
 
 from tree_sitter import Language, Parser
 from tree_sitter import Node as TSNode
 
+from .parse_cache import ParseCache, content_digest, get_parse_cache
+
 # Import individual language grammars
 try:
     import tree_sitter_python
@@ -29,8 +34,11 @@ try:
 except ImportError:
     tree_sitter_jinja = None
 
+# Metadata of this many recently parsed contents is kept in memory per parser
+_METADATA_MEMO_SIZE = 512
+
 
-@dataclass
+@dataclass(slots=True)
 class ParseResult:
     """Result of parsing a file."""
 
@@ -39,8 +47,16 @@ class ParseResult:
     tree: Optional[Any] = None  # Tree-sitter tree
     root_node: Optional[TSNode] = None
     content: str = ""
+    # Exact UTF-8 bytes given to tree-sitter; node byte offsets index into this
+    source: bytes = field(default=b"", repr=False)
     errors: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Nodes of the parser's COLLECT_NODE_TYPES, gathered during the parse walk
+    nodes_by_type: dict[str, list[TSNode]] = field(default_factory=dict, repr=False)
+    # Structured document for YAML files, loaded once by YAMLParser and shared by
+    # its extractors; holds the exception instead if loading failed
+    yaml_data: Any = field(default=None, init=False, repr=False, compare=False)
+    yaml_loaded: bool = field(default=False, init=False, repr=False, compare=False)
 
     @property
     def is_success(self) -> bool:
@@ -55,6 +71,10 @@ class ParseResult:
 class BaseParser(ABC):
     """Base class for all language parsers."""
 
+    # Node types extract_metadata needs from the whole tree; they are indexed in
+    # the same walk that looks for syntax errors (see nodes_of_type)
+    COLLECT_NODE_TYPES: ClassVar[frozenset[str]] = frozenset()
+
     def __init__(self, language: str):
         """Initialize parser with specific language.
 
@@ -63,6 +83,17 @@ class BaseParser(ABC):
         """
         self.language = language
         self.parser = Parser()
+        # A tree-sitter Parser is not re-entrant: other threads get their own
+        self._local = threading.local()
+        self._local.parser = self.parser
+        # Metadata cache for unchanged files (None unless GRAPHRAG_PARSE_CACHE is set);
+        # subclasses whose options change the metadata extend the namespace
+        self.parse_cache: Optional[ParseCache] = get_parse_cache()
+        self.cache_namespace = language
+        # Recent metadata by content digest (metadata never depends on the path),
+        # so identical files and re-parses of one file skip extraction
+        self._metadata_memo: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._metadata_memo_lock = threading.Lock()
 
         # Map language names to their grammar modules
         language_map = {
@@ -96,11 +127,10 @@ class BaseParser(ABC):
             ParseResult containing the AST and metadata
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            return self.parse_string(content, str(file_path))
-
+            # Read raw bytes once: tree-sitter parses them as-is, and the text
+            # view is decoded from the same buffer instead of re-encoded later
+            source = file_path.read_bytes()
+            content = source.decode("utf-8")
         except Exception as e:
             return ParseResult(
                 file_path=str(file_path),
@@ -108,23 +138,60 @@ class BaseParser(ABC):
                 errors=[f"Failed to read file: {e}"],
             )
 
-    def parse_string(self, content: str, file_path: str = "<string>") -> ParseResult:
+        return self.parse_string(content, str(file_path), source=source)
+
+    def parse_files(
+        self, paths: list[Path], max_workers: Optional[int] = None
+    ) -> list[ParseResult]:
+        """Parse many files concurrently.
+
+        tree-sitter parses in C with the GIL released, so threads overlap the
+        parsing itself as well as file reads. Each worker thread uses its own
+        tree-sitter Parser.
+
+        Args:
+            paths: Files to parse
+            max_workers: Worker threads (defaults to the executor's default)
+
+        Returns:
+            ParseResults in the same order as ``paths``
+        """
+        if len(paths) <= 1:
+            return [self.parse_file(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parse") as pool:
+            return list(pool.map(self.parse_file, paths))
+
+    def _thread_parser(self) -> Parser:
+        """Get the calling thread's tree-sitter parser, creating it on first use."""
+        parser: Optional[Parser] = getattr(self._local, "parser", None)
+        if parser is None:
+            parser = Parser(self.parser.language)
+            self._local.parser = parser
+        return parser
+
+    def parse_string(
+        self, content: str, file_path: str = "<string>", source: Optional[bytes] = None
+    ) -> ParseResult:
         """Parse a string and return the AST.
 
         Args:
             content: Content to parse
             file_path: Optional file path for error reporting
+            source: UTF-8 encoding of ``content`` if the caller already has it
 
         Returns:
             ParseResult containing the AST and metadata
         """
         try:
+            if source is None:
+                source = content.encode("utf-8")
+
             # Parse with tree-sitter
-            tree = self.parser.parse(bytes(content, "utf8"))
+            tree = self._thread_parser().parse(source)
             root_node = tree.root_node
 
-            # Check for syntax errors
-            errors = self._find_syntax_errors(root_node)
+            # Check for syntax errors and index metadata nodes in one walk
+            errors, nodes_by_type = self._single_pass(root_node)
 
             result = ParseResult(
                 file_path=file_path,
@@ -132,11 +199,13 @@ class BaseParser(ABC):
                 tree=tree,
                 root_node=root_node,
                 content=content,
+                source=source,
                 errors=errors,
+                nodes_by_type=nodes_by_type,
             )
 
-            # Extract language-specific metadata
-            result.metadata = self.extract_metadata(result)
+            # Extract language-specific metadata, reusing it for unchanged content
+            result.metadata = self._get_metadata(result, content_digest(source))
 
             return result
 
@@ -148,8 +217,40 @@ class BaseParser(ABC):
                 errors=[f"Parsing failed: {e}"],
             )
 
+    def _get_metadata(self, result: ParseResult, digest: str) -> dict[str, Any]:
+        """Get metadata for a parse result from the memo, the parse cache or extraction.
+
+        Args:
+            result: Parse result with tree and content set
+            digest: ``content_digest`` of the source bytes
+
+        Returns:
+            Metadata dictionary; nested values may be shared with other results
+        """
+        with self._metadata_memo_lock:
+            metadata = self._metadata_memo.get(digest)
+            if metadata is not None:
+                self._metadata_memo.move_to_end(digest)
+                return dict(metadata)
+
+        if self.parse_cache is not None:
+            metadata = self.parse_cache.get(result.file_path, self.cache_namespace, digest)
+        if metadata is None:
+            metadata = self.extract_metadata(result)
+            if self.parse_cache is not None:
+                self.parse_cache.put(result.file_path, self.cache_namespace, digest, metadata)
+
+        with self._metadata_memo_lock:
+            self._metadata_memo[digest] = metadata
+            if len(self._metadata_memo) > _METADATA_MEMO_SIZE:
+                self._metadata_memo.popitem(last=False)
+        return dict(metadata)
+
     def _find_syntax_errors(self, node: TSNode) -> list[str]:
-        """Recursively find syntax errors in the parse tree.
+        """Find syntax errors in the parse tree.
+
+        Tree-sitter flags every node whose subtree contains an error, so clean
+        trees return immediately and only erroneous subtrees are descended.
 
         Args:
             node: Tree-sitter node to check
@@ -157,17 +258,80 @@ class BaseParser(ABC):
         Returns:
             List of error messages
         """
+        if not node.has_error:
+            return []
+
         errors = []
+        cursor = node.walk()
+        descend = True
+        while True:
+            if descend:
+                # A cursor created from a node always points at one
+                current = cast(TSNode, cursor.node)
+                if current.type == "ERROR" or current.is_missing:
+                    errors.append(
+                        f"Syntax error at line {current.start_point[0] + 1}, "
+                        f"column {current.start_point[1] + 1}"
+                    )
+                if current.has_error and cursor.goto_first_child():
+                    continue
+            if cursor.goto_next_sibling():
+                descend = True
+                continue
+            if not cursor.goto_parent():
+                return errors
+            descend = False
+
+    def _single_pass(self, root: TSNode) -> tuple[list[str], dict[str, list[TSNode]]]:
+        """Collect syntax errors and COLLECT_NODE_TYPES nodes in one traversal.
 
-        if node.type == "ERROR" or node.is_missing:
-            errors.append(
-                f"Syntax error at line {node.start_point[0] + 1}, column {node.start_point[1] + 1}"
-            )
+        Args:
+            root: Root node of the parse tree
+
+        Returns:
+            Tuple of (error messages, nodes grouped by type)
+        """
+        wanted = self.COLLECT_NODE_TYPES
+        if not wanted:
+            return self._find_syntax_errors(root), {}
 
-        for child in node.children:
-            errors.extend(self._find_syntax_errors(child))
+        errors = []
+        nodes_by_type: dict[str, list[TSNode]] = {node_type: [] for node_type in wanted}
+        # Same pre-order cursor walk as walk(), inlined: this runs for every node
+        # of every parsed file, and the generator's per-node overhead adds up
+        cursor = root.walk()
+        while True:
+            node = cast(TSNode, cursor.node)
+            node_type = node.type
+            if node_type in wanted:
+                nodes_by_type[node_type].append(node)
+            if node_type == "ERROR" or node.is_missing:
+                errors.append(
+                    f"Syntax error at line {node.start_point[0] + 1}, "
+                    f"column {node.start_point[1] + 1}"
+                )
+            if cursor.goto_first_child():
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return errors, nodes_by_type
+
+    def nodes_of_type(self, parse_result: ParseResult, node_type: str) -> list[TSNode]:
+        """Get all nodes of a type in a parsed file, reusing the parse walk.
 
-        return errors
+        Args:
+            parse_result: Parse result to search
+            node_type: Node type to find
+
+        Returns:
+            List of matching nodes in document order
+        """
+        collected = parse_result.nodes_by_type.get(node_type)
+        if collected is not None:
+            return collected
+        if parse_result.root_node is None:
+            return []
+        return self.find_nodes_by_type(parse_result.root_node, node_type)
 
     @abstractmethod
     def extract_metadata(self, parse_result: ParseResult) -> dict[str, Any]:
@@ -181,30 +345,64 @@ class BaseParser(ABC):
         """
         pass
 
-    def get_node_text(self, node: TSNode, content: str) -> str:
+    def get_node_text(self, node: TSNode, content: str | bytes) -> str:
         """Get text content of a node.
 
+        Node positions are byte offsets, so pass ``ParseResult.source``; a
+        ``str`` is encoded first (slicing it directly breaks on non-ASCII text).
+
         Args:
             node: Tree-sitter node
-            content: Source code content
+            content: Source bytes (or source text)
 
         Returns:
             Text content of the node
         """
-        return content[node.start_byte : node.end_byte]
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return content[node.start_byte : node.end_byte].decode("utf-8", errors="replace")
+
+    def walk(self, root: TSNode) -> Iterator[tuple[TSNode, int]]:
+        """Yield every node under ``root`` (inclusive) in pre-order with its depth.
+
+        Uses a tree-sitter cursor instead of recursion, so deep trees cost no
+        Python stack and children are not materialised as lists.
+
+        Args:
+            root: Node to start from
 
-    def traverse_tree(self, node: TSNode, callback: callable, depth: int = 0) -> None:
+        Yields:
+            ``(node, depth)`` pairs, depth 0 being ``root``
+        """
+        cursor = root.walk()
+        depth = 0
+        descend = True
+        while True:
+            if descend:
+                yield cast(TSNode, cursor.node), depth
+                if cursor.goto_first_child():
+                    depth += 1
+                    continue
+            if cursor.goto_next_sibling():
+                descend = True
+                continue
+            if not cursor.goto_parent():
+                return
+            depth -= 1
+            descend = False
+
+    def traverse_tree(
+        self, node: TSNode, callback: Callable[[TSNode, int], None], depth: int = 0
+    ) -> None:
         """Traverse the AST and call callback on each node.
 
         Args:
             node: Current node
             callback: Function to call on each node (receives node and depth)
-            depth: Current traversal depth
+            depth: Depth of ``node`` itself
         """
-        callback(node, depth)
-
-        for child in node.children:
-            self.traverse_tree(child, callback, depth + 1)
+        for current, offset in self.walk(node):
+            callback(current, depth + offset)
 
     def find_nodes_by_type(self, root: TSNode, node_type: str) -> list[TSNode]:
         """Find all nodes of a specific type in the tree.
@@ -216,14 +414,18 @@ class BaseParser(ABC):
         Returns:
             List of matching nodes
         """
-        results = []
-
-        def collect_nodes(node: TSNode, depth: int) -> None:
+        found = []
+        # Inlined cursor walk (see _single_pass)
+        cursor = root.walk()
+        while True:
+            node = cast(TSNode, cursor.node)
             if node.type == node_type:
-                results.append(node)
-
-        self.traverse_tree(root, collect_nodes)
-        return results
+                found.append(node)
+            if cursor.goto_first_child():
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return found
 
     def get_node_position(self, node: TSNode) -> dict[str, int]:
         """Get position information for a node.
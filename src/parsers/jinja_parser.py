@@ -1,16 +1,50 @@
 """Jinja2 template parser using tree-sitter."""
 
 import re
-from typing import Any
+from typing import Any, cast
 
 from tree_sitter import Node as TSNode
 
 from .base_parser import BaseParser, ParseResult
 
+# Identifiers that are Jinja syntax rather than variable references
+_JINJA_KEYWORDS = frozenset(
+    {"if", "for", "in", "is", "not", "and", "or", "true", "false", "none"}
+)
+
+# Regex fallback, used when tree-sitter produced no tree. One alternation finds
+# every construct in a single pass; the named group that matched says which.
+# {{ var }} and {% include %} consume only their opening, with the rest checked
+# by lookahead, so filters and other tags inside them are still scanned.
+_JINJA_ALL = re.compile(
+    "|".join(
+        [
+            # {{ variable_name }} and {{ variable_name | filter }}
+            r"\{\{\s*(?P<var>[a-zA-Z_][a-zA-Z0-9_.]*)\s*(?=(?:\|[^}]+)?\}\})",
+            # {% for item in var %}
+            r"\{%\s*for\s+\w+\s+in\s+(?P<for>[a-zA-Z_][a-zA-Z0-9_.]*)\s*%\}",
+            # {% if var ... %}
+            r"\{%\s*if\s+(?P<if>[a-zA-Z_][a-zA-Z0-9_.]*)",
+            # | filter_name
+            r"\|\s*(?P<filter>[a-zA-Z_][a-zA-Z0-9_]*)",
+            # {% block block_name %}
+            r"\{%\s*block\s+(?P<block>[a-zA-Z_][a-zA-Z0-9_]*)\s*%\}",
+            # {% include 'template.j2' %}
+            r"\{%\s*include\s+(?=['\"](?P<include>[^'\"]+)['\"]\s*%\})",
+            # {% macro macro_name(...) %}
+            r"\{%\s*macro\s+(?P<macro>[a-zA-Z_][a-zA-Z0-9_]*)",
+        ]
+    )
+)
+
 
 class JinjaParser(BaseParser):
     """Parser for Jinja2 template files using tree-sitter."""
 
+    COLLECT_NODE_TYPES = frozenset(
+        {"identifier", "filter", "block_statement", "include_statement", "macro_statement"}
+    )
+
     def __init__(self):
         """Initialize Jinja2 parser with tree-sitter."""
         super().__init__("jinja2")
@@ -37,77 +71,61 @@ class JinjaParser(BaseParser):
             return self._extract_metadata_regex(parse_result.content)
 
         # Extract using tree-sitter AST
+        source = parse_result.source
         metadata["variables_used"] = self._extract_variables_from_ast(
-            parse_result.root_node, parse_result.content
+            self.nodes_of_type(parse_result, "identifier"), source
         )
         metadata["filters_used"] = self._extract_filters_from_ast(
-            parse_result.root_node, parse_result.content
+            self.nodes_of_type(parse_result, "filter"), source
         )
         metadata["blocks"] = self._extract_blocks_from_ast(
-            parse_result.root_node, parse_result.content
+            self.nodes_of_type(parse_result, "block_statement"), source
         )
         metadata["includes"] = self._extract_includes_from_ast(
-            parse_result.root_node, parse_result.content
+            self.nodes_of_type(parse_result, "include_statement"), source
         )
         metadata["macros"] = self._extract_macros_from_ast(
-            parse_result.root_node, parse_result.content
+            self.nodes_of_type(parse_result, "macro_statement"), source
         )
 
         return metadata
 
-    def _extract_variables_from_ast(self, root: TSNode, content: str) -> list[str]:
+    def _extract_variables_from_ast(self, identifiers: list[TSNode], source: bytes) -> list[str]:
         """Extract variable references from AST.
 
         Args:
-            root: Root AST node
-            content: Template content
+            identifiers: Identifier nodes
+            source: Template source bytes
 
         Returns:
             List of unique variable names
         """
         variables = set()
 
-        # Find all identifier nodes
-        identifiers = self.find_nodes_by_type(root, "identifier")
-
         for node in identifiers:
-            var_name = self.get_node_text(node, content)
+            var_name = self.get_node_text(node, source)
             # Filter out Jinja keywords
-            if var_name not in {
-                "if",
-                "for",
-                "in",
-                "is",
-                "not",
-                "and",
-                "or",
-                "true",
-                "false",
-                "none",
-            }:
+            if var_name not in _JINJA_KEYWORDS:
                 # Get root variable name (before any dots)
-                root_var = var_name.split(".")[0] if "." in var_name else var_name
-                variables.add(root_var)
+                dot = var_name.find(".")
+                variables.add(var_name if dot < 0 else var_name[:dot])
 
-        return sorted(list(variables))
+        return sorted(variables)
 
-    def _extract_filters_from_ast(self, root: TSNode, content: str) -> list[str]:
+    def _extract_filters_from_ast(self, filter_nodes: list[TSNode], source: bytes) -> list[str]:
         """Extract Jinja2 filters from AST.
 
         Args:
-            root: Root AST node
-            content: Template content
+            filter_nodes: Filter nodes
+            source: Template source bytes
 
         Returns:
             List of unique filter names
         """
         filters = set()
 
-        # Find filter nodes (depends on tree-sitter-jinja grammar)
-        filter_nodes = self.find_nodes_by_type(root, "filter")
-
         for node in filter_nodes:
-            filter_name = self.get_node_text(node, content)
+            filter_name = self.get_node_text(node, source)
             # Extract filter name (may need to parse based on actual grammar)
             if "|" in filter_name:
                 parts = filter_name.split("|")
@@ -115,78 +133,69 @@ class JinjaParser(BaseParser):
                     filter_name_clean = part.strip().split("(")[0].split()[0]
                     filters.add(filter_name_clean)
 
-        return sorted(list(filters))
+        return sorted(filters)
 
-    def _extract_blocks_from_ast(self, root: TSNode, content: str) -> list[str]:
+    def _extract_blocks_from_ast(self, block_nodes: list[TSNode], source: bytes) -> list[str]:
         """Extract block definitions from AST.
 
         Args:
-            root: Root AST node
-            content: Template content
+            block_nodes: Block statement nodes
+            source: Template source bytes
 
         Returns:
             List of block names
         """
         blocks = []
 
-        # Find block statement nodes
-        block_nodes = self.find_nodes_by_type(root, "block_statement")
-
         for node in block_nodes:
             # Get block name from children
             for child in node.children:
                 if child.type == "identifier":
-                    block_name = self.get_node_text(child, content)
+                    block_name = self.get_node_text(child, source)
                     blocks.append(block_name)
                     break
 
         return blocks
 
-    def _extract_includes_from_ast(self, root: TSNode, content: str) -> list[str]:
+    def _extract_includes_from_ast(self, include_nodes: list[TSNode], source: bytes) -> list[str]:
         """Extract template includes from AST.
 
         Args:
-            root: Root AST node
-            content: Template content
+            include_nodes: Include statement nodes
+            source: Template source bytes
 
         Returns:
             List of included template paths
         """
         includes = []
 
-        # Find include statement nodes
-        include_nodes = self.find_nodes_by_type(root, "include_statement")
-
         for node in include_nodes:
             # Get the string literal containing the template path
             for child in node.children:
                 if child.type == "string":
-                    include_path = self.get_node_text(child, content).strip("\"'")
+                    include_path = self.get_node_text(child, source).strip("\"'")
                     includes.append(include_path)
                     break
 
         return includes
 
-    def _extract_macros_from_ast(self, root: TSNode, content: str) -> list[str]:
+    def _extract_macros_from_ast(self, macro_nodes: list[TSNode], source: bytes) -> list[str]:
         """Extract macro definitions from AST.
 
         Args:
-            root: Root AST node
-            content: Template content
+            macro_nodes: Macro statement nodes
+            source: Template source bytes
 
         Returns:
             List of macro names
         """
         macros = []
 
-        # Find macro statement nodes
-        macro_nodes = self.find_nodes_by_type(root, "macro_statement")
-
         for node in macro_nodes:
             # Get macro name from children
             for child in node.children:
                 if child.type == "identifier":
-                    macro_name = self.get_node_text(child, content)
+                    macro_name = self.get_node_text(child, source)
                     macros.append(macro_name)
                     break
 
@@ -201,116 +210,32 @@ class JinjaParser(BaseParser):
         Returns:
             Dictionary with template metadata
         """
-        metadata = {
-            "variables_used": self._extract_variables_regex(content),
-            "filters_used": self._extract_filters_regex(content),
-            "blocks": self._extract_blocks_regex(content),
-            "includes": self._extract_includes_regex(content),
-            "macros": self._extract_macros_regex(content),
+        variables: set[str] = set()
+        filters: set[str] = set()
+        blocks: list[str] = []
+        includes: list[str] = []
+        macros: list[str] = []
+
+        for match in _JINJA_ALL.finditer(content):
+            # Every alternative has exactly one named group
+            kind = cast(str, match.lastgroup)
+            value = match[kind]
+            if kind in ("var", "for", "if"):
+                dot = value.find(".")
+                variables.add(value if dot < 0 else value[:dot])  # Get root variable
+            elif kind == "filter":
+                filters.add(value)
+            elif kind == "block":
+                blocks.append(value)
+            elif kind == "include":
+                includes.append(value)
+            else:
+                macros.append(value)
+
+        return {
+            "variables_used": sorted(variables),
+            "filters_used": sorted(filters),
+            "blocks": blocks,
+            "includes": includes,
+            "macros": macros,
         }
-        return metadata
-
-    def _extract_variables_regex(self, content: str) -> list[str]:
-        """Extract variable references using regex.
-
-        Args:
-            content: Template content
-
-        Returns:
-            List of unique variable names
-        """
-        # Match {{ variable_name }} and {% ... variable_name ... %}
-        var_pattern = r"\{\{[\s]*([a-zA-Z_][a-zA-Z0-9_.]*)[\s]*(?:\|[^}]+)?\}\}"
-        for_pattern = r"\{%\s*for\s+\w+\s+in\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s*%\}"
-        if_pattern = r"\{%\s*if\s+([a-zA-Z_][a-zA-Z0-9_.]*)"
-
-        variables = set()
-
-        # Extract from {{ var }}
-        for match in re.finditer(var_pattern, content):
-            var_name = match.group(1).split(".")[0]  # Get root variable
-            variables.add(var_name)
-
-        # Extract from {% for item in var %}
-        for match in re.finditer(for_pattern, content):
-            var_name = match.group(1).split(".")[0]
-            variables.add(var_name)
-
-        # Extract from {% if var %}
-        for match in re.finditer(if_pattern, content):
-            var_name = match.group(1).split(".")[0]
-            variables.add(var_name)
-
-        return sorted(list(variables))
-
-    def _extract_filters_regex(self, content: str) -> list[str]:
-        """Extract Jinja2 filters using regex.
-
-        Args:
-            content: Template content
-
-        Returns:
-            List of unique filter names
-        """
-        # Match | filter_name
-        filter_pattern = r"\|\s*([a-zA-Z_][a-zA-Z0-9_]*)"
-
-        filters = set()
-        for match in re.finditer(filter_pattern, content):
-            filters.add(match.group(1))
-
-        return sorted(list(filters))
-
-    def _extract_blocks_regex(self, content: str) -> list[str]:
-        """Extract block definitions using regex.
-
-        Args:
-            content: Template content
-
-        Returns:
-            List of block names
-        """
-        # Match {% block block_name %}
-        block_pattern = r"\{%\s*block\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*%\}"
-
-        blocks = []
-        for match in re.finditer(block_pattern, content):
-            blocks.append(match.group(1))
-
-        return blocks
-
-    def _extract_includes_regex(self, content: str) -> list[str]:
-        """Extract template includes using regex.
-
-        Args:
-            content: Template content
-
-        Returns:
-            List of included template paths
-        """
-        # Match {% include 'template.j2' %}
-        include_pattern = r"\{%\s*include\s+['\"]([^'\"]+)['\"]\s*%\}"
-
-        includes = []
-        for match in re.finditer(include_pattern, content):
-            includes.append(match.group(1))
-
-        return includes
-
-    def _extract_macros_regex(self, content: str) -> list[str]:
-        """Extract macro definitions using regex.
-
-        Args:
-            content: Template content
-
-        Returns:
-            List of macro names
-        """
-        # Match {% macro macro_name(...) %}
-        macro_pattern = r"\{%\s*macro\s+([a-zA-Z_][a-zA-Z0-9_]*)"
-
-        macros = []
-        for match in re.finditer(macro_pattern, content):
-            macros.append(match.group(1))
-
-        return macros
@@ -0,0 +1,141 @@
+"""Persistent cache of extracted parser metadata, keyed by file content.
+
+Re-indexing a repository re-parses every file, although most have not changed
+since the last run. With ``GRAPHRAG_PARSE_CACHE=1`` parsers keep the metadata
+they extract in a SQLite database and reuse it whenever a file's bytes are
+unchanged. Tree-sitter still parses each file (ParseResult always carries a
+tree); only the metadata extraction is skipped.
+
+Each (path, parser) pair keeps one row, for the file's latest content, so the
+database does not grow with every edit. It holds pickles written by this
+module and therefore lives in the user cache directory
+(``src.config.user_cache_dir``) rather than the working directory, so a cloned
+repository can never supply one; GRAPHRAG_PARSE_CACHE_PATH should only ever
+point at a trusted location.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from loguru import logger
+
+from ..config import user_cache_dir
+
+# Set to 1/true/yes to enable the cache; GRAPHRAG_PARSE_CACHE_PATH moves the file
+_ENABLED_ENV = "GRAPHRAG_PARSE_CACHE"
+_PATH_ENV = "GRAPHRAG_PARSE_CACHE_PATH"
+_DEFAULT_NAME = "parse_cache.sqlite3"
+
+# Bump when the metadata any parser produces changes shape; older entries are dropped
+CACHE_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    path TEXT NOT NULL,
+    parser TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    PRIMARY KEY (path, parser)
+)
+"""
+
+
+def content_digest(source: bytes) -> str:
+    """Hash file bytes for use as a cache key (blake2b is faster than sha256)."""
+    return hashlib.blake2b(source, digest_size=16).hexdigest()
+
+
+class ParseCache:
+    """SQLite-backed metadata cache, safe to share between parser threads.
+
+    Failures to read or write the database are logged and ignored: a broken
+    cache only means metadata is extracted again.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize the cache.
+
+        Args:
+            path: Database file, created on first use
+        """
+        self.path = Path(path)
+        # One connection per thread; sqlite3 connections cannot be shared
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            # WAL lets parser threads and concurrent runs read while one writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                if conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+                    conn.execute("DROP TABLE IF EXISTS cache")
+                    conn.execute(f"PRAGMA user_version={CACHE_VERSION}")
+                conn.execute(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, path: str, parser: str, digest: str) -> Optional[dict[str, Any]]:
+        """Return cached metadata for a file's content, or None on a miss.
+
+        Args:
+            path: File path
+            parser: Parser cache namespace (``BaseParser.cache_namespace``)
+            digest: ``content_digest`` of the file bytes
+
+        Returns:
+            Metadata, or None if not cached
+        """
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT metadata FROM cache WHERE path = ? AND parser = ? AND digest = ?",
+                    (path, parser, digest),
+                )
+                .fetchone()
+            )
+            if row is None:
+                return None
+            metadata: dict[str, Any] = pickle.loads(row[0])
+            return metadata
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError) as e:
+            logger.debug(f"Parse cache read failed for {path}: {e}")
+            return None
+
+    def put(self, path: str, parser: str, digest: str, metadata: dict[str, Any]) -> None:
+        """Store metadata for a file's content, replacing its previous version."""
+        try:
+            blob = pickle.dumps(metadata, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (path, parser, digest, metadata)"
+                    " VALUES (?, ?, ?, ?)",
+                    (path, parser, digest, blob),
+                )
+        except (sqlite3.Error, pickle.PicklingError) as e:
+            logger.debug(f"Parse cache write failed for {path}: {e}")
+
+
+_parse_cache: Optional[ParseCache] = None
+_parse_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> Optional[ParseCache]:
+    """Get the shared parse cache, or None unless GRAPHRAG_PARSE_CACHE is set."""
+    global _parse_cache
+    if os.environ.get(_ENABLED_ENV, "").lower() not in ("1", "true", "yes"):
+        return None
+    path = Path(os.environ.get(_PATH_ENV) or user_cache_dir() / _DEFAULT_NAME)
+    with _parse_cache_lock:
+        if _parse_cache is None or _parse_cache.path != path:
+            _parse_cache = ParseCache(path)
+        return _parse_cache
@@ -1,5 +1,6 @@
 """Python parser for dynamic inventory scripts."""
 
+from bisect import bisect_left
 from typing import Any
 
 from tree_sitter import Node as TSNode
@@ -10,6 +11,10 @@ from .base_parser import BaseParser, ParseResult
 class PythonParser(BaseParser):
     """Parser for Python files (mainly dynamic inventory scripts)."""
 
+    COLLECT_NODE_TYPES = frozenset(
+        {"function_definition", "class_definition", "import_statement", "import_from_statement"}
+    )
+
     def __init__(self):
         """Initialize Python parser."""
         super().__init__("python")
@@ -33,36 +38,39 @@ class PythonParser(BaseParser):
         if not parse_result.root_node:
             return metadata
 
-        # Extract functions
-        function_nodes = self.find_nodes_by_type(parse_result.root_node, "function_definition")
-        metadata["functions"] = [
-            self._extract_function_info(node, parse_result.content) for node in function_nodes
+        # Extract functions (including methods), in source order
+        function_nodes = self.nodes_of_type(parse_result, "function_definition")
+        functions = [
+            self._extract_function_info(node, parse_result.source) for node in function_nodes
         ]
+        metadata["functions"] = functions
 
-        # Extract classes
-        class_nodes = self.find_nodes_by_type(parse_result.root_node, "class_definition")
+        # Extract classes; their methods are taken from the functions above
+        function_starts = [node.start_byte for node in function_nodes]
+        class_nodes = self.nodes_of_type(parse_result, "class_definition")
         metadata["classes"] = [
-            self._extract_class_info(node, parse_result.content) for node in class_nodes
+            self._extract_class_info(node, parse_result.source, function_starts, functions)
+            for node in class_nodes
         ]
 
         # Extract imports
-        import_nodes = self.find_nodes_by_type(parse_result.root_node, "import_statement")
-        import_from_nodes = self.find_nodes_by_type(parse_result.root_node, "import_from_statement")
+        import_nodes = self.nodes_of_type(parse_result, "import_statement")
+        import_from_nodes = self.nodes_of_type(parse_result, "import_from_statement")
         metadata["imports"] = [
-            self.get_node_text(node, parse_result.content) for node in import_nodes
-        ] + [self.get_node_text(node, parse_result.content) for node in import_from_nodes]
+            self.get_node_text(node, parse_result.source) for node in import_nodes
+        ] + [self.get_node_text(node, parse_result.source) for node in import_from_nodes]
 
         # Check if it's likely a dynamic inventory script
         metadata["is_inventory_script"] = self._is_inventory_script(metadata)
 
         return metadata
 
-    def _extract_function_info(self, node: TSNode, content: str) -> dict[str, Any]:
+    def _extract_function_info(self, node: TSNode, source: bytes) -> dict[str, Any]:
         """Extract function information.
 
         Args:
             node: Function definition node
-            content: Source code
+            source: Source bytes
 
         Returns:
             Dictionary with function info
@@ -72,21 +80,29 @@ class PythonParser(BaseParser):
         # Get function name
         name_node = node.child_by_field_name("name")
         if name_node:
-            func_info["name"] = self.get_node_text(name_node, content)
+            func_info["name"] = self.get_node_text(name_node, source)
 
         # Get parameters
         params_node = node.child_by_field_name("parameters")
         if params_node:
-            func_info["args"] = self.get_node_text(params_node, content)
+            func_info["args"] = self.get_node_text(params_node, source)
 
         return func_info
 
-    def _extract_class_info(self, node: TSNode, content: str) -> dict[str, Any]:
+    def _extract_class_info(
+        self,
+        node: TSNode,
+        source: bytes,
+        function_starts: list[int],
+        functions: list[dict[str, Any]],
+    ) -> dict[str, Any]:
         """Extract class information.
 
         Args:
             node: Class definition node
-            content: Source code
+            source: Source bytes
+            function_starts: Start byte of every function definition in the file, ascending
+            functions: Function info for each entry of ``function_starts``
 
         Returns:
             Dictionary with class info
@@ -101,20 +117,20 @@ class PythonParser(BaseParser):
         # Get class name
         name_node = node.child_by_field_name("name")
         if name_node:
-            class_info["name"] = self.get_node_text(name_node, content)
+            class_info["name"] = self.get_node_text(name_node, source)
 
         # Get base classes
         superclasses_node = node.child_by_field_name("superclasses")
         if superclasses_node:
-            class_info["bases"] = self.get_node_text(superclasses_node, content)
+            class_info["bases"] = self.get_node_text(superclasses_node, source)
 
-        # Get methods
+        # Get methods: every function definition inside the body. Definitions
+        # nest, so those are exactly the ones starting within the body's span.
         body_node = node.child_by_field_name("body")
         if body_node:
-            method_nodes = self.find_nodes_by_type(body_node, "function_definition")
-            class_info["methods"] = [
-                self._extract_function_info(method, content) for method in method_nodes
-            ]
+            first = bisect_left(function_starts, body_node.start_byte)
+            last = bisect_left(function_starts, body_node.end_byte, lo=first)
+            class_info["methods"] = functions[first:last]
 
         return class_info
 
@@ -1,9 +1,28 @@
 """Ruby parser for Vagrantfiles."""
 
+import re
 from typing import Any
 
 from .base_parser import BaseParser, ParseResult
 
+# Every Vagrantfile construct we read, found in one pass; the named group that
+# matched says which (see _scan_vagrantfile)
+_VAGRANT_ALL = re.compile(
+    "|".join(
+        [
+            r'VAGRANTFILE_API_VERSION\s*=\s*"(?P<api_version>\d+)"',
+            r'config\.vm\.box\s*=\s*["\'](?P<box>[^"\']+)["\']',
+            r'config\.vm\.hostname\s*=\s*["\'](?P<hostname>[^"\']+)["\']',
+            r'config\.vm\.network\s+["\'](?P<net_type>\w+)["\'],?'
+            r'\s*ip:\s*["\'](?P<net_ip>[^"\']+)["\']',
+            r'config\.vm\.define\s+["\'](?P<vm_define>\w+)["\']',
+            r'config\.vm\.provision\s+["\']ansible["\']\s+do\s+\|(?P<ansible_prov>\w+)\|',
+            r'config\.vm\.provision\s+["\']shell["\']\s*,?\s*(?P<shell_prov>inline):',
+            r'ansible\.playbook\s*=\s*["\'](?P<playbook>[^"\']+)["\']',
+        ]
+    )
+)
+
 
 class RubyParser(BaseParser):
     """Parser for Ruby files (mainly Vagrantfiles)."""
@@ -35,95 +54,54 @@ class RubyParser(BaseParser):
         content = parse_result.content
         if "Vagrant.configure" in content:
             metadata["is_vagrantfile"] = True
-            metadata["vagrant_config"] = self._extract_vagrant_config(content)
-            metadata["vms"] = self._extract_vm_configs(content)
-            metadata["provisioners"] = self._extract_provisioners(content)
+            (
+                metadata["vagrant_config"],
+                metadata["vms"],
+                metadata["provisioners"],
+            ) = self._scan_vagrantfile(content)
 
         return metadata
 
-    def _extract_vagrant_config(self, content: str) -> dict[str, Any]:
-        """Extract Vagrant configuration from Vagrantfile.
+    def _scan_vagrantfile(
+        self, content: str
+    ) -> tuple[dict[str, Any], list[dict[str, Any]], list[dict[str, Any]]]:
+        """Extract Vagrant config, VMs and provisioners in one pass over the file.
 
         Args:
             content: Vagrantfile content
 
         Returns:
-            Dictionary with Vagrant config
+            Tuple of (Vagrant config, VM configurations, provisioners)
         """
-        import re
-
-        config = {}
-
-        # Extract API version
-        api_version_match = re.search(r'VAGRANTFILE_API_VERSION\s*=\s*"(\d+)"', content)
-        if api_version_match:
-            config["api_version"] = api_version_match.group(1)
-
-        # Extract box
-        box_match = re.search(r'config\.vm\.box\s*=\s*["\']([^"\']+)["\']', content)
-        if box_match:
-            config["box"] = box_match.group(1)
-
-        # Extract hostname
-        hostname_match = re.search(r'config\.vm\.hostname\s*=\s*["\']([^"\']+)["\']', content)
-        if hostname_match:
-            config["hostname"] = hostname_match.group(1)
-
-        # Extract network config
-        network_matches = re.finditer(
-            r'config\.vm\.network\s+["\'](\w+)["\'],?\s*ip:\s*["\']([^"\']+)["\']', content
-        )
+        # Single-valued settings keep their first occurrence
+        first: dict[str, str] = {}
         networks = []
-        for match in network_matches:
-            networks.append({"type": match.group(1), "ip": match.group(2)})
+        vms = []
+        has_ansible = has_shell = False
+
+        for match in _VAGRANT_ALL.finditer(content):
+            kind = match.lastgroup
+            if kind == "net_ip":
+                networks.append({"type": match["net_type"], "ip": match["net_ip"]})
+            elif kind == "vm_define":
+                vms.append({"name": match["vm_define"]})
+            elif kind == "ansible_prov":
+                has_ansible = True
+            elif kind == "shell_prov":
+                has_shell = True
+            elif kind is not None and kind not in first:
+                first[kind] = match[kind]
+
+        config: dict[str, Any] = {
+            key: first[key] for key in ("api_version", "box", "hostname") if key in first
+        }
         if networks:
             config["networks"] = networks
 
-        return config
-
-    def _extract_vm_configs(self, content: str) -> list[dict[str, Any]]:
-        """Extract VM configurations from Vagrantfile.
-
-        Args:
-            content: Vagrantfile content
-
-        Returns:
-            List of VM configurations
-        """
-        import re
-
-        vms = []
-
-        # Match config.vm.define blocks
-        vm_define_pattern = r'config\.vm\.define\s+["\'](\w+)["\']'
-        for match in re.finditer(vm_define_pattern, content):
-            vms.append({"name": match.group(1)})
-
-        return vms
-
-    def _extract_provisioners(self, content: str) -> list[dict[str, Any]]:
-        """Extract provisioner configurations.
-
-        Args:
-            content: Vagrantfile content
-
-        Returns:
-            List of provisioners
-        """
-        import re
-
-        provisioners = []
-
-        # Match Ansible provisioner
-        ansible_pattern = r'config\.vm\.provision\s+["\']ansible["\']\s+do\s+\|\w+\|'
-        if re.search(ansible_pattern, content):
-            playbook_match = re.search(r'ansible\.playbook\s*=\s*["\']([^"\']+)["\']', content)
-            if playbook_match:
-                provisioners.append({"type": "ansible", "playbook": playbook_match.group(1)})
-
-        # Match shell provisioner
-        shell_pattern = r'config\.vm\.provision\s+["\']shell["\']\s*,?\s*inline:'
-        if re.search(shell_pattern, content):
+        provisioners: list[dict[str, Any]] = []
+        if has_ansible and "playbook" in first:
+            provisioners.append({"type": "ansible", "playbook": first["playbook"]})
+        if has_shell:
             provisioners.append({"type": "shell", "inline": True})
 
-        return provisioners
+        return config, vms, provisioners
@@ -1,18 +1,78 @@
 """YAML parser with Ansible-specific extensions."""
 
-from typing import Any
+from itertools import chain
+from typing import Any, Iterator, Optional
 
 import yaml
 
 from .base_parser import BaseParser, ParseResult
 
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YAMLLoader  # type: ignore[assignment]
+
+# Keys of a play; a YAML list is a playbook when its first item has one of them
+_PLAY_KEYS = frozenset({"hosts", "tasks", "roles", "plays"})
+
+# Task keys that are Ansible directives rather than the module being invoked
+_TASK_KEYWORDS = frozenset(
+    {
+        "name",
+        "when",
+        "with_items",
+        "loop",
+        "register",
+        "notify",
+        "tags",
+        "become",
+        "become_user",
+        "changed_when",
+        "failed_when",
+        "ignore_errors",
+        "delegate_to",
+        "vars",
+    }
+)
+
 
 class YAMLParser(BaseParser):
     """Parser for YAML files, with special handling for Ansible structures."""
 
-    def __init__(self):
-        """Initialize YAML parser."""
+    def __init__(self, deep: bool = True):
+        """Initialize YAML parser.
+
+        Args:
+            deep: Include per-file listings (vars file ``var_names``) in metadata;
+                without it only classification flags and counts are produced
+        """
         super().__init__("yaml")
+        self.deep = deep
+        if not deep:
+            self.cache_namespace = "yaml:shallow"
+
+    def _get_yaml(self, parse_result: ParseResult) -> Any:
+        """Load the file with PyYAML, at most once per parse result.
+
+        Args:
+            parse_result: Parse result
+
+        Returns:
+            Loaded YAML document
+
+        Raises:
+            Exception: Whatever loading raised, on every call
+        """
+        if not parse_result.yaml_loaded:
+            try:
+                parse_result.yaml_data = yaml.load(parse_result.content, Loader=_YAMLLoader)
+            except Exception as e:
+                parse_result.yaml_data = e
+            parse_result.yaml_loaded = True
+
+        if isinstance(parse_result.yaml_data, Exception):
+            raise parse_result.yaml_data
+        return parse_result.yaml_data
 
     def extract_metadata(self, parse_result: ParseResult) -> dict[str, Any]:
         """Extract metadata from YAML file.
@@ -36,15 +96,78 @@ class YAMLParser(BaseParser):
         if not parse_result.root_node:
             return metadata
 
+        # Most YAML lists are task or handler files rather than playbooks; tell
+        # them apart from the first events so only documents that contribute
+        # metadata are loaded here
+        if self._classify_quick(parse_result.content) is not None:
+            return metadata
+
         # Also parse with PyYAML to get structured data
         try:
-            yaml_data = yaml.safe_load(parse_result.content)
+            yaml_data = self._get_yaml(parse_result)
             metadata.update(self._analyze_yaml_structure(yaml_data))
         except Exception:
             pass  # Tree-sitter parsing already succeeded, YAML errors are non-critical
 
         return metadata
 
+    def _classify_quick(self, content: str) -> Optional[dict[str, Any]]:
+        """Classify a document from the start of its event stream, if possible.
+
+        Reads events only until the outcome of ``_analyze_yaml_structure`` is
+        known without loading: scalars, empty documents and lists whose first
+        item is not a play add no metadata. Documents that do (playbooks and
+        mappings) still need the full load.
+
+        Args:
+            content: YAML content
+
+        Returns:
+            Structure metadata (always empty) if settled, or None if the
+            document must be loaded
+        """
+        try:
+            events = yaml.parse(content, Loader=_YAMLLoader)
+            event = next(events)  # StreamStartEvent
+            event = next(events)
+            if isinstance(event, yaml.DocumentStartEvent):
+                event = next(events)
+            if isinstance(event, yaml.MappingStartEvent):
+                return None
+            if not isinstance(event, yaml.SequenceStartEvent):
+                return {}
+
+            event = next(events)
+            if isinstance(event, yaml.AliasEvent):
+                return None
+            if not isinstance(event, yaml.MappingStartEvent):
+                return {}
+
+            # Scan the first item's keys, skipping over their values
+            while True:
+                event = next(events)
+                if isinstance(event, yaml.MappingEndEvent):
+                    return {}
+                # Complex keys and merge keys could bring play keys in
+                if not isinstance(event, yaml.ScalarEvent) or event.value == "<<":
+                    return None
+                if event.value in _PLAY_KEYS:
+                    return None
+                depth = 0
+                while True:
+                    event = next(events)
+                    if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                        depth += 1
+                    elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                        depth -= 1
+                    if depth == 0:
+                        break
+        except yaml.YAMLError:
+            # Loading would fail the same way
+            return {}
+        except StopIteration:
+            return None
+
     def _analyze_yaml_structure(self, data: Any) -> dict[str, Any]:
         """Analyze YAML structure to determine file type and contents.
 
@@ -66,14 +189,14 @@ class YAMLParser(BaseParser):
                 first_item = data[0]
 
                 # Playbook indicators
-                if any(key in first_item for key in ["hosts", "tasks", "roles", "plays"]):
+                if not _PLAY_KEYS.isdisjoint(first_item):
                     metadata["is_playbook"] = True
                     metadata["play_count"] = len(data)
 
                     # Count tasks and roles across all plays
                     total_tasks = 0
                     total_handlers = 0
-                    roles = []
+                    role_iters = []
 
                     for play in data:
                         if not isinstance(play, dict):
@@ -89,50 +212,47 @@ class YAMLParser(BaseParser):
 
                         if "roles" in play:
                             metadata["has_roles"] = True
-                            roles.extend(self._extract_role_names(play["roles"]))
+                            role_iters.append(self._iter_role_names(play["roles"]))
 
                     metadata["task_count"] = total_tasks
                     metadata["handler_count"] = total_handlers
-                    metadata["role_names"] = list(set(roles))
+                    metadata["role_names"] = list(dict.fromkeys(chain.from_iterable(role_iters)))
 
         # Check if it's a vars file, requirements file, or other structure
         elif isinstance(data, dict):
             # requirements.yml (Galaxy roles)
-            if "roles" in data or (isinstance(data, dict) and "name" in data and "src" in data):
+            if "roles" in data or ("name" in data and "src" in data):
                 metadata["is_requirements"] = True
 
             # vars file
             else:
                 metadata["is_vars_file"] = True
-                metadata["var_count"] = len(data.keys())
-                metadata["var_names"] = list(data.keys())
+                metadata["var_count"] = len(data)
+                if self.deep:
+                    metadata["var_names"] = list(data)
 
         return metadata
 
-    def _extract_role_names(self, roles: Any) -> list[str]:
-        """Extract role names from roles section.
+    def _iter_role_names(self, roles: Any) -> Iterator[str]:
+        """Iterate over role names in a roles section.
 
         Args:
             roles: Roles data (can be list of strings or dicts)
 
-        Returns:
-            List of role names
+        Yields:
+            Role names
         """
-        role_names = []
-
         if not isinstance(roles, list):
-            return role_names
+            return
 
         for role in roles:
             if isinstance(role, str):
-                role_names.append(role)
+                yield role
             elif isinstance(role, dict):
                 if "role" in role:
-                    role_names.append(role["role"])
+                    yield role["role"]
                 elif "name" in role:
-                    role_names.append(role["name"])
-
-        return role_names
+                    yield role["name"]
 
     def extract_playbook_structure(self, parse_result: ParseResult) -> list[dict[str, Any]]:
         """Extract detailed playbook structure.
@@ -144,7 +264,7 @@ class YAMLParser(BaseParser):
             List of plays with their structure
         """
         try:
-            yaml_data = yaml.safe_load(parse_result.content)
+            yaml_data = self._get_yaml(parse_result)
 
             if not isinstance(yaml_data, list):
                 return []
@@ -166,21 +286,11 @@ class YAMLParser(BaseParser):
                     "roles": [],
                 }
 
-                # Extract tasks
-                if "tasks" in play_data and isinstance(play_data["tasks"], list):
-                    play["tasks"] = self._extract_tasks(play_data["tasks"])
-
-                # Extract pre_tasks
-                if "pre_tasks" in play_data and isinstance(play_data["pre_tasks"], list):
-                    play["pre_tasks"] = self._extract_tasks(play_data["pre_tasks"])
-
-                # Extract post_tasks
-                if "post_tasks" in play_data and isinstance(play_data["post_tasks"], list):
-                    play["post_tasks"] = self._extract_tasks(play_data["post_tasks"])
-
-                # Extract handlers
-                if "handlers" in play_data and isinstance(play_data["handlers"], list):
-                    play["handlers"] = self._extract_tasks(play_data["handlers"])
+                # Task lists: tasks, pre_tasks, post_tasks and handlers
+                for key in ("tasks", "pre_tasks", "post_tasks", "handlers"):
+                    value = play_data.get(key)
+                    if isinstance(value, list):
+                        play[key] = self._extract_tasks(value)
 
                 # Extract roles
                 if "roles" in play_data:
@@ -208,32 +318,15 @@ class YAMLParser(BaseParser):
             if not isinstance(task_data, dict):
                 continue
 
-            # Find the module name (the key that's not a standard Ansible keyword)
-            module_name = None
-            module_args = None
-
-            ansible_keywords = {
-                "name",
-                "when",
-                "with_items",
-                "loop",
-                "register",
-                "notify",
-                "tags",
-                "become",
-                "become_user",
-                "changed_when",
-                "failed_when",
-                "ignore_errors",
-                "delegate_to",
-                "vars",
-            }
-
-            for key, value in task_data.items():
-                if key not in ansible_keywords:
-                    module_name = key
-                    module_args = value
-                    break
+            # Find the module name (the first key that's not a standard Ansible keyword).
+            # The key-view difference runs in C; only when it leaves several
+            # candidates is the task scanned again to keep the first in file order.
+            module_keys = task_data.keys() - _TASK_KEYWORDS
+            if len(module_keys) == 1:
+                module_name = next(iter(module_keys))
+            else:
+                module_name = next((key for key in task_data if key in module_keys), None)
+            module_args = task_data[module_name] if module_name is not None else None
 
             task = {
                 "name": task_data.get("name", f"<unnamed {module_name}>"),
@@ -287,7 +380,7 @@ class YAMLParser(BaseParser):
             Dictionary of variables
         """
         try:
-            yaml_data = yaml.safe_load(parse_result.content)
+            yaml_data = self._get_yaml(parse_result)
 
             if isinstance(yaml_data, dict):
                 return yaml_data
@@ -307,7 +400,7 @@ class YAMLParser(BaseParser):
             List of role requirements
         """
         try:
-            yaml_data = yaml.safe_load(parse_result.content)
+            yaml_data = self._get_yaml(parse_result)
 
             if not isinstance(yaml_data, dict):
                 return []
@@ -5,19 +5,31 @@ import pytest
 from src.agents import GraphRAGAgent
 
 
-@pytest.fixture
-def mock_agent_deps():
+@pytest.fixture(scope="module")
+def _patched_agent_deps():
+    # Patch once per module; mock_agent_deps resets the mocks for each test
     with (
         patch("src.agents.graphrag_agent.OpenAILike") as mock_llm_cls,
         patch("src.agents.graphrag_agent.GraphRAGIndex") as mock_index_cls,
     ):
-        mock_llm = AsyncMock()
+        # spec_set: only what the agent uses exists, nothing is auto-created
+        mock_llm = MagicMock(spec_set=["achat"])
+        mock_llm.achat = AsyncMock()
         mock_llm_cls.return_value = mock_llm
 
-        mock_index = MagicMock()
+        mock_index = MagicMock(spec_set=["query", "cypher_query"])
         mock_index_cls.return_value = mock_index
 
-        yield mock_llm, mock_index
+        yield mock_llm_cls, mock_index_cls
+
+
+@pytest.fixture
+def mock_agent_deps(_patched_agent_deps):
+    mock_llm_cls, mock_index_cls = _patched_agent_deps
+    for mock_cls in (mock_llm_cls, mock_index_cls):
+        mock_cls.reset_mock()
+        mock_cls.return_value.reset_mock(return_value=True, side_effect=True)
+    return mock_llm_cls.return_value, mock_index_cls.return_value
 
 
 @pytest.mark.asyncio
@@ -1,5 +1,3 @@
-import time
-
 import pytest
 
 from src.mcp.utils import CircuitBreaker, CircuitOpenError, CircuitState, with_circuit_breaker
@@ -21,8 +19,10 @@ def test_circuit_opens_after_threshold():
 
 
 def test_circuit_recovers():
-    # Use very short timeout for testing
-    breaker = CircuitBreaker(name="test_recovery", failure_threshold=3, recovery_timeout=0.1)
+    now = [0.0]
+    breaker = CircuitBreaker(
+        name="test_recovery", failure_threshold=3, recovery_timeout=0.1, time_fn=lambda: now[0]
+    )
 
     # Open the circuit
     for _ in range(3):
@@ -31,8 +31,8 @@ def test_circuit_recovers():
     assert breaker.state == CircuitState.OPEN
     assert not breaker.allow_request()
 
-    # Wait for recovery timeout
-    time.sleep(0.2)
+    # Pass the recovery timeout
+    now[0] += 0.2
 
     # Should transition to HALF_OPEN
     assert breaker.state == CircuitState.HALF_OPEN
@@ -91,3 +91,60 @@ async def test_decorator_suggests_tools():
     assert "tool1" in msg
     assert "tool2" in msg
     assert "Service temporarily unavailable" in msg
+
+
+def test_half_open_admits_single_probe():
+    now = [0.0]
+    breaker = CircuitBreaker(
+        name="test_probe", failure_threshold=1, recovery_timeout=0.1, time_fn=lambda: now[0]
+    )
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    now[0] += 0.2
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    # Failed probe re-opens the circuit
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(name="test_reset", failure_threshold=3)
+
+    breaker.record_success()  # Healthy fast path
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_only_probe_holder_releases_slot():
+    now = [0.0]
+    breaker = CircuitBreaker(
+        name="test_probe_owner", failure_threshold=1, recovery_timeout=0.1, time_fn=lambda: now[0]
+    )
+    early = breaker.admit()  # Admitted while CLOSED
+    assert early == 0
+
+    breaker.record_failure()  # Another call fails and opens the circuit
+    now[0] += 0.2
+
+    probe = breaker.admit()
+    assert probe
+    assert not breaker.allow_request()
+
+    # The early call is cancelled: it never held the probe slot
+    breaker.release_probe(early)
+    assert not breaker.allow_request()
+
+    # The probe itself is cancelled: the next caller may probe
+    breaker.release_probe(probe)
+    assert breaker.allow_request()
@@ -1,14 +1,21 @@
+import pytest
+
 from src.extractors.generic import GenericExtractor
 
 
-def test_generic_extractor(tmp_path):
-    d = tmp_path / "subdir"
+@pytest.fixture(scope="module")
+def generic_repo_tree(tmp_path_factory):
+    """Directory tree shared by the read-only extractor tests."""
+    root = tmp_path_factory.mktemp("generic_repo")
+    d = root / "subdir"
     d.mkdir()
-    f = d / "data.txt"
-    f.write_text("content")
+    (d / "data.txt").write_text("content")
+    return root
+
 
+def test_generic_extractor(generic_repo_tree):
     extractor = GenericExtractor()
-    nodes = list(extractor.extract(tmp_path))
+    nodes = list(extractor.extract(generic_repo_tree))
 
     types = [n["type"] for n in nodes]
     assert "Directory" in types
@@ -18,14 +25,24 @@ def test_generic_extractor(tmp_path):
     assert f_node["properties"]["name"] == "data.txt"
 
 
-def test_generic_relationships(tmp_path):
-    d = tmp_path / "subdir"
-    d.mkdir()
-    f = d / "data.txt"
-    f.write_text("content")
-
+def test_generic_relationships(generic_repo_tree):
     extractor = GenericExtractor()
-    rels = list(extractor.extract_relationships(tmp_path))
+    rels = list(extractor.extract_relationships(generic_repo_tree))
 
     assert len(rels) > 0
     assert rels[0]["type"] == "CONTAINS"
+
+
+def test_generic_skips_ignored_dirs_and_binaries(tmp_path):
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "index.js").write_text("x")
+    (tmp_path / "lib").mkdir()
+    (tmp_path / "lib" / "native.so").write_bytes(b"\0")
+    (tmp_path / "lib" / "util.py").write_text("x = 1\n")
+
+    extractor = GenericExtractor()
+    paths = {n["properties"]["path"] for n in extractor.extract(tmp_path)}
+    targets = {r["target"]["properties"]["path"] for r in extractor.extract_relationships(tmp_path)}
+
+    assert paths == {"lib", "lib/util.py"}
+    assert targets == {"lib/util.py"}
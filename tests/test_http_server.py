@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from src.mcp import http_server
+from src.mcp.utils import RateLimiter, rate_limiter
+
+
+def _scope(headers: list[tuple[bytes, bytes]], path: str = "/health") -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+
+async def _call(scope: dict) -> list[dict]:
+    messages: list[dict] = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    await http_server.app(scope, receive, send)
+    return messages
+
+
+@pytest.fixture
+def limiter(monkeypatch) -> RateLimiter:
+    # Frozen clock: no tokens refill between requests
+    limiter = RateLimiter(requests_per_minute=60, burst_size=2, time_fn=lambda: 0.0)
+    monkeypatch.setattr(http_server, "rate_limiter", limiter)
+    return limiter
+
+
+@pytest.mark.asyncio
+async def test_client_id_from_forwarded_for(limiter):
+    await _call(_scope([(b"x-forwarded-for", b"203.0.113.7, 10.0.0.1")]))
+    await _call(_scope([(b"x-api-key", b"secret-key-123"), (b"x-forwarded-for", b"203.0.113.7")]))
+    await _call(_scope([]))
+
+    assert list(limiter._state) == ["ip:203.0.113.7", "api:secret-k", "ip:127.0.0.1"]
+
+
+@pytest.mark.asyncio
+async def test_allowed_response_carries_rate_limit_headers(limiter):
+    start, body = await _call(_scope([(b"x-forwarded-for", b"203.0.113.7")]))
+
+    assert start["status"] == 200
+    headers = dict(start["headers"])
+    assert headers[b"x-ratelimit-remaining"] == b"1"
+    # Encoded once at import, from the global limiter's configuration
+    assert headers[b"x-ratelimit-limit"] == str(rate_limiter.requests_per_minute).encode()
+    assert json.loads(body["body"]) == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_response(limiter):
+    scope = _scope([(b"x-forwarded-for", b"203.0.113.7")])
+    await _call(scope)
+    await _call(scope)
+    start, body = await _call(scope)
+
+    assert start["status"] == 429
+    headers = dict(start["headers"])
+    assert headers[b"content-type"] == b"application/json"
+    assert headers[b"content-length"] == str(len(body["body"])).encode()
+    assert headers[b"retry-after"] == b"2"
+    assert headers[b"x-ratelimit-remaining"] == b"0"
+    assert json.loads(body["body"]) == {"error": "Rate limit exceeded", "retry_after": 1.0}
@@ -1,3 +1,5 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -30,11 +32,34 @@ def test_graph_rag_index_init(mock_settings, mock_pg_index, mock_neo4j_store):
 
     index = GraphRAGIndex(neo4j_config, llm_config)
 
+    # Connections and the LlamaIndex index are created lazily
+    mock_neo4j_store.assert_not_called()
+    mock_pg_index.from_existing.assert_not_called()
+
+    assert index.index is index.index
     mock_neo4j_store.assert_called_once()
     mock_pg_index.from_existing.assert_called_once()
     assert mock_settings.llm is not None
 
 
+def test_index_built_once_across_threads(mock_settings, mock_pg_index, mock_neo4j_store):
+    neo4j_config = Neo4jConfig(uri="bolt://localhost:7687", user="neo4j", password="password")
+    index = GraphRAGIndex(neo4j_config, LLMConfig())
+
+    def slow_from_existing(**kwargs):
+        # Widen the window in which concurrent first queries would race
+        time.sleep(0.05)
+        return MagicMock()
+
+    mock_pg_index.from_existing.side_effect = slow_from_existing
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        built = list(pool.map(lambda _: index.index, range(4)))
+
+    assert all(b is built[0] for b in built)
+    mock_pg_index.from_existing.assert_called_once()
+    mock_neo4j_store.assert_called_once()
+
+
 def test_query(mock_settings, mock_pg_index, mock_neo4j_store):
     neo4j_config = Neo4jConfig(uri="bolt://localhost:7687", user="neo4j", password="password")
     llm_config = LLMConfig()
@@ -54,3 +79,47 @@ def test_query(mock_settings, mock_pg_index, mock_neo4j_store):
 
     assert result["answer"] == "Test Answer"
     assert result["sources"] == []
+
+
+def test_get_neighbors_batch(mock_settings, mock_pg_index, mock_neo4j_store):
+    neo4j_config = Neo4jConfig(uri="bolt://localhost:7687", user="neo4j", password="password")
+    index = GraphRAGIndex(neo4j_config, LLMConfig())
+
+    index.graph_store.structured_query.return_value = [
+        {"node_id": "a", "neighbor": {"name": "x"}, "relationship": "USES_ROLE"},
+        {"node_id": "a", "neighbor": {"name": "y"}, "relationship": "HAS_TASK"},
+    ]
+
+    result = index.get_neighbors_batch(["a", "b"], relationship_types=["USES_ROLE"])
+
+    (call,) = index.graph_store.structured_query.call_args_list
+    cypher = call.args[0]
+    assert "UNWIND $node_ids" in cypher
+    assert "-[r:USES_ROLE]-" in cypher
+    assert [n["relationship"] for n in result["a"]] == ["USES_ROLE", "HAS_TASK"]
+    assert result["b"] == []
+
+
+def test_query_reuses_engine(mock_settings, mock_pg_index, mock_neo4j_store):
+    neo4j_config = Neo4jConfig(uri="bolt://localhost:7687", user="neo4j", password="password")
+    index = GraphRAGIndex(neo4j_config, LLMConfig())
+
+    index.query("first")
+    index.query("second")
+
+    index.index.as_query_engine.assert_called_once()
+
+
+def test_cypher_query_iter_stops_at_limit(mock_settings, mock_pg_index, mock_neo4j_store):
+    neo4j_config = Neo4jConfig(uri="bolt://localhost:7687", user="neo4j", password="password")
+    index = GraphRAGIndex(neo4j_config, LLMConfig())
+
+    records = [MagicMock(**{"data.return_value": {"n": i}}) for i in range(5)]
+    session = index.graph_store.client.session.return_value.__enter__.return_value
+    session.run.return_value = iter(records)
+
+    rows = list(index.cypher_query_iter("MATCH (n) RETURN n", limit=2, name="x"))
+
+    assert rows == [{"n": 0}, {"n": 1}]
+    session.run.assert_called_once_with("MATCH (n) RETURN n", {"name": "x"})
+    records[2].data.assert_not_called()
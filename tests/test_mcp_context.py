@@ -0,0 +1,39 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.mcp.context import clear_repository, get_repository, repository_scope, set_repository
+
+
+def test_set_and_clear_with_token():
+    token = set_repository("outer")
+    inner = set_repository("inner")
+    assert get_repository() == "inner"
+
+    clear_repository(inner)
+    assert get_repository() == "outer"
+
+    clear_repository(token)
+    assert get_repository() is None
+
+
+def test_repository_scope_nests():
+    with repository_scope("outer"):
+        with repository_scope("inner"):
+            assert get_repository() == "inner"
+        assert get_repository() == "outer"
+    assert get_repository() is None
+
+
+@pytest.mark.asyncio
+async def test_empty_repository_id_uses_session_repository():
+    from src.mcp.tools import role_tools
+
+    conn = MagicMock()
+    conn.execute_query = AsyncMock(return_value=[])
+    with patch.object(role_tools, "get_neo4j_connection", return_value=conn):
+        with repository_scope("session-repo"):
+            await role_tools.get_role_usage("nginx", repository_id="")
+
+    (call,) = conn.execute_query.call_args_list
+    assert call.args[1]["repo"] == "session-repo"
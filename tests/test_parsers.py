@@ -1,6 +1,10 @@
 """Tests for parsers."""
 
-from src.parsers import JinjaParser, PythonParser, YAMLParser
+from unittest.mock import patch
+
+import yaml
+
+from src.parsers import JinjaParser, ParseCache, PythonParser, RubyParser, YAMLParser
 
 
 class TestYAMLParser:
@@ -43,6 +47,65 @@ mysql_user: appuser
         assert result.metadata.get("is_vars_file") is True
         assert result.metadata.get("var_count") == 3
 
+        shallow = YAMLParser(deep=False).parse_string(vars_content, "vars.yml")
+        assert shallow.metadata.get("var_count") == 3
+        assert "var_names" not in shallow.metadata
+
+    def test_role_names_deduplicated_in_order(self):
+        """Test role names keep first-seen order without duplicates."""
+        playbook = "- hosts: web\n  roles: [nginx, common]\n- hosts: db\n  roles: [common, mysql]\n"
+
+        result = YAMLParser().parse_string(playbook, "site.yml")
+
+        assert result.metadata["role_names"] == ["nginx", "common", "mysql"]
+
+    def test_task_file_classified_without_loading(self):
+        """Test lists that are not playbooks are classified from the event stream."""
+        parser = YAMLParser()
+        tasks = "- name: Install\n  apt:\n    name: [a, b]\n- name: Start\n  service: {name: a}\n"
+
+        with patch("src.parsers.yaml_parser.yaml.load", wraps=yaml.load) as load:
+            result = parser.parse_string(tasks, "tasks/main.yml")
+            assert load.call_count == 0
+            assert result.metadata["is_playbook"] is False
+            # Structured access still loads the document on demand
+            assert parser.extract_variables(result) == {}
+            assert load.call_count == 1
+
+        # Play keys after nested values are still found
+        playbook = "- name: Site\n  vars: {a: [1, 2]}\n  hosts: all\n"
+        assert parser.parse_string(playbook, "site.yml").metadata["is_playbook"] is True
+
+    def test_task_module_is_first_non_keyword_key(self):
+        """Test the task module is found past directive keys, in file order."""
+        tasks = YAMLParser()._extract_tasks(
+            [
+                {"name": "a", "when": "x", "apt": {"name": "nginx"}},
+                {"name": "b", "command": "ls", "loop_control": {"label": "i"}},
+                {"name": "c", "tags": ["t"]},
+            ]
+        )
+
+        assert [t["module"] for t in tasks] == ["apt", "command", None]
+        assert tasks[0]["args"] == {"name": "nginx"}
+        assert tasks[2]["args"] is None
+
+    def test_yaml_loaded_once_per_result(self):
+        """Test metadata and extractors share one PyYAML load."""
+        parser = YAMLParser()
+
+        with patch("src.parsers.yaml_parser.yaml.load", wraps=yaml.load) as load:
+            result = parser.parse_string("- hosts: all\n  tasks: []\n", "site.yml")
+            assert parser.extract_playbook_structure(result)[0]["hosts"] == "all"
+            assert parser.extract_variables(result) == {}
+            assert parser.extract_requirements(result) == []
+
+            broken = parser.parse_string("key: [unclosed\n", "broken.yml")
+            assert parser.extract_variables(broken) == {}
+            assert parser.extract_requirements(broken) == []
+
+        assert load.call_count == 2
+
 
 class TestJinjaParser:
     """Tests for Jinja2 parser."""
@@ -70,6 +133,57 @@ server {
         assert "server_name" in variables
         assert "backend_url" in variables
 
+    def test_regex_fallback_single_pass(self):
+        """Test the regex fallback finds every construct, including filters inside {{ }}."""
+        parser = JinjaParser()
+        template = (
+            "{% block body %}{{ user.name | upper }}{% include 'x|y.j2' %}"
+            "{% for i in items %}{% if flag %}{% macro m(a) %}{{ a|default('z') }}"
+        )
+
+        metadata = parser._extract_metadata_regex(template)
+
+        assert metadata == {
+            "variables_used": ["a", "flag", "items", "user"],
+            "filters_used": ["default", "upper", "y"],
+            "blocks": ["body"],
+            "includes": ["x|y.j2"],
+            "macros": ["m"],
+        }
+
+
+class TestRubyParser:
+    """Tests for Ruby (Vagrantfile) parser."""
+
+    def test_vagrantfile_metadata(self):
+        """Test config, VMs and provisioners are extracted from a Vagrantfile."""
+        vagrantfile = """
+VAGRANTFILE_API_VERSION = "2"
+Vagrant.configure(VAGRANTFILE_API_VERSION) do |config|
+  config.vm.box = "centos/7"
+  config.vm.network "private_network", ip: "192.168.56.10"
+  config.vm.define "web"
+  config.vm.provision "shell", inline: "yum -y update"
+  config.vm.provision "ansible" do |ansible|
+    ansible.playbook = "site.yml"
+  end
+end
+"""
+
+        result = RubyParser().parse_string(vagrantfile, "Vagrantfile")
+
+        assert result.metadata["is_vagrantfile"] is True
+        assert result.metadata["vagrant_config"] == {
+            "api_version": "2",
+            "box": "centos/7",
+            "networks": [{"type": "private_network", "ip": "192.168.56.10"}],
+        }
+        assert result.metadata["vms"] == [{"name": "web"}]
+        assert result.metadata["provisioners"] == [
+            {"type": "ansible", "playbook": "site.yml"},
+            {"type": "shell", "inline": True},
+        ]
+
 
 class TestPythonParser:
     """Tests for Python parser."""
@@ -92,3 +206,114 @@ def parse_cli_args():
         functions = result.metadata.get("functions", [])
         assert len(functions) == 2
         assert result.metadata.get("is_inventory_script") is True
+
+    def test_walk_is_preorder_with_depth(self):
+        """Test the cursor walk visits nodes like a recursive pre-order traversal."""
+        parser = PythonParser()
+        result = parser.parse_string("class A:\n    def f(self):\n        return 1\n", "a.py")
+
+        expected = []
+
+        def visit(node, depth):
+            expected.append((node.type, depth))
+            for child in node.children:
+                visit(child, depth + 1)
+
+        visit(result.root_node, 0)
+        assert [(node.type, depth) for node, depth in parser.walk(result.root_node)] == expected
+
+    def test_reports_syntax_errors(self):
+        """Test syntax errors are found in broken files."""
+        parser = PythonParser()
+
+        assert parser.parse_string("x = 1\n", "ok.py").errors == []
+        result = parser.parse_string("def f(:\n    pass\n", "broken.py")
+        assert result.errors
+        assert result.errors[0].startswith("Syntax error at line 1")
+
+    def test_metadata_nodes_collected_in_parse_walk(self):
+        """Test metadata node types are indexed while parsing."""
+        parser = PythonParser()
+        result = parser.parse_string("import os\n\ndef main():\n    pass\n", "script.py")
+
+        assert [n.type for n in result.nodes_by_type["function_definition"]] == [
+            "function_definition"
+        ]
+        assert parser.nodes_of_type(result, "import_statement") == result.nodes_by_type[
+            "import_statement"
+        ]
+        # Types outside COLLECT_NODE_TYPES fall back to a tree search
+        assert len(parser.nodes_of_type(result, "pass_statement")) == 1
+
+    def test_non_ascii_source(self, tmp_path):
+        """Test node text is correct after multi-byte characters."""
+        script = tmp_path / "inventory.py"
+        script.write_text('MSG = "⚡ héllo"\n\ndef get_inventory():\n    return {}\n', encoding="utf-8")
+
+        result = PythonParser().parse_file(script)
+
+        assert result.is_success
+        assert result.metadata["functions"][0]["name"] == "get_inventory"
+        assert result.source == script.read_bytes()
+
+    def test_parse_files_keeps_order(self, tmp_path):
+        """Test batch parsing returns one result per path, in order."""
+        paths = []
+        for i in range(6):
+            path = tmp_path / f"script{i}.py"
+            path.write_text(f"def func_{i}():\n    pass\n", encoding="utf-8")
+            paths.append(path)
+
+        results = PythonParser().parse_files(paths, max_workers=3)
+
+        assert [r.file_path for r in results] == [str(p) for p in paths]
+        assert [r.metadata["functions"][0]["name"] for r in results] == [
+            f"func_{i}" for i in range(6)
+        ]
+
+    def test_parse_cache_reuses_metadata_for_unchanged_content(self, tmp_path):
+        """Test cached metadata is returned until the file content changes."""
+        parser = PythonParser()
+        parser.parse_cache = ParseCache(tmp_path / "cache.sqlite3")
+        script = tmp_path / "inventory.py"
+        script.write_text("def get_inventory():\n    return {}\n", encoding="utf-8")
+
+        first = parser.parse_file(script)
+        # A new parser starts with an empty in-memory memo
+        parser = PythonParser()
+        parser.parse_cache = ParseCache(tmp_path / "cache.sqlite3")
+        with patch.object(parser, "extract_metadata", wraps=parser.extract_metadata) as extract:
+            second = parser.parse_file(script)
+            assert extract.call_count == 0
+            assert second.metadata == first.metadata
+            assert second.is_success
+
+            script.write_text("def list_inventory():\n    return {}\n", encoding="utf-8")
+            third = parser.parse_file(script)
+            assert extract.call_count == 1
+            assert third.metadata["functions"][0]["name"] == "list_inventory"
+
+    def test_parse_cache_keeps_one_row_per_file(self, tmp_path):
+        """Test storing a new version of a file replaces the previous one."""
+        cache = ParseCache(tmp_path / "cache.sqlite3")
+        cache.put("site.py", "python", "old", {"functions": []})
+        cache.put("site.py", "python", "new", {"functions": [{"name": "main"}]})
+
+        assert cache.get("site.py", "python", "old") is None
+        assert cache.get("site.py", "python", "new") == {"functions": [{"name": "main"}]}
+        rows = cache._connection().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        assert rows == 1
+
+    def test_metadata_memoized_by_content(self):
+        """Test identical content is extracted once, whatever its path."""
+        parser = PythonParser()
+        source = "def get_inventory():\n    return {}\n"
+
+        with patch.object(parser, "extract_metadata", wraps=parser.extract_metadata) as extract:
+            first = parser.parse_string(source, "a/inventory.py")
+            second = parser.parse_string(source, "b/inventory.py")
+            parser.parse_string(source + "\n# changed\n", "a/inventory.py")
+
+        assert extract.call_count == 2
+        assert second.metadata == first.metadata
+        assert second.metadata is not first.metadata
@@ -1,6 +1,6 @@
 import pytest
 
-from src.mcp.utils import PathSanitizationError, sanitize_path
+from src.mcp.utils import PathSanitizationError, sanitize_path, validate_file_path_param
 
 
 def test_blocks_traversal():
@@ -40,3 +40,25 @@ def test_allows_absolute_within_base():
         "/home/user/ansible/roles/main.yml", allowed_base="/home/user/ansible", allow_absolute=True
     )
     assert result == "/home/user/ansible/roles/main.yml"
+
+
+def test_blocks_embedded_traversal_component():
+    with pytest.raises(PathSanitizationError, match="Path traversal detected"):
+        sanitize_path("roles/..\\..\\secrets.yml")
+
+
+def test_allows_double_dot_in_filename():
+    assert sanitize_path("files/my..archive.tar") == "files/my..archive.tar"
+
+
+def test_default_codebase_root_read_once(monkeypatch):
+    from src.mcp.utils import path_sanitizer
+
+    path_sanitizer._default_codebase_root.cache_clear()
+    monkeypatch.setenv("CODEBASE_PATH", "/srv/ansible")
+    try:
+        assert validate_file_path_param("site.yml") == "/srv/ansible/site.yml"
+        monkeypatch.setenv("CODEBASE_PATH", "/elsewhere")
+        assert validate_file_path_param("site.yml") == "/srv/ansible/site.yml"
+    finally:
+        path_sanitizer._default_codebase_root.cache_clear()
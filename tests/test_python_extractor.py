@@ -1,12 +1,15 @@
+import pytest
+
 from src.extractors.python import PythonExtractor
 
 
-def test_python_extractor(tmp_path):
-    # Setup python file
-    src = tmp_path / "src"
+@pytest.fixture(scope="module")
+def python_repo_tree(tmp_path_factory):
+    """Small Python repository shared by the read-only extractor tests."""
+    root = tmp_path_factory.mktemp("python_repo")
+    src = root / "src"
     src.mkdir()
-    f = src / "test.py"
-    f.write_text("""
+    (src / "test.py").write_text("""
 import os
 
 class MyClass:
@@ -16,9 +19,26 @@ class MyClass:
 def func():
     pass
 """)
+    (root / "main.py").write_text("import utils")
+    return root
+
+
+@pytest.fixture(scope="module")
+def python_extraction(python_repo_tree):
+    """Nodes and relationships of python_repo_tree, extracted in one pass."""
+    return PythonExtractor().extract_all(python_repo_tree)
 
+
+def test_extract_all_matches_separate_passes(python_repo_tree, python_extraction):
     extractor = PythonExtractor()
-    nodes = list(extractor.extract(tmp_path))
+    nodes = list(extractor.extract(python_repo_tree))
+    rels = list(extractor.extract_relationships(python_repo_tree))
+
+    assert python_extraction == (nodes, rels)
+
+
+def test_python_extractor(python_extraction):
+    nodes, _ = python_extraction
 
     types = [n["type"] for n in nodes]
     assert "File" in types
@@ -34,12 +54,48 @@ def func():
     assert func["properties"]["name"] == "func"
 
 
-def test_python_relationships(tmp_path):
-    f = tmp_path / "main.py"
-    f.write_text("import utils")
-
-    extractor = PythonExtractor()
-    rels = list(extractor.extract_relationships(tmp_path))
+def test_python_relationships(python_extraction):
+    _, rels = python_extraction
 
     assert len(rels) > 0
     assert rels[0]["type"] == "IMPORTS"
+
+
+def test_python_abstract_classes(tmp_path):
+    f = tmp_path / "shapes.py"
+    f.write_text("""
+import abc
+from abc import ABC, ABCMeta, abstractmethod
+
+class Plain:
+    pass
+
+class WithBase(ABC):
+    pass
+
+class WithDottedBase(abc.ABC):
+    pass
+
+class WithMeta(metaclass=ABCMeta):
+    pass
+
+class WithAbstractMethod:
+    @abstractmethod
+    def area(self):
+        pass
+""")
+
+    extractor = PythonExtractor()
+    classes = {
+        n["properties"]["name"]: n["properties"]["is_abstract"]
+        for n in extractor.extract(tmp_path)
+        if n["type"] == "Class"
+    }
+
+    assert classes == {
+        "Plain": False,
+        "WithBase": True,
+        "WithDottedBase": True,
+        "WithMeta": True,
+        "WithAbstractMethod": True,
+    }
@@ -1,22 +1,28 @@
-from src.mcp.utils.query_guardrails import MAX_RESULTS_ABSOLUTE, MAX_RESULTS_DEFAULT, enforce_limit
-
-
-def test_enforce_limit_adds_missing() -> None:
-    query = "MATCH (n:Task) RETURN n"
-    result = enforce_limit(query)
-    assert f"LIMIT {MAX_RESULTS_DEFAULT}" in result
-
+import pytest
 
-def test_enforce_limit_caps_excessive() -> None:
-    query = "MATCH (n:Task) RETURN n LIMIT 5000"
-    result = enforce_limit(query)
-    assert f"LIMIT {MAX_RESULTS_ABSOLUTE}" in result
+from src.mcp.utils.query_guardrails import MAX_RESULTS_ABSOLUTE, MAX_RESULTS_DEFAULT, enforce_limit
 
 
-def test_enforce_limit_preserves_small() -> None:
-    query = "MATCH (n:Task) RETURN n LIMIT 10"
-    result = enforce_limit(query)
-    assert "LIMIT 10" in result
+@pytest.mark.parametrize(
+    ("query", "max_results", "expected"),
+    [
+        # Adds a missing limit
+        ("MATCH (n:Task) RETURN n", None, f"LIMIT {MAX_RESULTS_DEFAULT}"),
+        # Caps an excessive limit
+        ("MATCH (n:Task) RETURN n LIMIT 5000", None, f"LIMIT {MAX_RESULTS_ABSOLUTE}"),
+        # Preserves a small limit
+        ("MATCH (n:Task) RETURN n LIMIT 10", None, "LIMIT 10"),
+        # Custom limit, and a custom limit above the absolute cap
+        ("MATCH (n:Task) RETURN n", 50, "LIMIT 50"),
+        ("MATCH (n:Task) RETURN n", 5000, f"LIMIT {MAX_RESULTS_ABSOLUTE}"),
+    ],
+)
+def test_enforce_limit(query: str, max_results: int | None, expected: str) -> None:
+    if max_results is None:
+        result = enforce_limit(query)
+    else:
+        result = enforce_limit(query, max_results=max_results)
+    assert expected in result
 
 
 def test_enforce_limit_handles_semicolon() -> None:
@@ -27,13 +33,8 @@ def test_enforce_limit_handles_semicolon() -> None:
     assert ";" not in result  # Should be stripped or handled (SPEC says rstrip(';'))
 
 
-def test_enforce_limit_with_custom_limit() -> None:
-    query = "MATCH (n:Task) RETURN n"
-    result = enforce_limit(query, max_results=50)
-    assert "LIMIT 50" in result
-
-
-def test_enforce_limit_with_custom_limit_excessive() -> None:
-    query = "MATCH (n:Task) RETURN n"
-    result = enforce_limit(query, max_results=5000)
-    assert f"LIMIT {MAX_RESULTS_ABSOLUTE}" in result
+def test_enforce_limit_caps_each_clause() -> None:
+    query = "CALL { MATCH (t:Task) RETURN t LIMIT 5 } RETURN t LIMIT 5000"
+    result = enforce_limit(query)
+    assert "LIMIT 5 }" in result
+    assert result.endswith(f"LIMIT {MAX_RESULTS_ABSOLUTE}")
@@ -7,12 +7,13 @@ from src.mcp.utils.neo4j_connection import (
     Neo4jConnectionManager,
     QueryTimeoutError,
     get_neo4j_connection,
+    parameterize,
 )
 
 
-# Mock Neo4j driver and session
-@pytest.fixture
-def mock_neo4j_driver() -> AsyncMock:
+# Mock Neo4j driver and session, patched in once for the module
+@pytest.fixture(scope="module")
+def _patched_neo4j_driver() -> AsyncMock:
     with patch("src.mcp.utils.neo4j_connection.AsyncGraphDatabase.driver") as mock_driver_cls:
         mock_driver = MagicMock()
         mock_session = AsyncMock()
@@ -30,34 +31,41 @@ def mock_neo4j_driver() -> AsyncMock:
         yield mock_driver
 
 
+@pytest.fixture(autouse=True)
+def _reset_connection_manager() -> None:
+    Neo4jConnectionManager._instance = None
+
+
+@pytest.fixture
+def mock_neo4j_driver(_patched_neo4j_driver: MagicMock) -> MagicMock:
+    # Clear what the previous test configured on the shared session
+    _patched_neo4j_driver.reset_mock()
+    mock_session = _patched_neo4j_driver.session.return_value.__aenter__.return_value
+    mock_session.reset_mock(return_value=True, side_effect=True)
+    return _patched_neo4j_driver
+
+
 @pytest.mark.asyncio
 async def test_query_timeout(mock_neo4j_driver: MagicMock) -> None:
-    Neo4jConnectionManager._instance = None
     conn = get_neo4j_connection()
 
     async def slow_run(*args, **kwargs):
-        await asyncio.sleep(1)
-        return AsyncMock()
+        # Never completes; the timeout cancels it at its first await
+        await asyncio.Event().wait()
 
     mock_session = mock_neo4j_driver.session.return_value.__aenter__.return_value
     mock_session.run.side_effect = slow_run
 
     with pytest.raises(QueryTimeoutError):
-        await conn.execute_with_timeout("MATCH (n) RETURN n", timeout=0.1)
+        await conn.execute_with_timeout("MATCH (n) RETURN n", timeout=0)
 
 
 @pytest.mark.asyncio
 async def test_normal_query(mock_neo4j_driver: MagicMock) -> None:
-    Neo4jConnectionManager._instance = None
     conn = get_neo4j_connection()
 
     mock_result = AsyncMock()
-
-    # Create a mock record with .data() method
-    mock_record = MagicMock()
-    mock_record.data.return_value = {"val": 1}
-
-    mock_result.__aiter__.return_value = [mock_record]
+    mock_result.data.return_value = [{"val": 1}]
 
     mock_session = mock_neo4j_driver.session.return_value.__aenter__.return_value
     mock_session.run.return_value = mock_result
@@ -66,3 +74,126 @@ async def test_normal_query(mock_neo4j_driver: MagicMock) -> None:
     results = await conn.execute_with_timeout(query, timeout=5.0)
     assert len(results) == 1
     assert results[0]["val"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_query(mock_neo4j_driver: MagicMock) -> None:
+    conn = get_neo4j_connection()
+
+    mock_result = AsyncMock()
+    records = []
+    for i in range(3):
+        record = MagicMock()
+        record.data.return_value = {"val": i}
+        records.append(record)
+    mock_result.__aiter__.return_value = records
+
+    mock_session = mock_neo4j_driver.session.return_value.__aenter__.return_value
+    mock_session.run.return_value = mock_result
+
+    rows = [row async for row in conn.stream_query("UNWIND range(0, 2) AS val RETURN val")]
+    assert rows == [{"val": 0}, {"val": 1}, {"val": 2}]
+
+
+@pytest.mark.asyncio
+async def test_stream_query_timeout(mock_neo4j_driver: MagicMock) -> None:
+    conn = get_neo4j_connection()
+
+    async def slow_run(*args, **kwargs):
+        # Never completes; the timeout cancels it at its first await
+        await asyncio.Event().wait()
+
+    mock_session = mock_neo4j_driver.session.return_value.__aenter__.return_value
+    mock_session.run.side_effect = slow_run
+
+    with pytest.raises(QueryTimeoutError):
+        async for _ in conn.stream_query("MATCH (n) RETURN n", timeout=0):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_stream_query_traces_and_excludes_consumer_time(mock_neo4j_driver: MagicMock) -> None:
+    conn = get_neo4j_connection()
+
+    mock_result = AsyncMock()
+    records = []
+    for i in range(3):
+        record = MagicMock()
+        record.data.return_value = {"val": i}
+        records.append(record)
+    mock_result.__aiter__.return_value = records
+
+    mock_session = mock_neo4j_driver.session.return_value.__aenter__.return_value
+    mock_session.run.return_value = mock_result
+
+    span = MagicMock()
+    with patch("src.mcp.utils.neo4j_connection.start_span", return_value=span) as start:
+        rows = []
+        async for row in conn.stream_query("MATCH (n) RETURN n", timeout=0.05):
+            # Slow consumer: only time spent waiting on Neo4j counts
+            await asyncio.sleep(0.03)
+            rows.append(row)
+
+    assert len(rows) == 3
+    assert start.call_args.args == ("neo4j_query",)
+    span.update.assert_called_once_with(output={"result_count": 3})
+    span.end.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_driver_reused_within_loop(mock_neo4j_driver: MagicMock) -> None:
+    with patch("src.mcp.utils.neo4j_connection.AsyncGraphDatabase.driver") as driver_cls:
+        conn = Neo4jConnectionManager()
+
+        async def grab():
+            return conn.driver
+
+        drivers = await asyncio.gather(*(grab() for _ in range(5)))
+        assert all(d is drivers[0] for d in drivers)
+        driver_cls.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_close_closes_every_driver_without_creating_one() -> None:
+    with patch("src.mcp.utils.neo4j_connection.AsyncGraphDatabase.driver") as driver_cls:
+        driver_cls.side_effect = lambda *args, **kwargs: MagicMock(close=AsyncMock())
+        conn = Neo4jConnectionManager()
+
+        loop_driver = conn.driver
+        # No running loop in a worker thread: the loop-less driver
+        no_loop_driver = await asyncio.to_thread(lambda: conn.driver)
+        await conn.close()
+
+        loop_driver.close.assert_awaited_once()
+        no_loop_driver.close.assert_awaited_once()
+        assert driver_cls.call_count == 2
+
+        # Closing again has nothing left to close and creates nothing
+        await conn.close()
+        assert driver_cls.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_chunks_rows(mock_neo4j_driver: MagicMock) -> None:
+    conn = get_neo4j_connection()
+
+    mock_result = AsyncMock()
+    mock_result.data.return_value = []
+    mock_session = mock_neo4j_driver.session.return_value.__aenter__.return_value
+    mock_session.run.return_value = mock_result
+
+    rows = [{"name": f"task{i}"} for i in range(5)]
+    await conn.execute_batch("UNWIND $rows AS row RETURN row.name", rows, chunk_size=2)
+
+    sent = [call.args[1]["rows"] for call in mock_session.run.call_args_list]
+    assert sent == [rows[0:2], rows[2:4], rows[4:5]]
+
+
+def test_parameterize_checks_placeholders() -> None:
+    query = "MATCH (r:Role {name: $name}) RETURN r"
+    assert parameterize(query, name="common") == (query, {"name": "common"})
+
+    with pytest.raises(ValueError, match="Missing query parameters"):
+        parameterize(query)
+    with pytest.raises(ValueError, match="not referenced"):
+        parameterize(query, name="common", repo="x")
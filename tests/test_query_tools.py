@@ -0,0 +1,127 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.mcp.tools import query_tools
+from src.mcp.utils import GraphSchema, invalidate_schema_cache
+
+
+@pytest.fixture
+def mock_index():
+    query_tools._exact_cache.clear()
+    index = MagicMock(spec_set=["query"])
+    with (
+        patch("src.config.Neo4jConfig"),
+        patch("src.config.LLMConfig"),
+        patch.object(query_tools, "get_repository", return_value=None),
+        patch.object(query_tools, "_get_index", return_value=index),
+    ):
+        yield index
+    query_tools._exact_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_query_with_rag_caches_answers(mock_index):
+    mock_index.query.return_value = {"answer": "Three roles", "sources": []}
+
+    first = await query_tools.query_with_rag("Which roles exist?")
+    second = await query_tools.query_with_rag("Which roles exist?")
+
+    assert first == second
+    assert "Three roles" in first[0].text
+    mock_index.query.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_query_with_rag_does_not_cache_failures(mock_index):
+    mock_index.query.return_value = {
+        "answer": "Query failed: connection refused",
+        "sources": [],
+        "error": "connection refused",
+    }
+
+    await query_tools.query_with_rag("Which roles exist?")
+    mock_index.query.return_value = {"answer": "Three roles", "sources": []}
+    response = await query_tools.query_with_rag("Which roles exist?")
+
+    assert "Three roles" in response[0].text
+    assert mock_index.query.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_query_with_rag_cache_key_keeps_case(mock_index):
+    mock_index.query.return_value = {"answer": "Two tasks", "sources": []}
+
+    await query_tools.query_with_rag("Which tasks use Nginx?")
+    await query_tools.query_with_rag("  Which tasks   use Nginx? ")
+    assert mock_index.query.call_count == 1
+
+    await query_tools.query_with_rag("Which tasks use nginx?")
+    assert mock_index.query.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_query_with_rag_misses_after_schema_invalidation(mock_index):
+    mock_index.query.return_value = {"answer": "Three roles", "sources": []}
+    await query_tools.query_with_rag("Which roles exist?")
+
+    invalidate_schema_cache()  # e.g. after a re-ingestion
+    mock_index.query.return_value = {"answer": "Four roles", "sources": []}
+    response = await query_tools.query_with_rag("Which roles exist?")
+
+    assert "Four roles" in response[0].text
+    assert mock_index.query.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_query_codebase_always_executes():
+    rows = [[{"r.name": "web"}], [{"r.name": "web"}, {"r.name": "db"}]]
+
+    def stream_query(cypher):
+        async def gen():
+            for row in rows.pop(0):
+                yield row
+
+        return gen()
+
+    client = MagicMock()
+    client.generate_cypher = AsyncMock(return_value="MATCH (r:Role) RETURN r.name LIMIT 10")
+    conn = MagicMock()
+    conn.stream_query.side_effect = stream_query
+    schema = GraphSchema(node_labels=frozenset({"Role"}), relationship_types=frozenset())
+    with (
+        patch.object(query_tools, "GraphRAGClient", return_value=client),
+        patch.object(query_tools, "get_neo4j_connection", return_value=conn),
+        patch.object(GraphSchema, "from_neo4j_cached", AsyncMock(return_value=schema)),
+    ):
+        first = await query_tools.query_codebase("Which roles exist?", repository_id="repo")
+        second = await query_tools.query_codebase("Which roles exist?", repository_id="repo")
+
+    # Re-ingested rows are served, not the first answer
+    assert "Found 1 result(s)" in first[0].text
+    assert "Found 2 result(s)" in second[0].text
+    assert conn.stream_query.call_count == 2
+
+
+async def _rows(*rows):
+    for row in rows:
+        yield row
+
+
+@pytest.mark.asyncio
+async def test_format_results_layout():
+    text = await query_tools._format_results(
+        _rows(
+            {"r.name": "web", "r.path": "x" * 101},
+            {"r.name": "db", "r.path": None},
+        )
+    )
+
+    assert text == (
+        "Found 2 result(s):\n"
+        "\n**1.** \n"
+        f"name: web | path: {'x' * 100}...\n"
+        "\n**2.** \n"
+        "name: db\n"
+    )
+    assert await query_tools._format_results(_rows()) == "No results found."
@@ -1,5 +1,3 @@
-import time
-
 from src.mcp.utils import RateLimiter
 
 
@@ -20,11 +18,40 @@ def test_blocks_over_limit():
 
 
 def test_refills_over_time():
-    limiter = RateLimiter(requests_per_minute=600, burst_size=5)  # 10/sec
+    now = [0.0]
+    # 10 tokens/sec
+    limiter = RateLimiter(requests_per_minute=600, burst_size=5, time_fn=lambda: now[0])
 
     for _ in range(5):
         limiter.allow("test")
+    assert not limiter.allow("test")
 
-    time.sleep(0.2)  # Wait for 2 tokens to refill
+    now[0] += 0.2  # 2 tokens refill
 
     assert limiter.allow("test")
+
+
+def test_check_reports_remaining_and_retry_after():
+    limiter = RateLimiter(requests_per_minute=60, burst_size=2)
+
+    first = limiter.check("test")
+    assert first.allowed
+    assert first.remaining == 1
+
+    limiter.check("test")
+    rejected = limiter.check("test")
+    assert not rejected.allowed
+    assert rejected.remaining == 0
+    assert 0 < rejected.retry_after <= 1
+
+
+def test_evicts_least_recently_seen_client():
+    limiter = RateLimiter(requests_per_minute=10, burst_size=1, max_clients=2)
+
+    limiter.allow("a")
+    limiter.allow("b")
+    limiter.allow("a")  # "b" is now the least recently seen
+    limiter.allow("c")
+
+    assert list(limiter._state) == ["a", "c"]
+    assert not limiter.allow("a")
@@ -1,6 +1,8 @@
+import os
+
 import pytest
 
-from src.graph.schema import list_schemas, load_schema
+from src.graph.schema import clear_schema_cache, list_schemas, load_schema
 
 
 def test_load_ansible_schema():
@@ -38,6 +40,7 @@ from unittest.mock import MagicMock
 
 from src.config import Config, Neo4jConfig
 from src.graph.builder import GraphBuilder
+from src.graph.schema import Node, NodeType, Relationship, RelationshipType
 
 
 def test_graph_builder_init_with_profile():
@@ -56,3 +59,99 @@ def test_graph_builder_init_with_profile():
     gb = GraphBuilder(config, schema_profile="python", driver=driver)
     assert gb.schema.name == "python"
     assert "Class" in gb.schema.node_types
+
+
+def test_graph_builder_dedupes_nodes_by_merge_key():
+    config = MagicMock(spec=Config)
+    config.neo4j = MagicMock(spec=Neo4jConfig)
+    config.neo4j.database = "neo4j"
+    config.pipeline = MagicMock()
+    config.pipeline.batch_size = 100
+
+    driver = MagicMock()
+    session = driver.session.return_value.__enter__.return_value
+
+    gb = GraphBuilder(config, schema_profile="python", driver=driver)
+    gb._node_batch = [
+        Node(NodeType.MODULE, {"repository": "r", "path": "a.py", "name": "a", "docstring": "x"}),
+        Node(NodeType.MODULE, {"repository": "r", "path": "b.py", "name": "b"}),
+        Node(NodeType.MODULE, {"repository": "r", "path": "a.py", "name": "a", "is_package": False}),
+    ]
+    gb._flush_nodes()
+
+    (call,) = session.run.call_args_list
+    batch = call.kwargs["batch"]
+    assert len(batch) == 2
+    assert batch[0] == {
+        "repository": "r",
+        "path": "a.py",
+        "name": "a",
+        "docstring": "x",
+        "is_package": False,
+    }
+
+
+def test_load_schema_is_cached():
+    assert load_schema("python") is load_schema("python")
+
+    clear_schema_cache()
+    assert load_schema("python").name == "python"
+
+
+def test_schema_validators():
+    schema = load_schema("python")
+
+    ok, errors = schema.validate_node(Node(NodeType.MODULE, {"name": "m", "path": "m.py"}))
+    assert ok and errors == []
+
+    ok, errors = schema.validate_node(Node(NodeType.MODULE, {"name": "m", "path": None}))
+    assert not ok
+    assert errors == ["Required property 'path' missing for Module"]
+
+    ok, errors = schema.validate_node(Node(NodeType.PLAYBOOK, {"path": "site.yml"}))
+    assert not ok
+    assert errors == ["Unknown node type: Playbook"]
+
+    module = Node(NodeType.MODULE, {"name": "m", "path": "m.py"})
+    cls = Node(NodeType.CLASS, {"name": "C"})
+    ok, _ = schema.validate_relationship(Relationship(RelationshipType.DEFINES_CLASS, module, cls))
+    assert ok
+    ok, errors = schema.validate_relationship(
+        Relationship(RelationshipType.DEFINES_CLASS, cls, module)
+    )
+    assert not ok
+    assert "Invalid source node type 'Class'" in errors[0]
+
+
+def test_schema_validator_single_required_property():
+    schema = load_schema("python")
+
+    ok, errors = schema.validate_node(Node(NodeType.CLASS, {"name": "C"}))
+    assert ok and errors == []
+
+    ok, errors = schema.validate_node(Node(NodeType.CLASS, {"bases": []}))
+    assert errors == ["Required property 'name' missing for Class"]
+
+
+def test_load_schema_writes_pickle_cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("GRAPHRAG_CACHE_DIR", str(cache_dir))
+    schema_path = tmp_path / "mini.yaml"
+    schema_path.write_text("nodes:\n  Class:\n    properties: []\n")
+    monkeypatch.setattr("src.graph.schema.SCHEMA_DIR", tmp_path)
+    clear_schema_cache()
+
+    assert "Class" in load_schema("mini").node_types
+    assert len(list((cache_dir / "schemas").glob("mini-*.pkl"))) == 1
+    assert list(tmp_path.glob("*.pkl")) == []
+
+    clear_schema_cache()
+    assert "Class" in load_schema("mini").node_types
+
+    # An edit that keeps size and timestamps still misses the pickle
+    stat = schema_path.stat()
+    schema_path.write_text("nodes:\n  Cless:\n    properties: []\n")
+    os.utime(schema_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    clear_schema_cache()
+    assert "Cless" in load_schema("mini").node_types
+    clear_schema_cache()
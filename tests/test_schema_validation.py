@@ -1,11 +1,24 @@
-from src.mcp.utils.cypher_validator import CypherValidator, GraphSchema
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.mcp.utils.cypher_validator import (
+    CypherValidator,
+    GraphSchema,
+    invalidate_schema_cache,
+)
+
+# GraphSchema is frozen, so tests share these instead of rebuilding them
+_BASE_SCHEMA = GraphSchema(
+    node_labels={"Task", "Role", "Playbook"}, relationship_types={"USES_ROLE", "HAS_TASK"}
+)
+_TASK_SCHEMA = GraphSchema(node_labels={"Task"}, relationship_types=set())
+_EMPTY_SCHEMA = GraphSchema(set(), set())
 
 
 def test_rejects_unknown_label() -> None:
-    schema = GraphSchema(
-        node_labels={"Task", "Role", "Playbook"}, relationship_types={"USES_ROLE", "HAS_TASK"}
-    )
-    validator = CypherValidator(schema)
+    validator = CypherValidator(_BASE_SCHEMA)
 
     result = validator.validate("MATCH (n:FakeNode) RETURN n")
     assert not result.is_valid
@@ -13,8 +26,7 @@ def test_rejects_unknown_label() -> None:
 
 
 def test_rejects_unknown_relationship() -> None:
-    schema = GraphSchema(node_labels={"Task"}, relationship_types={"HAS_TASK"})
-    validator = CypherValidator(schema)
+    validator = CypherValidator(_BASE_SCHEMA)
 
     result = validator.validate("MATCH (n)-[:FAKE_REL]->(m) RETURN n")
     assert not result.is_valid
@@ -22,15 +34,14 @@ def test_rejects_unknown_relationship() -> None:
 
 
 def test_blocks_delete() -> None:
-    validator = CypherValidator(GraphSchema(set(), set()))
+    validator = CypherValidator(_EMPTY_SCHEMA)
     result = validator.validate("MATCH (n) DELETE n")
     assert not result.is_valid
     assert "Forbidden: DELETE operations" in result.errors[0]
 
 
 def test_warns_no_limit() -> None:
-    schema = GraphSchema(node_labels={"Task"}, relationship_types=set())
-    validator = CypherValidator(schema)
+    validator = CypherValidator(_TASK_SCHEMA)
 
     result = validator.validate("MATCH (n:Task) RETURN n")
     assert result.is_valid
@@ -38,10 +49,90 @@ def test_warns_no_limit() -> None:
 
 
 def test_valid_query() -> None:
-    schema = GraphSchema(node_labels={"Task"}, relationship_types=set())
-    validator = CypherValidator(schema)
+    validator = CypherValidator(_TASK_SCHEMA)
 
     result = validator.validate("MATCH (n:Task) RETURN n LIMIT 10")
     assert result.is_valid
     assert not result.errors
     assert not result.warnings
+
+
+def test_reports_every_forbidden_pattern() -> None:
+    validator = CypherValidator(_EMPTY_SCHEMA)
+    result = validator.validate("MATCH (n) DETACH DELETE n")
+    assert result.errors == [
+        "Forbidden: DETACH DELETE operations",
+        "Forbidden: DELETE operations",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_schema_from_neo4j_single_round_trip() -> None:
+    result = AsyncMock()
+    result.single.return_value = {"labels": ["Task", "Role"], "rel_types": ["USES_ROLE"]}
+    session = AsyncMock()
+    session.run.return_value = result
+    driver = MagicMock()
+    driver.session.return_value.__aenter__.return_value = session
+
+    schema = await GraphSchema.from_neo4j(driver)
+
+    session.run.assert_awaited_once()
+    assert schema.node_labels == {"Task", "Role"}
+    assert schema.relationship_types == {"USES_ROLE"}
+
+
+@pytest.mark.asyncio
+async def test_schema_from_neo4j_cached_per_driver() -> None:
+    result = AsyncMock()
+    result.single.return_value = {"labels": ["Task"], "rel_types": []}
+    session = AsyncMock()
+    session.run.return_value = result
+    driver = MagicMock()
+    driver.session.return_value.__aenter__.return_value = session
+
+    first = await GraphSchema.from_neo4j_cached(driver)
+    second = await GraphSchema.from_neo4j_cached(driver)
+    assert first is second
+    assert session.run.await_count == 1
+
+    invalidate_schema_cache()
+    await GraphSchema.from_neo4j_cached(driver)
+    assert session.run.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_schema_from_neo4j_cached_single_flight() -> None:
+    result = AsyncMock()
+    result.single.return_value = {"labels": ["Task"], "rel_types": []}
+
+    async def slow_run(*args, **kwargs):
+        # Yield to the loop so the other callers miss while the fetch is in flight
+        await asyncio.sleep(0)
+        return result
+
+    session = AsyncMock()
+    session.run.side_effect = slow_run
+    driver = MagicMock()
+    driver.session.return_value.__aenter__.return_value = session
+
+    # Concurrent misses on a cold cache wait for one fetch instead of each querying
+    schemas = await asyncio.gather(*(GraphSchema.from_neo4j_cached(driver) for _ in range(5)))
+    assert all(schema is schemas[0] for schema in schemas)
+    assert session.run.await_count == 1
+
+
+def test_scan_collects_everything_in_one_pass() -> None:
+    scan = CypherValidator.scan("MATCH (t:Task)-[:USES_ROLE]->(r:Role) RETURN * LIMIT 25")
+    assert scan.labels == {"Task", "Role"}
+    assert scan.rel_types == {"USES_ROLE"}
+    assert scan.forbidden == []
+    assert scan.warnings == ["RETURN * without LIMIT"]
+    assert scan.limit == 25
+
+
+def test_schema_is_frozen_and_hashable() -> None:
+    schema = GraphSchema.from_config({"nodes": {"Task": {}}, "relationships": {"HAS_TASK": {}}})
+    assert isinstance(schema.node_labels, frozenset)
+    assert isinstance(schema.relationship_types, frozenset)
+    assert hash(schema) == hash(GraphSchema({"Task"}, {"HAS_TASK"}))
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.mcp.utils import tracing
+
+
+def test_disabled_tracing_resolves_once(monkeypatch):
+    monkeypatch.setattr(tracing, "_langfuse_client", None)
+    monkeypatch.setattr(tracing, "_langfuse_config", None)
+    config = MagicMock()
+    config.langfuse.enabled = False
+
+    with patch("src.mcp.utils.tracing.get_config", return_value=config):
+        assert tracing.get_langfuse() is None
+        assert tracing.get_langfuse() is None
+        assert tracing.start_span("noop") is None
+
+    assert tracing._langfuse_config is config
+
+
+def test_disabled_tracing_never_imports_sdk():
+    # Fresh interpreter: other tests in this process may have imported langfuse
+    script = (
+        "import sys\n"
+        "from src.mcp.utils import tracing\n"
+        "assert tracing.get_langfuse() is None\n"
+        "assert tracing.start_span('noop') is None\n"
+        "assert 'langfuse' not in sys.modules\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).parent.parent,
+        env={**os.environ, "LANGFUSE_ENABLED": "false"},
+        check=True,
+    )
+
+
+def test_replaced_config_is_resolved_again(monkeypatch):
+    monkeypatch.setattr(tracing, "_langfuse_client", None)
+    monkeypatch.setattr(tracing, "_langfuse_config", None)
+    disabled = MagicMock()
+    disabled.langfuse.enabled = False
+    enabled = MagicMock()
+    enabled.langfuse.enabled = True
+    langfuse_module = MagicMock()
+
+    with (
+        patch.dict(sys.modules, {"langfuse": langfuse_module}),
+        patch("src.mcp.utils.tracing.get_config", return_value=disabled) as get_config,
+    ):
+        assert tracing.get_langfuse() is None
+
+        # As after init_config(): the new configuration enables tracing
+        get_config.return_value = enabled
+        assert tracing.get_langfuse() is langfuse_module.Langfuse.return_value
+        assert tracing.get_langfuse() is langfuse_module.Langfuse.return_value
+
+    langfuse_module.Langfuse.assert_called_once()
+
+
+def test_output_repr_bounds_tool_results():
+    from mcp.types import TextContent
+
+    result = [TextContent(type="text", text="Found 1 result(s):\n" + "x" * 100_000)]
+    output = tracing._output_repr.repr(result)
+    assert output.startswith("['Found 1 result(s):")
+    assert len(output) < 1100